@@ -19,6 +19,17 @@ if config.config_file_name is not None:
 from db.models import SQLModel
 target_metadata = SQLModel.metadata
 
+# Full-text search objects are managed by hand (see db/search.py), not by
+# autogenerate: the SQLite FTS5 table and its shadow tables, and the
+# Postgres search_vector column and index
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith("jobapplication_fts"):
+        return False
+    if name in ("search_vector", "ix_jobapplication_search_vector", "ix_jobapplicationtext_search_vector"):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -41,6 +52,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,7 +76,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,34 @@
+"""add archive source_id
+
+Revision ID: 17893e36cfce
+Revises: ade9084fcd52
+Create Date: 2026-10-19 16:48:37.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '17893e36cfce'
+down_revision: Union[str, None] = 'ade9084fcd52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobapplicationarchive', sa.Column('source_id', sa.Integer(), nullable=True))
+    # Rows archived so far kept the id of their job application
+    op.execute("UPDATE jobapplicationarchive SET source_id = id")
+    op.create_index(op.f('ix_jobapplicationarchive_source_id'), 'jobapplicationarchive', ['source_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobapplicationarchive_source_id'), table_name='jobapplicationarchive')
+    with op.batch_alter_table('jobapplicationarchive') as batch_op:
+        batch_op.drop_column('source_id')
@@ -0,0 +1,176 @@
+"""plain text full-text index
+
+Revision ID: ade9084fcd52
+Revises: ff7a1bcdf5f3
+Create Date: 2026-10-19 16:02:11.514207
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ade9084fcd52'
+down_revision: Union[str, None] = 'ff7a1bcdf5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+# Frozen copy of db.compression.decompress_text as of this revision
+def decompress_text(value):
+    return None if value is None else zlib.decompress(value).decode("utf-8")
+
+
+# SQLite full-text objects of revision e93a1c7f5d48: an FTS5 table over a view
+# that calls the app-only zlib_decompress(), so plain sqlite3 could no longer
+# delete or update job applications
+_OLD_FTS_DELETE = """
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        SELECT 'delete', id, role, company_name, description, cv_summary FROM jobapplication_search WHERE id = {id};"""
+_OLD_FTS_INSERT = """
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        SELECT id, role, company_name, description, cv_summary FROM jobapplication_search WHERE id = {id};"""
+
+OLD_SQLITE_SEARCH = [
+    """
+    CREATE VIEW jobapplication_search AS
+    SELECT j.id AS id, j.role AS role, j.company_name AS company_name,
+           zlib_decompress(t.description) AS description, zlib_decompress(t.cv_summary) AS cv_summary
+    FROM jobapplication j
+    JOIN jobapplicationtext t ON t.job_application_id = j.id
+    """,
+    """
+    CREATE VIRTUAL TABLE jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        content='jobapplication_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "CREATE TRIGGER jobapplication_fts_text_insert AFTER INSERT ON jobapplicationtext BEGIN"
+    + _OLD_FTS_INSERT.format(id="new.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_delete BEFORE DELETE ON jobapplicationtext BEGIN"
+    + _OLD_FTS_DELETE.format(id="old.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_before_update BEFORE UPDATE ON jobapplicationtext BEGIN"
+    + _OLD_FTS_DELETE.format(id="old.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_after_update AFTER UPDATE ON jobapplicationtext BEGIN"
+    + _OLD_FTS_INSERT.format(id="new.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_delete BEFORE DELETE ON jobapplication BEGIN"
+    + _OLD_FTS_DELETE.format(id="old.id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_before_update BEFORE UPDATE OF role, company_name ON jobapplication BEGIN"
+    + _OLD_FTS_DELETE.format(id="old.id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_after_update AFTER UPDATE OF role, company_name ON jobapplication BEGIN"
+    + _OLD_FTS_INSERT.format(id="new.id") + "\n    END",
+    "INSERT INTO jobapplication_fts(jobapplication_fts) VALUES ('rebuild')",
+]
+
+OLD_SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobapplication_fts_after_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_before_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_after_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_before_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_insert",
+    "DROP TABLE IF EXISTS jobapplication_fts",
+    "DROP VIEW IF EXISTS jobapplication_search",
+]
+
+# This revision (see db/search.py): the FTS5 table stores its own plain copy,
+# the app indexes new text rows, and the triggers need no app function
+NEW_SQLITE_SEARCH = [
+    """
+    CREATE VIRTUAL TABLE jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_delete AFTER DELETE ON jobapplication BEGIN
+        DELETE FROM jobapplication_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_text_delete AFTER DELETE ON jobapplicationtext BEGIN
+        DELETE FROM jobapplication_fts WHERE rowid = old.job_application_id;
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_update AFTER UPDATE OF role, company_name ON jobapplication BEGIN
+        UPDATE jobapplication_fts SET role = new.role, company_name = new.company_name WHERE rowid = new.id;
+    END
+    """,
+]
+
+NEW_SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobapplication_fts_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_delete",
+    "DROP TABLE IF EXISTS jobapplication_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    # Postgres maintains its tsvector with plpgsql triggers and is unchanged
+    if connection.dialect.name == "postgresql":
+        return
+
+    for statement in OLD_SQLITE_SEARCH_DROP + NEW_SQLITE_SEARCH:
+        op.execute(statement)
+
+    jobapplication = sa.table(
+        'jobapplication',
+        sa.column('id', sa.Integer()),
+        sa.column('role', sa.String()),
+        sa.column('company_name', sa.String()),
+    )
+    jobapplicationtext = sa.table(
+        'jobapplicationtext',
+        sa.column('job_application_id', sa.Integer()),
+        sa.column('description', sa.LargeBinary()),
+        sa.column('cv_summary', sa.LargeBinary()),
+    )
+    insert_index_row = sa.text(
+        "INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary) "
+        "VALUES (:id, :role, :company_name, :description, :cv_summary)"
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(jobapplication.c.id, jobapplication.c.role, jobapplication.c.company_name,
+                      jobapplicationtext.c.description, jobapplicationtext.c.cv_summary)
+            .join(jobapplicationtext, jobapplicationtext.c.job_application_id == jobapplication.c.id)
+            .where(jobapplication.c.id > last_id).order_by(jobapplication.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(insert_index_row, [
+            {
+                "id": row.id,
+                "role": row.role,
+                "company_name": row.company_name,
+                "description": decompress_text(row.description),
+                "cv_summary": decompress_text(row.cv_summary),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    if connection.dialect.name == "postgresql":
+        return
+
+    # The old view needs zlib_decompress() on the migration connection
+    connection.connection.driver_connection.create_function("zlib_decompress", 1, decompress_text, deterministic=True)
+    for statement in NEW_SQLITE_SEARCH_DROP + OLD_SQLITE_SEARCH:
+        op.execute(statement)
@@ -0,0 +1,37 @@
+"""add queuedjob mode
+
+Revision ID: c2e59f3d30fb
+Revises: 17893e36cfce
+Create Date: 2026-10-19 17:05:12.408356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e59f3d30fb'
+down_revision: Union[str, None] = '17893e36cfce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Jobs enqueued so far were for apply workers (discover had no mode)
+    op.add_column('queuedjob', sa.Column('mode', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default='apply'))
+    op.drop_index(op.f('ix_queuedjob_job_key'), table_name='queuedjob')
+    op.create_index('ix_queuedjob_job_key_mode', 'queuedjob', ['job_key', 'mode'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # One row per job again: only the apply queue is kept
+    op.execute("DELETE FROM queuedjob WHERE mode <> 'apply'")
+    op.drop_index('ix_queuedjob_job_key_mode', table_name='queuedjob')
+    op.create_index(op.f('ix_queuedjob_job_key'), 'queuedjob', ['job_key'], unique=True)
+    with op.batch_alter_table('queuedjob') as batch_op:
+        batch_op.drop_column('mode')
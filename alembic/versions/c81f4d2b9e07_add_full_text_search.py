@@ -0,0 +1,91 @@
+"""add full-text search
+
+Revision ID: c81f4d2b9e07
+Revises: 5b8e0f3a6c21
+Create Date: 2026-10-19 13:41:08.902315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4d2b9e07'
+down_revision: Union[str, None] = '5b8e0f3a6c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        content='jobapplication', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_insert AFTER INSERT ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        VALUES (new.id, new.role, new.company_name, new.description, new.cv_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_delete AFTER DELETE ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        VALUES ('delete', old.id, old.role, old.company_name, old.description, old.cv_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_update
+    AFTER UPDATE OF role, company_name, description, cv_summary ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        VALUES ('delete', old.id, old.role, old.company_name, old.description, old.cv_summary);
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        VALUES (new.id, new.role, new.company_name, new.description, new.cv_summary);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO jobapplication_fts(jobapplication_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS jobapplication_fts_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_insert",
+    "DROP TABLE IF EXISTS jobapplication_fts",
+]
+
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE jobapplication ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(role, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(cv_summary, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX ix_jobapplication_search_vector ON jobapplication USING gin (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_jobapplication_search_vector",
+    "ALTER TABLE jobapplication DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    statements = POSTGRES_UPGRADE if op.get_bind().dialect.name == "postgresql" else SQLITE_UPGRADE
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    statements = POSTGRES_DOWNGRADE if op.get_bind().dialect.name == "postgresql" else SQLITE_DOWNGRADE
+    for statement in statements:
+        op.execute(statement)
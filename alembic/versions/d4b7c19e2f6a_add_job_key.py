@@ -0,0 +1,96 @@
+"""add job_key
+
+Revision ID: d4b7c19e2f6a
+Revises: a50e9d73f891
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+import re
+from typing import Dict, List, Sequence, Union
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7c19e2f6a'
+down_revision: Union[str, None] = 'a50e9d73f891'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of db.job_keys.canonical_job_key as of this revision, so the
+# backfill does not change if the application code does
+GLINTS_JOB_ID_PATTERN = re.compile(
+    r"/opportunities/jobs/(?:[^/?#]+/)*?"
+    r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?=[/?#]|$)",
+    re.IGNORECASE,
+)
+
+
+def canonical_job_key(url: str) -> str:
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    if host == "glints.com" or host.endswith(".glints.com"):
+        match = GLINTS_JOB_ID_PATTERN.search(parts.path)
+        if match:
+            return f"glints:{match.group(1).lower()}"
+    path = parts.path.rstrip("/") or "/"
+    return f"url:{host}{path}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.add_column(sa.Column('job_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    # Backfill job_key and merge rows that turn out to be the same job:
+    # the oldest row is kept and takes the status of the most recently updated one
+    connection = op.get_bind()
+    jobapplication = sa.table(
+        'jobapplication',
+        sa.column('id', sa.Integer()),
+        sa.column('link', sa.String()),
+        sa.column('job_key', sa.String()),
+        sa.column('status', sa.String()),
+        sa.column('updated_at', sa.DateTime()),
+    )
+    rows = connection.execute(
+        sa.select(jobapplication.c.id, jobapplication.c.link, jobapplication.c.status, jobapplication.c.updated_at)
+        .order_by(jobapplication.c.id)
+    ).all()
+    groups: Dict[str, List] = {}
+    for row in rows:
+        groups.setdefault(canonical_job_key(row.link), []).append(row)
+
+    duplicate_ids: List[int] = []
+    for job_key, group in groups.items():
+        keeper = group[0]
+        latest = max(group, key=lambda row: row.updated_at)
+        duplicate_ids.extend(row.id for row in group[1:])
+        connection.execute(
+            jobapplication.update()
+            .where(jobapplication.c.id == keeper.id)
+            .values(job_key=job_key, status=latest.status, updated_at=latest.updated_at)
+        )
+    if duplicate_ids:
+        connection.execute(jobapplication.delete().where(jobapplication.c.id.in_(duplicate_ids)))
+        print(f"Merged {len(duplicate_ids)} duplicate job application rows")
+
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.alter_column('job_key',
+                              existing_type=sqlmodel.sql.sqltypes.AutoString(),
+                              nullable=False)
+        batch_op.create_index('ix_jobapplication_job_key', ['job_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Rows merged by the upgrade are not restored.
+    """
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.drop_index('ix_jobapplication_job_key')
+        batch_op.drop_column('job_key')
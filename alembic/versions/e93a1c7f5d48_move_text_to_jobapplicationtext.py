@@ -0,0 +1,397 @@
+"""move text to jobapplicationtext
+
+Revision ID: e93a1c7f5d48
+Revises: c81f4d2b9e07
+Create Date: 2026-10-19 15:08:33.274519
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93a1c7f5d48'
+down_revision: Union[str, None] = 'c81f4d2b9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+# Frozen copy of db.compression as of this revision. SQLite stores the text
+# zlib-compressed; Postgres keeps TEXT, which TOAST already compresses.
+def compress_text(value):
+    return None if value is None else zlib.compress(value.encode("utf-8"), 6)
+
+
+def decompress_text(value):
+    return None if value is None else zlib.decompress(value).decode("utf-8")
+
+
+def text_type(is_postgres: bool) -> sa.types.TypeEngine:
+    return sa.Text() if is_postgres else sa.LargeBinary()
+
+
+# Full-text search objects of revision c81f4d2b9e07
+OLD_SQLITE_SEARCH = [
+    """
+    CREATE VIRTUAL TABLE jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        content='jobapplication', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_insert AFTER INSERT ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        VALUES (new.id, new.role, new.company_name, new.description, new.cv_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_delete AFTER DELETE ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        VALUES ('delete', old.id, old.role, old.company_name, old.description, old.cv_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER jobapplication_fts_update
+    AFTER UPDATE OF role, company_name, description, cv_summary ON jobapplication BEGIN
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        VALUES ('delete', old.id, old.role, old.company_name, old.description, old.cv_summary);
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        VALUES (new.id, new.role, new.company_name, new.description, new.cv_summary);
+    END
+    """,
+    "INSERT INTO jobapplication_fts(jobapplication_fts) VALUES ('rebuild')",
+]
+
+OLD_POSTGRES_SEARCH = [
+    """
+    ALTER TABLE jobapplication ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(role, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(cv_summary, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX ix_jobapplication_search_vector ON jobapplication USING gin (search_vector)",
+]
+
+# Full-text search objects of this revision (see db/search.py)
+_SQLITE_FTS_DELETE = """
+        INSERT INTO jobapplication_fts(jobapplication_fts, rowid, role, company_name, description, cv_summary)
+        SELECT 'delete', id, role, company_name, description, cv_summary FROM jobapplication_search WHERE id = {id};"""
+_SQLITE_FTS_INSERT = """
+        INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+        SELECT id, role, company_name, description, cv_summary FROM jobapplication_search WHERE id = {id};"""
+
+NEW_SQLITE_SEARCH = [
+    """
+    CREATE VIEW jobapplication_search AS
+    SELECT j.id AS id, j.role AS role, j.company_name AS company_name,
+           zlib_decompress(t.description) AS description, zlib_decompress(t.cv_summary) AS cv_summary
+    FROM jobapplication j
+    JOIN jobapplicationtext t ON t.job_application_id = j.id
+    """,
+    """
+    CREATE VIRTUAL TABLE jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        content='jobapplication_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "CREATE TRIGGER jobapplication_fts_text_insert AFTER INSERT ON jobapplicationtext BEGIN"
+    + _SQLITE_FTS_INSERT.format(id="new.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_delete BEFORE DELETE ON jobapplicationtext BEGIN"
+    + _SQLITE_FTS_DELETE.format(id="old.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_before_update BEFORE UPDATE ON jobapplicationtext BEGIN"
+    + _SQLITE_FTS_DELETE.format(id="old.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_text_after_update AFTER UPDATE ON jobapplicationtext BEGIN"
+    + _SQLITE_FTS_INSERT.format(id="new.job_application_id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_delete BEFORE DELETE ON jobapplication BEGIN"
+    + _SQLITE_FTS_DELETE.format(id="old.id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_before_update BEFORE UPDATE OF role, company_name ON jobapplication BEGIN"
+    + _SQLITE_FTS_DELETE.format(id="old.id") + "\n    END",
+    "CREATE TRIGGER jobapplication_fts_after_update AFTER UPDATE OF role, company_name ON jobapplication BEGIN"
+    + _SQLITE_FTS_INSERT.format(id="new.id") + "\n    END",
+    """
+    CREATE TRIGGER jobapplication_text_cleanup AFTER DELETE ON jobapplication BEGIN
+        DELETE FROM jobapplicationtext WHERE job_application_id = old.id;
+    END
+    """,
+    "INSERT INTO jobapplication_fts(jobapplication_fts) VALUES ('rebuild')",
+]
+
+NEW_SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobapplication_text_cleanup",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_after_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_before_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_after_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_before_update",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_delete",
+    "DROP TRIGGER IF EXISTS jobapplication_fts_text_insert",
+    "DROP TABLE IF EXISTS jobapplication_fts",
+    "DROP VIEW IF EXISTS jobapplication_search",
+]
+
+NEW_POSTGRES_SEARCH = [
+    "ALTER TABLE jobapplicationtext ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION jobapplicationtext_search_vector() RETURNS trigger AS $$
+    DECLARE
+        application jobapplication%ROWTYPE;
+    BEGIN
+        SELECT * INTO application FROM jobapplication WHERE id = NEW.job_application_id;
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(application.role, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(application.company_name, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(NEW.cv_summary, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER jobapplicationtext_search_vector BEFORE INSERT OR UPDATE ON jobapplicationtext
+    FOR EACH ROW EXECUTE FUNCTION jobapplicationtext_search_vector()
+    """,
+    """
+    CREATE FUNCTION jobapplication_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE jobapplicationtext SET search_vector = NULL WHERE job_application_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER jobapplication_search_vector AFTER UPDATE OF role, company_name ON jobapplication
+    FOR EACH ROW EXECUTE FUNCTION jobapplication_search_vector()
+    """,
+    # Fire the trigger once for the rows copied before it existed
+    "UPDATE jobapplicationtext SET search_vector = NULL",
+    "CREATE INDEX ix_jobapplicationtext_search_vector ON jobapplicationtext USING gin (search_vector)",
+]
+
+NEW_POSTGRES_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobapplication_search_vector ON jobapplication",
+    "DROP FUNCTION IF EXISTS jobapplication_search_vector()",
+    "DROP TRIGGER IF EXISTS jobapplicationtext_search_vector ON jobapplicationtext",
+    "DROP FUNCTION IF EXISTS jobapplicationtext_search_vector()",
+]
+
+
+def register_sqlite_functions(connection) -> None:
+    # The search view needs zlib_decompress() on the migration connection too
+    connection.connection.driver_connection.create_function("zlib_decompress", 1, decompress_text, deterministic=True)
+
+
+def copy_in_batches(connection, select_statement, write) -> None:
+    """Run write(rows) for every batch of rows of select_statement, keyed on the first column."""
+    last_id = 0
+    while True:
+        rows = connection.execute(select_statement(last_id)).all()
+        if not rows:
+            break
+        write(rows)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    is_postgres = connection.dialect.name == "postgresql"
+
+    for statement in (["DROP INDEX IF EXISTS ix_jobapplication_search_vector",
+                       "ALTER TABLE jobapplication DROP COLUMN IF EXISTS search_vector"] if is_postgres else
+                      ["DROP TRIGGER IF EXISTS jobapplication_fts_update",
+                       "DROP TRIGGER IF EXISTS jobapplication_fts_delete",
+                       "DROP TRIGGER IF EXISTS jobapplication_fts_insert",
+                       "DROP TABLE IF EXISTS jobapplication_fts"]):
+        op.execute(statement)
+
+    op.create_table('jobapplicationtext',
+    sa.Column('job_application_id', sa.Integer(), nullable=False),
+    sa.Column('description', text_type(is_postgres), nullable=False),
+    sa.Column('cv_summary', text_type(is_postgres), nullable=False),
+    sa.ForeignKeyConstraint(['job_application_id'], ['jobapplication.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_application_id')
+    )
+
+    jobapplication = sa.table(
+        'jobapplication',
+        sa.column('id', sa.Integer()),
+        sa.column('description', sa.String()),
+        sa.column('cv_summary', sa.String()),
+    )
+    jobapplicationtext = sa.table(
+        'jobapplicationtext',
+        sa.column('job_application_id', sa.Integer()),
+        sa.column('description', text_type(is_postgres)),
+        sa.column('cv_summary', text_type(is_postgres)),
+    )
+    if is_postgres:
+        op.execute(
+            jobapplicationtext.insert().from_select(
+                ['job_application_id', 'description', 'cv_summary'],
+                sa.select(jobapplication.c.id, jobapplication.c.description, jobapplication.c.cv_summary),
+            )
+        )
+    else:
+        copy_in_batches(
+            connection,
+            lambda last_id: sa.select(jobapplication.c.id, jobapplication.c.description, jobapplication.c.cv_summary)
+            .where(jobapplication.c.id > last_id).order_by(jobapplication.c.id).limit(BATCH_SIZE),
+            lambda rows: connection.execute(jobapplicationtext.insert(), [
+                {"job_application_id": row.id, "description": compress_text(row.description), "cv_summary": compress_text(row.cv_summary)}
+                for row in rows
+            ]),
+        )
+
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.drop_column('description')
+        batch_op.drop_column('cv_summary')
+
+    # Archive rows keep their text compressed as well
+    if is_postgres:
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.alter_column('description', existing_type=sa.String(), nullable=True)
+            batch_op.alter_column('cv_summary', existing_type=sa.String(), nullable=True)
+    else:
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.add_column(sa.Column('description_compressed', sa.LargeBinary(), nullable=True))
+            batch_op.add_column(sa.Column('cv_summary_compressed', sa.LargeBinary(), nullable=True))
+        archive = sa.table(
+            'jobapplicationarchive',
+            sa.column('id', sa.Integer()),
+            sa.column('description', sa.String()),
+            sa.column('cv_summary', sa.String()),
+            sa.column('description_compressed', sa.LargeBinary()),
+            sa.column('cv_summary_compressed', sa.LargeBinary()),
+        )
+        copy_in_batches(
+            connection,
+            lambda last_id: sa.select(archive.c.id, archive.c.description, archive.c.cv_summary)
+            .where(archive.c.id > last_id).order_by(archive.c.id).limit(BATCH_SIZE),
+            lambda rows: connection.execute(
+                archive.update().where(archive.c.id == sa.bindparam('b_id')).values(
+                    description_compressed=sa.bindparam('b_description'),
+                    cv_summary_compressed=sa.bindparam('b_cv_summary'),
+                ),
+                [
+                    {"b_id": row.id, "b_description": compress_text(row.description), "b_cv_summary": compress_text(row.cv_summary)}
+                    for row in rows
+                ],
+            ),
+        )
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.drop_column('description')
+            batch_op.drop_column('cv_summary')
+            batch_op.alter_column('description_compressed', new_column_name='description')
+            batch_op.alter_column('cv_summary_compressed', new_column_name='cv_summary')
+
+    if is_postgres:
+        statements = NEW_POSTGRES_SEARCH
+    else:
+        register_sqlite_functions(connection)
+        statements = NEW_SQLITE_SEARCH
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    is_postgres = connection.dialect.name == "postgresql"
+
+    for statement in NEW_POSTGRES_SEARCH_DROP if is_postgres else NEW_SQLITE_SEARCH_DROP:
+        op.execute(statement)
+
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.add_column(sa.Column('description', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('cv_summary', sa.String(), nullable=True))
+
+    jobapplication = sa.table(
+        'jobapplication',
+        sa.column('id', sa.Integer()),
+        sa.column('description', sa.String()),
+        sa.column('cv_summary', sa.String()),
+    )
+    jobapplicationtext = sa.table(
+        'jobapplicationtext',
+        sa.column('job_application_id', sa.Integer()),
+        sa.column('description', text_type(is_postgres)),
+        sa.column('cv_summary', text_type(is_postgres)),
+    )
+    copy_in_batches(
+        connection,
+        lambda last_id: sa.select(jobapplicationtext.c.job_application_id, jobapplicationtext.c.description, jobapplicationtext.c.cv_summary)
+        .where(jobapplicationtext.c.job_application_id > last_id).order_by(jobapplicationtext.c.job_application_id).limit(BATCH_SIZE),
+        lambda rows: connection.execute(
+            jobapplication.update().where(jobapplication.c.id == sa.bindparam('b_id')).values(
+                description=sa.bindparam('b_description'),
+                cv_summary=sa.bindparam('b_cv_summary'),
+            ),
+            [
+                {
+                    "b_id": row.job_application_id,
+                    "b_description": row.description if is_postgres else decompress_text(row.description),
+                    "b_cv_summary": row.cv_summary if is_postgres else decompress_text(row.cv_summary),
+                }
+                for row in rows
+            ],
+        ),
+    )
+    op.execute("UPDATE jobapplication SET description = '' WHERE description IS NULL")
+    op.execute("UPDATE jobapplication SET cv_summary = '' WHERE cv_summary IS NULL")
+    with op.batch_alter_table('jobapplication') as batch_op:
+        batch_op.alter_column('description', existing_type=sa.String(), nullable=False)
+        batch_op.alter_column('cv_summary', existing_type=sa.String(), nullable=False)
+
+    op.drop_table('jobapplicationtext')
+
+    if not is_postgres:
+        archive = sa.table(
+            'jobapplicationarchive',
+            sa.column('id', sa.Integer()),
+            sa.column('description', sa.LargeBinary()),
+            sa.column('cv_summary', sa.LargeBinary()),
+            sa.column('description_plain', sa.String()),
+            sa.column('cv_summary_plain', sa.String()),
+        )
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.add_column(sa.Column('description_plain', sa.String(), nullable=True))
+            batch_op.add_column(sa.Column('cv_summary_plain', sa.String(), nullable=True))
+        copy_in_batches(
+            connection,
+            lambda last_id: sa.select(archive.c.id, archive.c.description, archive.c.cv_summary)
+            .where(archive.c.id > last_id).order_by(archive.c.id).limit(BATCH_SIZE),
+            lambda rows: connection.execute(
+                archive.update().where(archive.c.id == sa.bindparam('b_id')).values(
+                    description_plain=sa.bindparam('b_description'),
+                    cv_summary_plain=sa.bindparam('b_cv_summary'),
+                ),
+                [
+                    {"b_id": row.id, "b_description": decompress_text(row.description) or '', "b_cv_summary": decompress_text(row.cv_summary) or ''}
+                    for row in rows
+                ],
+            ),
+        )
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.drop_column('description')
+            batch_op.drop_column('cv_summary')
+            batch_op.alter_column('description_plain', new_column_name='description', existing_type=sa.String(), nullable=False)
+            batch_op.alter_column('cv_summary_plain', new_column_name='cv_summary', existing_type=sa.String(), nullable=False)
+    else:
+        op.execute("UPDATE jobapplicationarchive SET description = '' WHERE description IS NULL")
+        op.execute("UPDATE jobapplicationarchive SET cv_summary = '' WHERE cv_summary IS NULL")
+        with op.batch_alter_table('jobapplicationarchive') as batch_op:
+            batch_op.alter_column('description', existing_type=sa.String(), nullable=False)
+            batch_op.alter_column('cv_summary', existing_type=sa.String(), nullable=False)
+
+    for statement in OLD_POSTGRES_SEARCH if is_postgres else OLD_SQLITE_SEARCH:
+        op.execute(statement)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+"""
+Benchmark for the generate_cv subsystem.
+
+Measures parse_yaml_file, validate_cv_data, get_style and PDFGenerator.generate
+on synthetic CVs of increasing size (more companies, roles, achievements and
+projects). Every stage is measured cold (first call in a fresh interpreter)
+and warm (median of repeated calls), reporting wall time, peak memory and
+output size. Results are written as JSON and compared against a stored
+baseline so rendering regressions are caught before deployment.
+
+Usage:
+    python benchmarks/bench_generate_cv.py                      # run and compare with the baseline
+    python benchmarks/bench_generate_cv.py --save-baseline      # run and store a new baseline
+    python benchmarks/bench_generate_cv.py --sizes small --repeat 3
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the project root directory to Python path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+import yaml
+
+from generate_cv.paser.yaml import parse_yaml_file, validate_cv_data
+from generate_cv.pdf_generator import PDFGenerator
+from generate_cv.styles import get_style
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline", "generate_cv.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "generate_cv.json")
+
+# (companies, roles per company, achievements per role, projects)
+SIZES: Dict[str, Tuple[int, int, int, int]] = {
+    "small": (2, 1, 2, 2),
+    "medium": (6, 2, 4, 8),
+    "large": (15, 3, 6, 20),
+    "xlarge": (40, 3, 8, 50),
+}
+
+STAGES = ("parse_yaml", "validate", "get_style", "render")
+
+# A stage regresses when a metric exceeds baseline * threshold
+DEFAULT_THRESHOLDS = {"wall_s": 1.5, "peak_kib": 1.25, "output_bytes": 1.05}
+
+
+def synthetic_cv(companies: int, roles: int, achievements: int, projects: int) -> Dict[str, Any]:
+    """Build a deterministic CV dictionary of the requested size."""
+    sentence = "Designed, built and operated services handling production traffic with Golang and PostgreSQL."
+    return {
+        "personal_info": {
+            "name": "Benchmark Candidate",
+            "email": "bench@example.com",
+            "phone": "+620000000000",
+            "location": "East Java",
+            "website": "https://example.com",
+            "linkedin": "https://linkedin.com/in/bench",
+            "summary": sentence * 2,
+            "title": "Backend Engineer",
+        },
+        "education": [{
+            "institution": "University of Benchmarks",
+            "degree": "Bachelor of Information Systems",
+            "start_date": "2019",
+            "end_date": "2024",
+            "location": "Jember",
+            "gpa": "3.5/4.0",
+        }],
+        "experience": [
+            {
+                "company": f"Company {c}",
+                "location": "Remote",
+                "roles": [
+                    {
+                        "title": f"Engineer {r}",
+                        "start_date": "Jan 2020",
+                        "end_date": "Dec 2021",
+                        "description": sentence,
+                        "achievements": [f"Achievement {a}: {sentence}" for a in range(achievements)],
+                    }
+                    for r in range(roles)
+                ],
+            }
+            for c in range(companies)
+        ],
+        "skills": [
+            {"category": "Programming Languages", "name": "Python, JavaScript, Golang, SQL"},
+            {"category": "Tools", "name": "Docker, Terraform, GCP"},
+        ],
+        "projects": [
+            {
+                "name": f"Project {p}",
+                "description": sentence,
+                "technologies": ["Golang", "PostgreSQL", "Cloud Run"],
+                "start_date": "2022",
+                "end_date": "2023",
+                "achievements": [f"Outcome {a}" for a in range(max(1, achievements // 2))],
+            }
+            for p in range(projects)
+        ],
+    }
+
+
+def _stage_functions(yaml_path: str, output_dir: str) -> Dict[str, Callable[[], int]]:
+    """Return the stage callables; each returns the stage output size in bytes."""
+    state: Dict[str, Any] = {}
+
+    def parse_stage() -> int:
+        state["data"] = parse_yaml_file(yaml_path)
+        return os.path.getsize(yaml_path)
+
+    def validate_stage() -> int:
+        state["cv"] = validate_cv_data(state["data"])
+        return len(state["cv"].model_dump_json())
+
+    def style_stage() -> int:
+        get_style("classic")
+        return 0
+
+    def render_stage() -> int:
+        generator = PDFGenerator(os.path.join(output_dir, "cv.pdf"), state["cv"], profile="compact")
+        generator.generate()
+        return generator.size_bytes
+
+    return {"parse_yaml": parse_stage, "validate": validate_stage, "get_style": style_stage, "render": render_stage}
+
+
+def _measure(stage: Callable[[], int], trace_memory: bool) -> Tuple[float, int, int]:
+    """Run one stage, returning wall time, peak memory (KiB) and output size."""
+    # The CV code prints progress; keep it out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        if trace_memory:
+            tracemalloc.start()
+            output_bytes = stage()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return 0.0, peak // 1024, output_bytes
+        started = time.perf_counter()
+        output_bytes = stage()
+        return time.perf_counter() - started, 0, output_bytes
+
+
+def run_pass(yaml_path: str, output_dir: str, trace_memory: bool) -> Dict[str, Tuple[float, int, int]]:
+    """Run every stage once in order."""
+    stages = _stage_functions(yaml_path, output_dir)
+    return {name: _measure(stages[name], trace_memory) for name in STAGES}
+
+
+def _write_yaml(size: str, directory: str) -> str:
+    yaml_path = os.path.join(directory, f"{size}.yaml")
+    with open(yaml_path, "w", encoding="utf-8") as yaml_file:
+        yaml.safe_dump(synthetic_cv(*SIZES[size]), yaml_file, sort_keys=False)
+    return yaml_path
+
+
+def bench_cold(size: str) -> Dict[str, Dict[str, float]]:
+    """Measure the first call of every stage in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--cold-worker", size],
+        check=True, capture_output=True, text=True, cwd=ROOT_DIR,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def bench_warm(size: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Measure repeated calls of every stage after a warm-up pass."""
+    with tempfile.TemporaryDirectory() as directory:
+        yaml_path = _write_yaml(size, directory)
+        run_pass(yaml_path, directory, trace_memory=False)
+        timings: Dict[str, List[float]] = {name: [] for name in STAGES}
+        outputs: Dict[str, int] = {}
+        for _ in range(repeat):
+            for name, (wall_s, _, output_bytes) in run_pass(yaml_path, directory, trace_memory=False).items():
+                timings[name].append(wall_s)
+                outputs[name] = output_bytes
+        memory = run_pass(yaml_path, directory, trace_memory=True)
+    return {
+        name: {
+            "wall_s": round(statistics.median(timings[name]), 6),
+            "wall_min_s": round(min(timings[name]), 6),
+            "peak_kib": memory[name][1],
+            "output_bytes": outputs[name],
+        }
+        for name in STAGES
+    }
+
+
+def _cold_worker(size: str) -> None:
+    """Entry point of the fresh interpreter used by bench_cold."""
+    with tempfile.TemporaryDirectory() as directory:
+        yaml_path = _write_yaml(size, directory)
+        timed = run_pass(yaml_path, directory, trace_memory=False)
+        # Memory is traced in a second pass so tracing does not skew the cold timings
+        memory = run_pass(yaml_path, directory, trace_memory=True)
+    print(json.dumps({
+        name: {"wall_s": round(timed[name][0], 6), "peak_kib": memory[name][1], "output_bytes": timed[name][2]}
+        for name in STAGES
+    }))
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    """Return a description of every metric that regressed against the baseline."""
+    regressions = []
+    for size, phases in results["results"].items():
+        for phase, stages in phases.items():
+            for stage, metrics in stages.items():
+                base = baseline.get("results", {}).get(size, {}).get(phase, {}).get(stage)
+                if not base:
+                    continue
+                for metric, threshold in thresholds.items():
+                    current, previous = metrics.get(metric), base.get(metric)
+                    # Tiny values are dominated by noise
+                    if not current or not previous or (metric == "wall_s" and previous < 0.0005):
+                        continue
+                    if current > previous * threshold:
+                        regressions.append(
+                            f"{size}/{phase}/{stage} {metric}: {current} vs baseline {previous} "
+                            f"(x{current / previous:.2f}, limit x{threshold})"
+                        )
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'size':<8} {'phase':<5} {'stage':<11} {'wall ms':>10} {'peak KiB':>9} {'bytes':>9}")
+    for size, phases in results["results"].items():
+        for phase, stages in phases.items():
+            for stage, metrics in stages.items():
+                print(
+                    f"{size:<8} {phase:<5} {stage:<11} {metrics['wall_s'] * 1000:>10.2f} "
+                    f"{metrics['peak_kib']:>9} {metrics['output_bytes']:>9}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generate_cv subsystem.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="CV sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=10, help="Warm repetitions per stage")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None, help="Override the wall-time regression ratio")
+    parser.add_argument("--cold-worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_worker:
+        _cold_worker(args.cold_worker)
+        return
+
+    results: Dict[str, Any] = {
+        "benchmark": "generate_cv",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size} CV {SIZES[size]}...")
+        results["results"][size] = {"cold": bench_cold(size), "warm": bench_warm(size, args.repeat)}
+
+    print_table(results)
+
+    target = args.baseline if args.save_baseline else args.output
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=2)
+    print(f"Results written to {target}")
+    if args.save_baseline:
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if args.threshold:
+        thresholds["wall_s"] = args.threshold
+    regressions = compare(results, baseline, thresholds)
+    if regressions:
+        print("Regressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Contention benchmark for SQLite writers.
+
+Starts N concurrent writers (processes by default, like several automation
+workers) that each save job applications one transaction at a time, and
+reports writes per second and "database is locked" failures for every
+SQLite profile in db.database.SQLITE_PROFILES.
+
+Usage:
+    python benchmarks/bench_sqlite_writers.py --writers 1 4 8 --rows 200
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel
+
+from db.crud import assign_job_key
+from db.database import SQLITE_PROFILES, create_db_engine
+from db.models import JobApplication
+
+
+def _write_rows(url: str, profile: str, writer_id: int, rows: int) -> Tuple[int, int, float, float]:
+    """Insert rows one transaction at a time.
+
+    Returns:
+        Tuple of rows written, "database is locked" errors, and the wall-clock
+        start and end of the writes (so process start-up is not measured)
+    """
+    engine = create_db_engine(url, echo=False, sqlite_profile=profile)
+    written = locked = 0
+    started = time.time()
+    for row in range(rows):
+        job_application = JobApplication(
+            link=f"https://glints.com/id/opportunities/jobs/bench/{writer_id}-{row}",
+            company_name="Bench Company",
+            role="Backend Engineer",
+            location="Remote",
+            salary_min=5000000,
+            description="Benchmark description " * 20,
+            cv_summary="Benchmark summary " * 5,
+        )
+        assign_job_key(job_application)
+        try:
+            with Session(engine) as session:
+                session.add(job_application)
+                session.commit()
+            written += 1
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+    finished = time.time()
+    engine.dispose()
+    return written, locked, started, finished
+
+
+def _process_writer(args: Tuple[str, str, int, int]) -> Tuple[int, int, float, float]:
+    return _write_rows(*args)
+
+
+def run(profile: str, writers: int, rows: int, mode: str) -> Dict[str, float]:
+    """Run one contention round against a fresh database file."""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        setup_engine = create_db_engine(url, echo=False, sqlite_profile=profile)
+        SQLModel.metadata.create_all(setup_engine)
+        setup_engine.dispose()
+
+        jobs = [(url, profile, writer_id, rows) for writer_id in range(writers)]
+        if mode == "process":
+            with multiprocessing.get_context("spawn").Pool(writers) as pool:
+                results: List[Tuple[int, int, float, float]] = pool.map(_process_writer, jobs)
+        else:
+            results = [(0, 0, 0.0, 0.0)] * writers
+
+            def target(index: int) -> None:
+                results[index] = _write_rows(*jobs[index])
+
+            threads = [threading.Thread(target=target, args=(index,)) for index in range(writers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    written = sum(result[0] for result in results)
+    locked = sum(result[1] for result in results)
+    elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+    return {"writes": written, "locked": locked, "elapsed_s": elapsed, "writes_per_s": written / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SQLite writers per profile.")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 8], help="Concurrent writer counts")
+    parser.add_argument("--rows", type=int, default=200, help="Rows written by each writer")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process", help="Writers as processes or threads")
+    parser.add_argument("--profiles", nargs="+", choices=list(SQLITE_PROFILES), default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'writers':>7} {'writes':>7} {'locked':>7} {'seconds':>8} {'writes/s':>9}")
+    for profile in args.profiles:
+        for writers in args.writers:
+            result = run(profile, writers, args.rows, args.mode)
+            print(
+                f"{profile:<12} {writers:>7} {result['writes']:>7} {result['locked']:>7} "
+                f"{result['elapsed_s']:>8.2f} {result['writes_per_s']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
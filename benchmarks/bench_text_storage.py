@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Storage benchmark for the job description and CV summary texts.
+
+Builds two SQLite databases with the same job applications: one with the
+texts inline in jobapplication (the layout before the jobapplicationtext
+table) and one with the current models, where the texts live compressed in
+jobapplicationtext. Runs the same queries on both: the ones that only need
+the listing columns (a page of the list, a lookup by link, a full scan) and
+reading one job with its texts, and reports their time and the file size.
+The current layout also reads jobs with their texts through the async CRUD
+functions, which fails if the texts are lazy-loaded in an AsyncSession.
+
+Usage:
+    python benchmarks/bench_text_storage.py --rows 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Select, String, Table, func, insert, select, text
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.crud import get_job_by_link_async, list_job_applications_async
+from db.database import create_async_db_engine, create_db_engine
+from db.job_keys import canonical_job_key
+from db.models import JobApplication, JobApplicationText
+
+BOILERPLATE = (
+    "We are looking for a motivated engineer to join our growing team in Jakarta. "
+    "You will work closely with product managers and designers to deliver features. "
+    "Benefits include health insurance, annual bonus, flexible working hours and a laptop. "
+)
+WORDS = [f"{syllable}{suffix}" for syllable in ("data", "api", "cloud", "ops", "web", "core", "ml", "pay", "geo", "sync")
+         for suffix in ("", "s", "ing", "er", "able", "ment", "flow", "base", "hub", "kit")]
+
+# Layout of jobapplication before the texts moved to jobapplicationtext
+inline_metadata = MetaData()
+inline_table = Table(
+    "jobapplication", inline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("link", String, nullable=False, unique=True),
+    Column("job_key", String, nullable=False, unique=True),
+    Column("status", String, nullable=False, index=True),
+    Column("company_name", String, nullable=False, index=True),
+    Column("role", String, nullable=False),
+    Column("location", String, nullable=False),
+    Column("salary_min", Integer, nullable=False),
+    Column("description", String, nullable=False),
+    Column("cv_summary", String, nullable=False),
+    Column("created_at", DateTime, nullable=False, index=True),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def make_rows(rows: int, seed: int = 7) -> List[Dict]:
+    """Job applications with descriptions of a few KB, like scraped Glints postings."""
+    generator = random.Random(seed)
+    now = datetime.utcnow()
+    result = []
+    for row in range(rows):
+        link = f"https://glints.com/id/opportunities/jobs/bench/{row:08x}-0000-4000-8000-{row:012x}"
+        description = BOILERPLATE + " ".join(generator.choices(WORDS, k=generator.randint(300, 700))) + " " + BOILERPLATE
+        result.append({
+            "link": link,
+            "job_key": canonical_job_key(link),
+            "status": "APPLY",
+            "company_name": f"Company {row % 500}",
+            "role": "Backend Engineer",
+            "location": "Jakarta",
+            "salary_min": 5000000 + row,
+            "description": description,
+            "cv_summary": "Experienced backend engineer. " + " ".join(generator.choices(WORDS, k=120)),
+            "created_at": now,
+            "updated_at": now,
+        })
+    return result
+
+
+def timed(action: Callable[[], object], repeat: int) -> float:
+    """Mean milliseconds per call."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def file_size_mb(engine, path: str) -> float:
+    with engine.connect() as connection:
+        connection.execute(text("VACUUM"))
+    return os.path.getsize(path) / 1024 / 1024
+
+
+def bench_queries(engine, path: str, table: Table, text_statement: Callable[[str], Select], job_keys: List[str], repeat: int) -> Dict[str, float]:
+    """Time the same Core queries on either layout; table is the one listings read."""
+    generator = random.Random(1)
+    with engine.connect() as connection:
+        page = lambda: connection.execute(
+            select(table).where(table.c.id > generator.randrange(len(job_keys))).order_by(table.c.id).limit(100)
+        ).all()
+        lookup = lambda: connection.execute(select(table).where(table.c.job_key == generator.choice(job_keys))).one()
+        scan = lambda: sum(1 for _ in connection.execute(select(table)))
+        read_text = lambda: connection.execute(text_statement(generator.choice(job_keys))).one()
+        result = {
+            "list_page_ms": timed(page, repeat),
+            "get_by_link_ms": timed(lookup, repeat),
+            "full_scan_ms": timed(scan, 3),
+            "read_text_ms": timed(read_text, repeat),
+        }
+    result["size_mb"] = file_size_mb(engine, path)
+    return result
+
+
+async def bench_async_reads(path: str, links: List[str], repeat: int) -> float:
+    """Mean milliseconds to read a job and its description through the async CRUD functions."""
+    engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}", echo=False)
+    generator = random.Random(1)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            page = await list_job_applications_async(session, limit=10)
+            assert all("text" not in job_application.__dict__ for job_application in page), "listing loaded the texts"
+            session.expunge_all()
+            page = await list_job_applications_async(session, limit=10, with_text=True)
+            assert all(job_application.description for job_application in page), "page without texts"
+            session.expunge_all()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                job_application = await get_job_by_link_async(session, generator.choice(links))
+                assert job_application.description, "job without description"
+                # Drop the loaded rows so every call reads from the database
+                session.expunge_all()
+            return (time.perf_counter() - started) * 1000 / repeat
+    finally:
+        await engine.dispose()
+
+
+def bench_inline(path: str, rows: List[Dict], repeat: int) -> Dict[str, float]:
+    engine = create_db_engine(f"sqlite:///{path}", echo=False)
+    inline_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(inline_table), rows)
+    # Every query used to read the texts along with the listing columns
+    result = bench_queries(
+        engine, path, inline_table,
+        lambda job_key: select(inline_table).where(inline_table.c.job_key == job_key),
+        [row["job_key"] for row in rows], repeat,
+    )
+    engine.dispose()
+    return result
+
+
+def bench_side_table(path: str, rows: List[Dict], repeat: int) -> Dict[str, float]:
+    engine = create_db_engine(f"sqlite:///{path}", echo=False)
+    # Tables only, like the inline database (no full-text index)
+    SQLModel.metadata.create_all(engine)
+    table = JobApplication.__table__
+    texts = JobApplicationText.__table__
+    with engine.begin() as connection:
+        connection.execute(insert(table), [{name: value for name, value in row.items() if name in table.c} for row in rows])
+        ids = dict(connection.execute(select(table.c.job_key, table.c.id)).all())
+        connection.execute(insert(texts), [
+            {"job_application_id": ids[row["job_key"]], "description": row["description"], "cv_summary": row["cv_summary"]}
+            for row in rows
+        ])
+        text_bytes = connection.execute(
+            select(func.sum(func.length(texts.c.description) + func.length(texts.c.cv_summary)))
+        ).scalar_one()
+    result = bench_queries(
+        engine, path, table,
+        lambda job_key: select(table, texts.c.description, texts.c.cv_summary)
+        .join(texts, texts.c.job_application_id == table.c.id)
+        .where(table.c.job_key == job_key),
+        [row["job_key"] for row in rows], repeat,
+    )
+    engine.dispose()
+    result["read_text_async_ms"] = asyncio.run(bench_async_reads(path, [row["link"] for row in rows], repeat))
+    result["stored_text_mb"] = text_bytes / 1024 / 1024
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inline and compressed side-table text storage.")
+    parser.add_argument("--rows", type=int, default=20000, help="Job applications to generate")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per timed query")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    raw_mb = sum(len(row["description"]) + len(row["cv_summary"]) for row in rows) / 1024 / 1024
+    with tempfile.TemporaryDirectory() as directory:
+        inline = bench_inline(os.path.join(directory, "inline.db"), rows, args.repeat)
+        side_table = bench_side_table(os.path.join(directory, "side_table.db"), rows, args.repeat)
+
+    print(f"{args.rows} job applications, {raw_mb:.1f} MB of text ({side_table['stored_text_mb']:.1f} MB compressed)")
+    print(f"{'metric':<16} {'inline':>10} {'side table':>11}")
+    for metric in ("size_mb", "list_page_ms", "get_by_link_ms", "full_scan_ms", "read_text_ms"):
+        print(f"{metric:<16} {inline[metric]:>10.2f} {side_table[metric]:>11.2f}")
+    print(f"{'read_text_async_ms':<16} {'-':>10} {side_table['read_text_async_ms']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+from .memory import BrowserMemoryMonitor
+from .session import BrowserSession, launch_persistent_context
@@ -0,0 +1,168 @@
+"""Renderer memory reporting and page/context recycling for long runs.
+
+Chrome's memory grows over a long session: the listing page accumulates DOM
+and JS heap, and the context keeps caches of every job page visited. The
+BrowserMemoryMonitor samples the JS heap and DOM counters of every page in
+the context after each job (over CDP, Performance.getMetrics), appends them
+to a JSON Lines report, and recycles the working page every
+BROWSER_RECYCLE_PAGE_JOBS jobs and the context every
+BROWSER_RECYCLE_CONTEXT_JOBS jobs or once the heap passes
+BROWSER_MAX_RENDERER_MB. See BrowserSession.recycle() for what survives.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from patchright.async_api import Page
+
+from .session import BrowserSession
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BROWSER_RECYCLE_PAGE_JOBS = int(os.getenv("BROWSER_RECYCLE_PAGE_JOBS", "25"))
+BROWSER_RECYCLE_CONTEXT_JOBS = int(os.getenv("BROWSER_RECYCLE_CONTEXT_JOBS", "200"))
+# JS heap of all pages in the context; 0 disables the memory trigger
+BROWSER_MAX_RENDERER_MB = float(os.getenv("BROWSER_MAX_RENDERER_MB", "512"))
+# JSON Lines memory report, e.g. "browser_memory.jsonl"; empty (the default) disables it
+BROWSER_MEMORY_LOG = os.getenv("BROWSER_MEMORY_LOG", "")
+
+MB = 1024 * 1024
+
+
+async def page_memory(page: Page) -> Dict[str, float]:
+    """JS heap and DOM counters of one page's renderer, from Performance.getMetrics."""
+    cdp = await page.context.new_cdp_session(page)
+    try:
+        await cdp.send("Performance.enable")
+        metrics = {metric["name"]: metric["value"] for metric in (await cdp.send("Performance.getMetrics"))["metrics"]}
+    finally:
+        await cdp.detach()
+    return {
+        "js_heap_used_mb": metrics.get("JSHeapUsedSize", 0) / MB,
+        "js_heap_total_mb": metrics.get("JSHeapTotalSize", 0) / MB,
+        "nodes": int(metrics.get("Nodes", 0)),
+        "documents": int(metrics.get("Documents", 0)),
+        "listeners": int(metrics.get("JSEventListeners", 0)),
+    }
+
+
+class BrowserMemoryMonitor:
+    """Samples context memory after every job and recycles pages and contexts.
+
+    Usage:
+
+        monitor = BrowserMemoryMonitor(session)
+        ...
+        page = await monitor.after_job()  # possibly a new page
+    """
+
+    def __init__(
+        self,
+        session: BrowserSession,
+        page_jobs: int = BROWSER_RECYCLE_PAGE_JOBS,
+        context_jobs: int = BROWSER_RECYCLE_CONTEXT_JOBS,
+        max_renderer_mb: float = BROWSER_MAX_RENDERER_MB,
+        log_path: Optional[str] = BROWSER_MEMORY_LOG,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            session: The open browser session to watch and recycle
+            page_jobs: Replace the working page after this many jobs, 0 to never
+            context_jobs: Relaunch the context after this many jobs, 0 to never
+            max_renderer_mb: Relaunch the context once its JS heap passes this, 0 to never
+            log_path: JSON Lines file for the memory samples, None or empty to only print
+        """
+        self.session = session
+        self.page_jobs = page_jobs
+        self.context_jobs = context_jobs
+        self.max_renderer_mb = max_renderer_mb
+        self.log_path = log_path
+        self.jobs = 0
+        self.jobs_on_page = 0
+        self.jobs_on_context = 0
+        self.peak_js_heap_mb = 0.0
+        self.recycles = {"page": 0, "context": 0}
+
+    async def sample(self) -> Dict[str, Any]:
+        """Memory of every open page in the context, summed per context."""
+        totals = {"js_heap_used_mb": 0.0, "js_heap_total_mb": 0.0, "nodes": 0, "documents": 0, "listeners": 0}
+        pages = 0
+        for page in self.session.context.pages:
+            if page.is_closed():
+                continue
+            try:
+                memory = await page_memory(page)
+            except Exception as e:
+                logger.warning("Gagal membaca memori halaman %s: %s", page.url, e)
+                continue
+            pages += 1
+            for name, value in memory.items():
+                totals[name] += value
+        self.peak_js_heap_mb = max(self.peak_js_heap_mb, totals["js_heap_total_mb"])
+        return {
+            "time": datetime.utcnow().isoformat(),
+            "generation": self.session.generation,
+            "jobs": self.jobs,
+            "jobs_on_page": self.jobs_on_page,
+            "jobs_on_context": self.jobs_on_context,
+            "pages": pages,
+            **{name: round(value, 2) for name, value in totals.items()},
+        }
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps(record) + "\n")
+
+    def _recycle_reason(self, record: Dict[str, Any]) -> Optional[str]:
+        if self.max_renderer_mb and record["js_heap_total_mb"] >= self.max_renderer_mb:
+            return "memory"
+        if self.context_jobs and self.jobs_on_context >= self.context_jobs:
+            return "context_jobs"
+        if self.page_jobs and self.jobs_on_page >= self.page_jobs:
+            return "page_jobs"
+        return None
+
+    async def after_job(self) -> Page:
+        """
+        Record one finished job, sample memory, and recycle if a limit is reached.
+
+        Returns:
+            The working page, which is a new one after a recycle
+        """
+        self.jobs += 1
+        self.jobs_on_page += 1
+        self.jobs_on_context += 1
+        record = await self.sample()
+        reason = self._recycle_reason(record)
+        record["recycled"] = reason
+        self._write(record)
+        logger.debug(
+            "Memori browser: %.1f MB heap, %s node, %s halaman (konteks #%s, %s job)",
+            record["js_heap_total_mb"], record["nodes"], record["pages"], record["generation"], self.jobs_on_context,
+        )
+        if reason is None:
+            return self.session.page
+
+        started = time.perf_counter()
+        relaunch = reason != "page_jobs" and not self.session.attached
+        page = await self.session.recycle(context=relaunch)
+        self.jobs_on_page = 0
+        # An attached context is never relaunched; count its jobs from the new page
+        if relaunch or self.session.attached:
+            self.jobs_on_context = 0
+        self.recycles["context" if relaunch else "page"] += 1
+        logger.info("%s browser didaur ulang (%s) dalam %.2fs.", "Konteks" if relaunch else "Halaman", reason, time.perf_counter() - started)
+        return page
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals for the end-of-run summary."""
+        return {"jobs": self.jobs, "peak_js_heap_mb": round(self.peak_js_heap_mb, 2), "recycles": dict(self.recycles)}
@@ -0,0 +1,208 @@
+"""Browser context shared by main.py and the providers.
+
+scripts/keep_browser_open.py keeps Chrome running on the user profile with
+a CDP (Chrome DevTools Protocol) endpoint. BrowserSession attaches to that
+warm browser with connect_over_cdp, which takes a fraction of a second, and
+only falls back to launching its own persistent context (Chrome startup plus
+profile load) when no daemon is listening.
+"""
+
+import logging
+import os
+import shlex
+import time
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+from patchright.async_api import Browser, BrowserContext, Page, Playwright
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Chrome profile used by the daemon and by the launch fallback
+CHROME_USER_DATA_DIR = os.getenv("CHROME_USER_DATA_DIR", "/home/wijayanto1320/.config/google-chrome/Default")
+CHROME_CHANNEL = os.getenv("CHROME_CHANNEL", "chrome")
+
+# Server deployments run without a display
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "false").lower() in ("1", "true", "yes")
+# Extra Chrome flags, e.g. BROWSER_ARGS="--disable-gpu --js-flags=--max-old-space-size=512"
+BROWSER_ARGS = shlex.split(os.getenv("BROWSER_ARGS", ""))
+# Added in headless mode: containers often have a tiny /dev/shm
+HEADLESS_ARGS = ["--disable-dev-shm-usage"]
+# Window size of headless pages (a headed browser uses the window size)
+HEADLESS_VIEWPORT = {"width": 1920, "height": 1080}
+
+# CDP endpoint of the browser daemon; empty disables attaching
+BROWSER_CDP_URL = os.getenv("BROWSER_CDP_URL", "http://127.0.0.1:9222")
+# How long to wait for the daemon before launching a browser instead
+BROWSER_CDP_TIMEOUT_MS = int(os.getenv("BROWSER_CDP_TIMEOUT_MS", "3000"))
+
+
+def cdp_port(cdp_url: str = BROWSER_CDP_URL) -> int:
+    """Port of a CDP endpoint URL (9222 if the URL has none)."""
+    return urlparse(cdp_url).port or 9222
+
+
+def launch_args(headless: bool = BROWSER_HEADLESS, extra_args: Optional[List[str]] = None) -> List[str]:
+    """Chrome flags for a launch: the headless defaults, BROWSER_ARGS, then extra_args."""
+    return [*(HEADLESS_ARGS if headless else []), *BROWSER_ARGS, *(extra_args or [])]
+
+
+async def launch_persistent_context(
+    playwright: Playwright,
+    user_data_dir: str = CHROME_USER_DATA_DIR,
+    args: Optional[List[str]] = None,
+    headless: bool = BROWSER_HEADLESS,
+) -> BrowserContext:
+    """Launch Chrome with a persistent context on the user profile.
+
+    Args:
+        playwright: Running Playwright instance
+        user_data_dir: Chrome profile directory; cookies and storage live here
+        args: Chrome flags added after the configured ones
+        headless: Run without a window
+    """
+    return await playwright.chromium.launch_persistent_context(
+        user_data_dir=user_data_dir,
+        channel=CHROME_CHANNEL,
+        headless=headless,
+        no_viewport=not headless,
+        viewport=HEADLESS_VIEWPORT if headless else None,
+        args=launch_args(headless, args),
+    )
+
+
+class BrowserSession:
+    """A browser context, attached to the daemon over CDP or launched on demand.
+
+    Usage:
+
+        async with async_playwright() as p:
+            async with BrowserSession(p) as session:
+                await glints_provider(page=session.page)
+
+    When attached, the session works in its own page and only closes what it
+    opened, so the daemon's browser stays warm for the next run. When it
+    launched the browser itself, the whole context is closed on exit.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        cdp_url: Optional[str] = BROWSER_CDP_URL,
+        user_data_dir: str = CHROME_USER_DATA_DIR,
+        cdp_timeout_ms: int = BROWSER_CDP_TIMEOUT_MS,
+        headless: bool = BROWSER_HEADLESS,
+    ):
+        """Initialize the session.
+
+        Args:
+            playwright: Running Playwright instance
+            cdp_url: CDP endpoint of the browser daemon, None or empty to always launch
+            user_data_dir: Chrome profile for the launch fallback
+            cdp_timeout_ms: Milliseconds to wait for the daemon before falling back
+            headless: Launch the fallback browser without a window
+        """
+        self.playwright = playwright
+        self.cdp_url = cdp_url
+        self.user_data_dir = user_data_dir
+        self.cdp_timeout_ms = cdp_timeout_ms
+        self.headless = headless
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.attached = False
+        self.startup_seconds = 0.0
+        # Incremented every time recycle() replaces the context
+        self.generation = 0
+
+    async def _attach(self) -> bool:
+        if not self.cdp_url:
+            return False
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url, timeout=self.cdp_timeout_ms)
+        except Exception as e:
+            logger.info("Browser daemon tidak tersedia di %s (%s), meluncurkan browser baru...", self.cdp_url, type(e).__name__)
+            return False
+        if not self.browser.contexts:
+            # A daemon always has its persistent context; anything else is not ours to use
+            logger.warning("Browser di %s tidak punya konteks persisten, meluncurkan browser baru...", self.cdp_url)
+            await self.browser.close()
+            self.browser = None
+            return False
+        self.context = self.browser.contexts[0]
+        return True
+
+    async def _launch(self) -> None:
+        self.context = await launch_persistent_context(self.playwright, self.user_data_dir, headless=self.headless)
+        # Reuse the page Chrome opens with (e.g. the new tab page)
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+
+    async def open(self) -> "BrowserSession":
+        """Attach to the daemon or launch a persistent context, and open the working page."""
+        started = time.perf_counter()
+        self.attached = await self._attach()
+        if self.attached:
+            self.page = await self.context.new_page()
+            logger.info("Terhubung ke browser daemon di %s.", self.cdp_url)
+        else:
+            await self._launch()
+            logger.info("Browser diluncurkan dengan konteks persisten%s", " (headless)." if self.headless else ".")
+        self.startup_seconds = time.perf_counter() - started
+        logger.info("Browser siap dalam %.2fs.", self.startup_seconds)
+        return self
+
+    async def recycle(self, context: bool = False) -> Page:
+        """
+        Replace the working page, or the whole context, to give back renderer memory.
+
+        A launched context is closed and relaunched on the same profile, so
+        local storage carries over; cookies are copied across explicitly
+        because Chrome does not write session cookies to the profile. An
+        attached context belongs to the daemon; only the page is replaced
+        there.
+
+        Args:
+            context: Relaunch the context too, not just the page
+
+        Returns:
+            The new working page
+        """
+        if context and not self.attached:
+            cookies = await self.context.cookies()
+            await self.context.close()
+            await self._launch()
+            if cookies:
+                await self.context.add_cookies(cookies)
+            self.generation += 1
+            return self.page
+        old_page = self.page
+        self.page = await self.context.new_page()
+        if old_page and not old_page.is_closed():
+            await old_page.close()
+        return self.page
+
+    async def close(self) -> None:
+        """Close what this session opened; a daemon's browser is left running."""
+        if self.attached:
+            # Job tabs opened from the working page, then the page itself;
+            # other clients of the daemon keep their pages
+            for page in self.context.pages:
+                if page is not self.page and not page.is_closed() and await page.opener() is self.page:
+                    await page.close()
+            if self.page and not self.page.is_closed():
+                await self.page.close()
+            if self.browser:
+                # Disconnects only: the daemon's persistent context is not closed
+                await self.browser.close()
+        elif self.context:
+            await self.context.close()
+        self.browser = self.context = self.page = None
+
+    async def __aenter__(self) -> "BrowserSession":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
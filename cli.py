@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Command line entry point for the job automation.
+
+Every subcommand imports what it needs when it runs: `stats` and `clean` load
+only the database layer, `render` only the CV generator, and the browser
+and LLM stacks are loaded by `run`, `resume`, `discover` and `worker` alone.
+
+Usage:
+    python cli.py run [--profile] [--mode scrape|classify|render|apply] [--deadline 17:00] [--max-per-day 20]
+    python cli.py resume                       # continue an interrupted run from its checkpoint
+    python cli.py discover [--mode apply]      # enqueue the jobs of the listing for workers of that mode
+    python cli.py worker [--follow]            # process queued jobs; run as many as you like
+    python cli.py stats [--json]
+    python cli.py clean [--yes]
+    python cli.py render backend [--vacancy-file vacancy.txt] [-o cv.pdf]
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Profiling options of the commands that open the browser."""
+    parser.add_argument("--profile", action="store_true", help="Profile the run (pstats, speedscope, loop lag, tracemalloc)")
+    # Defaults come from telemetry.profiling, which is only imported by a profiled run
+    parser.add_argument("--profile-dir", help="Parent of the per-run profile directory (default: PROFILE_DIR or profiles)")
+    parser.add_argument("--snapshot-every", type=int, help="tracemalloc snapshot every N jobs, 0 to disable (default: PROFILE_SNAPSHOT_JOBS or 10)")
+
+
+def add_mode_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--mode",
+        choices=("scrape", "classify", "render", "apply"),
+        default="apply",
+        help="Stop each job after this stage; all but apply only stage job records (default: apply)",
+    )
+
+
+def add_deadline_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--deadline", help="Start no job that would end after this: HH:MM or a duration like 90m (default: RUN_DEADLINE)")
+
+
+def add_budget_arguments(parser: argparse.ArgumentParser) -> None:
+    """Deadline and daily cap; the defaults come from provider.budget, which is imported by the run itself."""
+    add_deadline_argument(parser)
+    parser.add_argument("--max-per-day", type=int, help="Stop at this many applications today, 0 for no cap (default: MAX_APPLICATIONS_PER_DAY or 0)")
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options of the run and resume commands (also used by main.py)."""
+    add_profile_arguments(parser)
+    add_mode_argument(parser)
+    add_budget_arguments(parser)
+
+
+def command_run(args: argparse.Namespace) -> None:
+    from main import run
+
+    run(
+        resume=args.command == "resume",
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        snapshot_every=args.snapshot_every,
+        mode=args.mode,
+        deadline=args.deadline,
+        max_per_day=args.max_per_day,
+    )
+
+
+def command_discover(args: argparse.Namespace) -> None:
+    from main import RunBudget, RunMode, discover_main, execute
+
+    budget = RunBudget.from_settings(args.deadline, max_per_day=0)
+    execute(discover_main(budget=budget, mode=RunMode(args.mode)), args.profile, args.profile_dir, args.snapshot_every)
+
+
+def command_worker(args: argparse.Namespace) -> None:
+    from main import RunBudget, RunMode, execute, worker_main
+
+    budget = RunBudget.from_settings(args.deadline, args.max_per_day)
+    execute(
+        worker_main(mode=RunMode(args.mode), follow=args.follow, max_jobs=args.max_jobs, budget=budget),
+        args.profile,
+        args.profile_dir,
+        args.snapshot_every,
+    )
+
+
+def command_stats(args: argparse.Namespace) -> None:
+    from sqlmodel import Session
+
+    from db.crud import count_job_applications_by_status
+    from db.database import get_engine
+    from db.queue import count_queued_jobs_by_status
+    from db.staging import count_job_records_by_stage
+    from provider.checkpoint import RunCheckpoint
+
+    with Session(get_engine()) as session:
+        by_status = {status.value: count for status, count in count_job_applications_by_status(session).items()}
+        staged = {stage.value: count for stage, count in count_job_records_by_stage(session).items()}
+        queue = {
+            mode: {status.value: count for status, count in counts.items()}
+            for mode, counts in count_queued_jobs_by_status(session).items()
+        }
+    stats = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "staged": staged,
+        "queue": queue,
+        "checkpoint": RunCheckpoint().load() or None,
+    }
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Total job applications: {stats['total']}")
+    for status, count in sorted(by_status.items()):
+        print(f"  {status:<12} {count}")
+    if staged:
+        print(f"Staged job records: {sum(staged.values())}")
+        for stage, count in sorted(staged.items()):
+            print(f"  {stage:<12} {count}")
+    for mode, counts in sorted(queue.items()):
+        print(f"Job queue ({mode}): {sum(counts.values())}")
+        for status, count in sorted(counts.items()):
+            print(f"  {status:<12} {count}")
+    if stats["checkpoint"]:
+        checkpoint = stats["checkpoint"]
+        print(f"Interrupted run: next card {checkpoint['next_card'] + 1}/{checkpoint['cards']} (saved {checkpoint['updated_at']})")
+
+
+def command_clean(args: argparse.Namespace) -> None:
+    from sqlmodel import Session
+
+    from db.crud import count_job_applications, delete_all_job_applications
+    from db.database import get_engine
+
+    with Session(get_engine()) as session:
+        current_count = count_job_applications(session)
+        if current_count == 0:
+            print("Database is already empty. Nothing to clean.")
+            return
+        if not args.yes:
+            confirmation = input(f"Are you sure you want to delete all {current_count} job applications? (yes/no): ")
+            if confirmation.lower() != "yes":
+                print("Operation cancelled.")
+                return
+        deleted = delete_all_job_applications(session)
+    print(f"Deleted {deleted} job applications.")
+
+
+def command_render(args: argparse.Namespace) -> None:
+    from generate_cv.pdf_generator import JobCategory, generate_cv_pdf_from_yaml
+
+    vacancy = ""
+    if args.vacancy_file:
+        with open(args.vacancy_file, "r", encoding="utf-8") as vacancy_file:
+            vacancy = vacancy_file.read()
+    output = generate_cv_pdf_from_yaml(
+        job_category=JobCategory(args.category),
+        style=args.style,
+        page_size=args.page_size,
+        vacancy=vacancy,
+        output_path=args.output,
+        summary=args.summary,
+        profile=args.profile,
+    )
+    print(f"CV written to {output.pdf_path}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Lamar pekerjaan Glints secara otomatis.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("run", "Apply to the jobs of the listing"), ("resume", "Continue an interrupted run from its checkpoint")):
+        command = commands.add_parser(name, help=help_text)
+        add_run_arguments(command)
+        command.set_defaults(handler=command_run)
+
+    discover = commands.add_parser("discover", help="Enqueue the jobs of the listing that were not applied to yet")
+    add_profile_arguments(discover)
+    add_mode_argument(discover)
+    add_deadline_argument(discover)
+    discover.set_defaults(handler=command_discover)
+
+    worker = commands.add_parser("worker", help="Claim and process queued jobs until the queue is empty")
+    add_profile_arguments(worker)
+    add_mode_argument(worker)
+    add_budget_arguments(worker)
+    worker.add_argument("--follow", action="store_true", help="Keep waiting for new jobs when the queue is empty")
+    worker.add_argument("--max-jobs", type=int, help="Stop after this many jobs")
+    worker.set_defaults(handler=command_worker)
+
+    stats = commands.add_parser("stats", help="Count the stored job applications per status")
+    stats.add_argument("--json", action="store_true", help="Print JSON")
+    stats.set_defaults(handler=command_stats)
+
+    clean = commands.add_parser("clean", help="Delete all job applications")
+    clean.add_argument("-y", "--yes", action="store_true", help="Do not ask for confirmation")
+    clean.set_defaults(handler=command_clean)
+
+    render = commands.add_parser("render", help="Render one CV PDF")
+    render.add_argument("category", choices=("backend", "frontend", "fullstack"), help="CV to render")
+    render.add_argument("--vacancy-file", help="Text file with the vacancy; its summary is generated by the LLM")
+    render.add_argument("--summary", help="Summary to use instead of generating one")
+    render.add_argument("-o", "--output", help="Output path (default: content-addressed path in generate_cv/documents/pdf)")
+    render.add_argument("--style", default="classic", help="CV style")
+    render.add_argument("--page-size", default="A4", help="Page size ('A4' or 'letter')")
+    render.add_argument("--profile", default="compact", help="PDF output profile: 'default', 'compact' or 'compact-times' (also folds the fonts onto Times)")
+    render.set_defaults(handler=command_render)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
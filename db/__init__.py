@@ -1,2 +1,9 @@
 from .models import JobApplication, ApplicationStatus
-from .database import create_db_and_tables, get_session, engine
+from .database import create_db_and_tables, get_engine, get_session
+
+
+def __getattr__(name):
+    # db.engine is created on first use; see database.get_engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,51 @@
+"""Compressed storage for large text columns.
+
+On SQLite, CompressedText columns hold zlib-compressed UTF-8 as a BLOB. The
+application's connections also get the codec as the SQL function
+zlib_decompress() for ad hoc queries; the schema never uses it, so other
+SQLite clients can work with every table. Postgres already compresses large
+values out of line (TOAST), so there the column is plain TEXT and stays
+searchable in SQL.
+"""
+
+import os
+import zlib
+from typing import Optional
+
+from sqlalchemy.types import LargeBinary, Text, TypeDecorator
+
+# zlib level: 6 is the usual speed/size balance, 9 squeezes out a few more percent
+TEXT_COMPRESSION_LEVEL = int(os.getenv("TEXT_COMPRESSION_LEVEL", "6"))
+
+
+def compress_text(value: str) -> bytes:
+    return zlib.compress(value.encode("utf-8"), TEXT_COMPRESSION_LEVEL)
+
+
+def decompress_text(value: Optional[bytes]) -> Optional[str]:
+    """Inverse of compress_text(); also registered as the SQLite function zlib_decompress() on the app's connections."""
+    if value is None:
+        return None
+    return zlib.decompress(value).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed on SQLite and as TEXT on Postgres."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Text())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return decompress_text(value)
@@ -1,6 +1,33 @@
-from sqlmodel import Session, select
-from typing import Optional, List
-from .models import JobApplication, ApplicationStatus
+from sqlmodel import Session, func, select
+from sqlmodel.sql.expression import SelectOfScalar
+from sqlalchemy import CompoundSelect, delete, insert, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.expression import Executable
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, List, Tuple
+from .job_keys import canonical_job_key
+from .models import ApplicationFilter, JobApplication, JobApplicationArchive, JobApplicationText, ApplicationStatus
+from .search import search_index_statements
+from .seen_links import seen_links
+
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def assign_job_key(job_application: JobApplication) -> str:
+    """
+    Fill in job_application.job_key from its link if it is not set yet.
+    
+    Args:
+        job_application: The JobApplication about to be stored
+        
+    Returns:
+        The canonical job key
+    """
+    if not job_application.job_key:
+        job_application.job_key = canonical_job_key(job_application.link)
+    return job_application.job_key
 
 
 def create_job_application(session: Session, job_application: JobApplication) -> JobApplication:
@@ -14,15 +41,115 @@ def create_job_application(session: Session, job_application: JobApplication) ->
     Returns:
         The created JobApplication with ID
     """
+    assign_job_key(job_application)
     session.add(job_application)
     session.commit()
     session.refresh(job_application)
+    seen_links.add(job_application.job_key)
     return job_application
 
 
+def insert_if_absent_statement(dialect_name: str, job_application: JobApplication, return_id: bool = False) -> Insert:
+    """
+    Build a single INSERT ... ON CONFLICT DO NOTHING statement.
+    
+    A row whose job_key (or raw link) is already stored is skipped.
+    
+    Args:
+        dialect_name: Name of the database dialect ("sqlite" or "postgresql")
+        job_application: The JobApplication to insert
+        return_id: Add RETURNING id so the generated id comes back in the same round-trip
+        
+    Returns:
+        The insert statement
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    assign_job_key(job_application)
+    values = job_application.model_dump(exclude={"id"} if job_application.id is None else set())
+    statement = insert(JobApplication).values(**values).on_conflict_do_nothing()
+    if return_id:
+        statement = statement.returning(JobApplication.id)
+    return statement
+
+
+def text_rows(job_applications: List[JobApplication]) -> List[Dict[str, Any]]:
+    """Values for the JobApplicationText rows of inserted job applications (ids must be set)."""
+    return [
+        {
+            "job_application_id": job_application.id,
+            "description": job_application.text.description,
+            "cv_summary": job_application.text.cv_summary,
+        }
+        for job_application in job_applications
+        if job_application.text is not None
+    ]
+
+
+def text_statements(dialect_name: str, job_applications: List[JobApplication]) -> List[Tuple[Executable, List[Dict[str, Any]]]]:
+    """
+    Statements that store the texts of inserted job applications (ids must be set).
+
+    Args:
+        dialect_name: Name of the database dialect ("sqlite" or "postgresql")
+        job_applications: The inserted job applications
+
+    Returns:
+        (statement, rows) pairs: the JobApplicationText rows, then their full-text index rows
+    """
+    rows = text_rows(job_applications)
+    if not rows:
+        return []
+    return [(insert(JobApplicationText), rows)] + search_index_statements(dialect_name, rows)
+
+
+def insert_job_application_if_absent(session: Session, job_application: JobApplication, return_id: bool = False) -> bool:
+    """
+    Atomically insert a job application unless its job is already stored.
+    
+    A concurrent duplicate resolves in the database (ON CONFLICT DO NOTHING)
+    instead of raising an IntegrityError, and no refresh round-trip is made.
+    
+    Args:
+        session: The database session
+        job_application: The JobApplication to insert
+        return_id: Fetch the generated id into job_application.id (via RETURNING)
+        
+    Returns:
+        True if the row was inserted, False if the job already existed
+    """
+    # The text row needs the generated id
+    return_id = return_id or job_application.text is not None
+    statement = insert_if_absent_statement(session.get_bind().dialect.name, job_application, return_id)
+    result = session.execute(statement)
+    if return_id:
+        new_id = result.scalar_one_or_none()
+        inserted = new_id is not None
+        if inserted:
+            job_application.id = new_id
+            for text_statement, rows in text_statements(session.get_bind().dialect.name, [job_application]):
+                session.execute(text_statement, rows)
+    else:
+        inserted = result.rowcount == 1
+    session.commit()
+    seen_links.add(job_application.job_key)
+    return inserted
+
+
+def stored_job_statement(link: str) -> CompoundSelect:
+    """Select the id of the link's job in the main or the archive table (both indexed on job_key)."""
+    job_key = canonical_job_key(link)
+    return union_all(
+        select(JobApplication.id).where(JobApplication.job_key == job_key),
+        select(JobApplicationArchive.id).where(JobApplicationArchive.job_key == job_key),
+    ).limit(1)
+
+
 def check_link_availability(session: Session, link: str) -> bool:
     """
-    Check if a job application link is available (i.e., not already in the database).
+    Check if a job application link is available (i.e., its job is not already in the database).
+    
+    Any URL variant of a stored job (tracking parameters, locale prefix, ...)
+    counts as already stored, and so does an archived job.
     
     Args:
         session: The database session
@@ -31,14 +158,13 @@ def check_link_availability(session: Session, link: str) -> bool:
     Returns:
         True if the link is not found (available), False if it already exists.
     """
-    statement = select(JobApplication.id).where(JobApplication.link == link) # Select only ID for efficiency
-    existing_application = session.exec(statement).first()
+    existing_application = session.execute(stored_job_statement(link)).first()
     return existing_application is None
 
 
 def get_job_by_link(session: Session, link: str) -> Optional[JobApplication]:
     """
-    Find a job application by its link.
+    Find a job application by its link or any other URL of the same job.
     
     Args:
         session: The database session
@@ -47,22 +173,112 @@ def get_job_by_link(session: Session, link: str) -> Optional[JobApplication]:
     Returns:
         The JobApplication if found, None otherwise
     """
-    statement = select(JobApplication).where(JobApplication.link == link)
+    statement = select(JobApplication).where(JobApplication.job_key == canonical_job_key(link))
     return session.exec(statement).first()
 
 
-def get_all_job_applications(session: Session) -> List[JobApplication]:
+def filter_statement(statement: SelectOfScalar, filters: Optional[ApplicationFilter]) -> SelectOfScalar:
     """
-    Get all job applications.
+    Add the WHERE clauses of an ApplicationFilter to a statement.
+    
+    Args:
+        statement: A select over JobApplication (or its columns)
+        filters: Filters to apply, None for no filtering
+        
+    Returns:
+        The filtered statement
+    """
+    if filters is None:
+        return statement
+    if filters.status:
+        statement = statement.where(JobApplication.status.in_(filters.status))
+    if filters.created_from is not None:
+        statement = statement.where(JobApplication.created_at >= filters.created_from)
+    if filters.created_before is not None:
+        statement = statement.where(JobApplication.created_at < filters.created_before)
+    if filters.company_name is not None:
+        statement = statement.where(JobApplication.company_name == filters.company_name)
+    if filters.salary_min_at_least is not None:
+        statement = statement.where(JobApplication.salary_min >= filters.salary_min_at_least)
+    if filters.salary_min_at_most is not None:
+        statement = statement.where(JobApplication.salary_min <= filters.salary_min_at_most)
+    return statement
+
+
+def page_statement(filters: Optional[ApplicationFilter], after_id: Optional[int], limit: int) -> SelectOfScalar:
+    """Keyset page: the next `limit` rows with an id greater than after_id."""
+    statement = filter_statement(select(JobApplication), filters)
+    if after_id is not None:
+        statement = statement.where(JobApplication.id > after_id)
+    return statement.order_by(JobApplication.id).limit(limit)
+
+
+def count_statement(filters: Optional[ApplicationFilter]) -> SelectOfScalar:
+    return filter_statement(select(func.count()).select_from(JobApplication), filters)
+
+
+def list_job_applications(session: Session, filters: Optional[ApplicationFilter] = None, after_id: Optional[int] = None, limit: int = 100) -> List[JobApplication]:
+    """
+    Get one page of job applications, ordered by id.
+    
+    Uses keyset pagination: pass the id of the last row of a page as after_id
+    to get the next one, so every page costs the same however deep it is.
+    
+    Args:
+        session: The database session
+        filters: Optional filters on status, creation date, company and salary
+        after_id: Id of the last row of the previous page, None for the first page
+        limit: Maximum number of rows in the page
+    
+    Returns:
+        List of at most limit JobApplication objects; empty after the last page
+    """
+    return list(session.exec(page_statement(filters, after_id, limit)))
+
+
+def iter_job_applications(session: Session, filters: Optional[ApplicationFilter] = None, batch_size: int = 1000) -> Iterator[JobApplication]:
+    """
+    Stream job applications, ordered by id, without loading the table into memory.
     
     Args:
         session: The database session
+        filters: Optional filters on status, creation date, company and salary
+        batch_size: Rows fetched from the database per round-trip
+    
+    Yields:
+        JobApplication objects
+    """
+    statement = filter_statement(select(JobApplication), filters).order_by(JobApplication.id)
+    yield from session.exec(statement.execution_options(yield_per=batch_size))
+
+
+def count_job_applications(session: Session, filters: Optional[ApplicationFilter] = None) -> int:
+    """
+    Count job applications with a single COUNT(*) query.
+    
+    Args:
+        session: The database session
+        filters: Optional filters on status, creation date, company and salary
     
     Returns:
-        List of all JobApplication objects
+        Number of matching job applications
     """
-    statement = select(JobApplication)
-    return list(session.exec(statement))
+    return session.exec(count_statement(filters)).one()
+
+
+def count_job_applications_by_status(session: Session, filters: Optional[ApplicationFilter] = None) -> Dict[ApplicationStatus, int]:
+    """
+    Count job applications per status with one GROUP BY query.
+    
+    Args:
+        session: The database session
+        filters: Optional filters on status, creation date, company and salary
+    
+    Returns:
+        Mapping of status to number of job applications
+    """
+    statement = filter_statement(select(JobApplication.status, func.count()), filters).group_by(JobApplication.status)
+    return {status: count for status, count in session.exec(statement)}
 
 
 def update_job_application_status(session: Session, job_id: int, status: ApplicationStatus) -> Optional[JobApplication]:
@@ -88,7 +304,7 @@ def update_job_application_status(session: Session, job_id: int, status: Applica
 
 def delete_all_job_applications(session: Session) -> int:
     """
-    Delete all job applications from the database.
+    Delete all job applications from the database with a single DELETE statement.
     
     Args:
         session: The database session
@@ -96,13 +312,184 @@ def delete_all_job_applications(session: Session) -> int:
     Returns:
         Number of records deleted
     """
-    statement = select(JobApplication)
-    applications = list(session.exec(statement))
-    count = len(applications)
-    
-    # Delete all records
-    for application in applications:
-        session.delete(application)
-    
+    count = session.execute(delete(JobApplication)).rowcount
     session.commit()
     return count
+
+
+# Async equivalents, for callers running inside the event loop
+
+# An AsyncSession cannot lazy-load JobApplication.text on attribute access
+# (MissingGreenlet), so the async reads load it up front, one IN query per batch
+LOAD_TEXT = selectinload(JobApplication.text)
+
+
+async def create_job_application_async(session: "AsyncSession", job_application: JobApplication) -> JobApplication:
+    """
+    Create a new job application entry in the database.
+    
+    Args:
+        session: The async database session
+        job_application: The JobApplication object to add
+        
+    Returns:
+        The created JobApplication with ID
+    """
+    assign_job_key(job_application)
+    session.add(job_application)
+    await session.commit()
+    # A plain refresh() would expire the text again; reload the row with it instead
+    await session.get(JobApplication, job_application.id, options=[LOAD_TEXT], populate_existing=True)
+    seen_links.add(job_application.job_key)
+    return job_application
+
+
+async def insert_job_application_if_absent_async(session: "AsyncSession", job_application: JobApplication, return_id: bool = False) -> bool:
+    """
+    Atomically insert a job application unless its job is already stored.
+    
+    Args:
+        session: The async database session
+        job_application: The JobApplication to insert
+        return_id: Fetch the generated id into job_application.id (via RETURNING)
+        
+    Returns:
+        True if the row was inserted, False if the job already existed
+    """
+    return_id = return_id or job_application.text is not None
+    statement = insert_if_absent_statement(session.sync_session.get_bind().dialect.name, job_application, return_id)
+    result = await session.execute(statement)
+    if return_id:
+        new_id = result.scalar_one_or_none()
+        inserted = new_id is not None
+        if inserted:
+            job_application.id = new_id
+            for text_statement, rows in text_statements(session.sync_session.get_bind().dialect.name, [job_application]):
+                await session.execute(text_statement, rows)
+    else:
+        inserted = result.rowcount == 1
+    await session.commit()
+    seen_links.add(job_application.job_key)
+    return inserted
+
+
+async def check_link_availability_async(session: "AsyncSession", link: str) -> bool:
+    """
+    Check if a job application link is available (i.e., its job is not already in the database).
+    
+    Any URL variant of a stored job (tracking parameters, locale prefix, ...)
+    counts as already stored, and so does an archived job.
+    
+    Args:
+        session: The async database session
+        link: The unique link to check
+        
+    Returns:
+        True if the link is not found (available), False if it already exists.
+    """
+    existing_application = (await session.execute(stored_job_statement(link))).first()
+    return existing_application is None
+
+
+async def get_job_by_link_async(session: "AsyncSession", link: str) -> Optional[JobApplication]:
+    """
+    Find a job application by its link or any other URL of the same job.
+    
+    Args:
+        session: The async database session
+        link: The unique link to search for
+        
+    Returns:
+        The JobApplication if found, None otherwise
+    """
+    statement = select(JobApplication).where(JobApplication.job_key == canonical_job_key(link)).options(LOAD_TEXT)
+    return (await session.exec(statement)).first()
+
+
+async def list_job_applications_async(
+    session: "AsyncSession",
+    filters: Optional[ApplicationFilter] = None,
+    after_id: Optional[int] = None,
+    limit: int = 100,
+    with_text: bool = False,
+) -> List[JobApplication]:
+    """
+    Get one page of job applications, ordered by id (keyset pagination).
+    
+    Args:
+        session: The async database session
+        filters: Optional filters on status, creation date, company and salary
+        after_id: Id of the last row of the previous page, None for the first page
+        limit: Maximum number of rows in the page
+        with_text: Also load description and cv_summary; without it they
+            cannot be read from the returned objects
+    
+    Returns:
+        List of at most limit JobApplication objects; empty after the last page
+    """
+    statement = page_statement(filters, after_id, limit)
+    if with_text:
+        statement = statement.options(LOAD_TEXT)
+    return list(await session.exec(statement))
+
+
+async def iter_job_applications_async(
+    session: "AsyncSession",
+    filters: Optional[ApplicationFilter] = None,
+    batch_size: int = 1000,
+    with_text: bool = False,
+) -> AsyncIterator[JobApplication]:
+    """
+    Stream job applications, ordered by id, without loading the table into memory.
+    
+    Args:
+        session: The async database session
+        filters: Optional filters on status, creation date, company and salary
+        batch_size: Rows fetched from the database per round-trip
+        with_text: Also load description and cv_summary; without it they
+            cannot be read from the yielded objects
+    
+    Yields:
+        JobApplication objects
+    """
+    statement = filter_statement(select(JobApplication), filters).order_by(JobApplication.id)
+    if with_text:
+        statement = statement.options(LOAD_TEXT)
+    result = await session.stream_scalars(statement.execution_options(yield_per=batch_size))
+    async for job_application in result:
+        yield job_application
+
+
+async def count_job_applications_async(session: "AsyncSession", filters: Optional[ApplicationFilter] = None) -> int:
+    """
+    Count job applications with a single COUNT(*) query.
+    
+    Args:
+        session: The async database session
+        filters: Optional filters on status, creation date, company and salary
+    
+    Returns:
+        Number of matching job applications
+    """
+    return (await session.exec(count_statement(filters))).one()
+
+
+async def update_job_application_status_async(session: "AsyncSession", job_id: int, status: ApplicationStatus) -> Optional[JobApplication]:
+    """
+    Update the status of a job application.
+    
+    Args:
+        session: The async database session
+        job_id: The ID of the job application to update
+        status: The new status
+        
+    Returns:
+        The updated JobApplication if found, None otherwise
+    """
+    job = await session.get(JobApplication, job_id, options=[LOAD_TEXT])
+    if job:
+        job.status = status
+        session.add(job)
+        await session.commit()
+        await session.get(JobApplication, job.id, options=[LOAD_TEXT], populate_existing=True)
+    return job
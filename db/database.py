@@ -1,23 +1,208 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import TYPE_CHECKING, Any, Dict, Optional
 import os
 from dotenv import load_dotenv
 
+from .compression import decompress_text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
 # Load environment variables
 load_dotenv()
 
 # Use the DATABASE_URL environment variable or default to a local SQLite database
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///job_applications.db")
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL logging is off by default; set DATABASE_ECHO=true to log every query
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() in ("1", "true", "yes")
+
+# SQLite connection profile: "performance" (WAL, tuned for concurrent writers) or "default"
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+
+# PRAGMAs applied to every new SQLite connection, per profile
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "performance": {
+        # Readers no longer block the writer and commits append to the WAL
+        "journal_mode": "WAL",
+        # Safe with WAL: only a power loss can drop the last commits, never corrupt
+        "synchronous": "NORMAL",
+        # Wait for the write lock instead of failing with "database is locked"
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        # Negative values are KiB
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024))),
+        "temp_store": "MEMORY",
+    },
+}
+
+# Connection pool settings shared by the sync and async engines
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "8"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "8"))
+DATABASE_POOL_TIMEOUT = int(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+
+
+def to_async_url(url: str) -> str:
+    """Map a synchronous database URL to its async driver.
+
+    SQLite uses aiosqlite and Postgres uses asyncpg; URLs that already name
+    an async driver are returned unchanged.
+    """
+    scheme, separator, rest = url.partition("://")
+    async_schemes = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgres": "postgresql+asyncpg",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+    }
+    return f"{async_schemes.get(scheme, scheme)}{separator}{rest}"
+
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool settings for an engine; in-memory SQLite keeps its single-connection pool."""
+    if is_sqlite_url(url) and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return {}
+    return {
+        "pool_size": DATABASE_POOL_SIZE,
+        "max_overflow": DATABASE_MAX_OVERFLOW,
+        "pool_timeout": DATABASE_POOL_TIMEOUT,
+    }
+
+
+def apply_sqlite_profile(engine: Engine, profile: str) -> None:
+    """Run the profile's PRAGMAs on every new connection of a SQLite engine.
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        profile: Name of a profile in SQLITE_PROFILES
+
+    Raises:
+        ValueError: If the profile name is not valid
+    """
+    if profile not in SQLITE_PROFILES:
+        valid_profiles = ', '.join(SQLITE_PROFILES.keys())
+        raise ValueError(f"Invalid SQLite profile: {profile}. Valid profiles are: {valid_profiles}")
+    pragmas = SQLITE_PROFILES[profile]
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def register_sqlite_functions(engine: Engine) -> None:
+    """Register zlib_decompress() for ad hoc SQL over compressed text; no view or trigger depends on it."""
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("zlib_decompress", 1, decompress_text, deterministic=True)
+
+
+def create_db_engine(url: str, echo: bool = DATABASE_ECHO, sqlite_profile: Optional[str] = None) -> Engine:
+    """Create a sync engine with the configured pool and SQLite profile."""
+    db_engine = create_engine(url, echo=echo, **_engine_options(url))
+    if is_sqlite_url(url):
+        register_sqlite_functions(db_engine)
+        apply_sqlite_profile(db_engine, sqlite_profile or SQLITE_PROFILE)
+    return db_engine
+
+
+def create_async_db_engine(url: str, echo: bool = DATABASE_ECHO, sqlite_profile: Optional[str] = None) -> "AsyncEngine":
+    """Create an async engine with the configured pool and SQLite profile."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    db_engine = create_async_engine(url, echo=echo, **_engine_options(url))
+    if is_sqlite_url(url):
+        register_sqlite_functions(db_engine.sync_engine)
+        apply_sqlite_profile(db_engine.sync_engine, sqlite_profile or SQLITE_PROFILE)
+    return db_engine
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Engines are created on first use, so importing db costs no connection setup
+# and commands that never touch the async engine never import its driver
+_engine: Optional[Engine] = None
+_async_engine: Optional["AsyncEngine"] = None
+_async_sessionmaker: Optional["async_sessionmaker[AsyncSession]"] = None
+
+
+def get_engine() -> Engine:
+    """The shared sync engine, created on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_db_engine(DATABASE_URL)
+    return _engine
+
+
+def get_async_engine() -> "AsyncEngine":
+    """The shared async engine, created on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+    return _async_engine
+
+
+def async_session_factory() -> "AsyncSession":
+    """Open a session on the shared async engine, for code running inside the event loop.
+
+    Example:
+        async with async_session_factory() as session:
+            ...
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _async_sessionmaker()
+
+
+def __getattr__(name: str) -> Any:
+    # engine and async_engine used to be module attributes created on import
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_db_and_tables():
-    """Create the database and tables."""
-    SQLModel.metadata.create_all(engine)
+    """Create the database and tables, including the full-text search index."""
+    from .search import create_search_index
+
+    db_engine = get_engine()
+    SQLModel.metadata.create_all(db_engine)
+    with db_engine.begin() as connection:
+        create_search_index(connection)
 
 
 def get_session():
     """Get a database session."""
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
+
+
+async def get_async_session():
+    """Get an async database session."""
+    async with async_session_factory() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """Close pooled async connections; call before the event loop shuts down."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
@@ -0,0 +1,42 @@
+"""Canonical keys for job posting URLs.
+
+The browser reports the same Glints posting under many URLs: with or without
+the locale prefix (/id/, /en/), with a title slug, tracking parameters
+(utm_*, traceInfo, ...) or a fragment. All of them carry the same job UUID,
+so the key of a Glints posting is "glints:<uuid>". Other URLs fall back to
+the lower-cased host and path without query string, fragment or trailing
+slash. Keys are idempotent: a key passed in is returned unchanged.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+GLINTS_JOB_ID_PATTERN = re.compile(
+    r"/opportunities/jobs/(?:[^/?#]+/)*?"
+    r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?=[/?#]|$)",
+    re.IGNORECASE,
+)
+KEY_PREFIXES = ("glints:", "url:")
+
+
+def canonical_job_key(url: str) -> str:
+    """
+    Reduce a job posting URL to a stable deduplication key.
+
+    Args:
+        url: Job URL as reported by the browser
+
+    Returns:
+        "glints:<job uuid>" for Glints postings, otherwise "url:<host><path>"
+    """
+    url = url.strip()
+    if url.startswith(KEY_PREFIXES):
+        return url
+    parts = urlsplit(url)
+    host = parts.netloc.lower().removeprefix("www.")
+    if host == "glints.com" or host.endswith(".glints.com"):
+        match = GLINTS_JOB_ID_PATTERN.search(parts.path)
+        if match:
+            return f"glints:{match.group(1).lower()}"
+    path = parts.path.rstrip("/") or "/"
+    return f"url:{host}{path}"
@@ -0,0 +1,258 @@
+"""Set-based maintenance operations on job applications.
+
+Every operation runs as DELETE / INSERT ... SELECT statements on ids, never
+loads rows as ORM objects, and works in bounded batches that each commit on
+their own, so the write lock is only held for one batch at a time. Text rows
+(jobapplicationtext) follow their job application.
+"""
+
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, IO, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, literal
+from sqlmodel import Session, select
+
+from .crud import filter_statement
+from .models import ApplicationFilter, ApplicationStatus, JobApplication, JobApplicationArchive, JobApplicationText
+
+# Columns copied from jobapplication into jobapplicationarchive
+ARCHIVED_COLUMNS = [
+    "id", "link", "job_key", "status", "company_name", "role", "location",
+    "salary_min", "created_at", "updated_at",
+]
+# Columns copied from jobapplicationtext, still compressed
+ARCHIVED_TEXT_COLUMNS = ["description", "cv_summary"]
+
+
+def run_in_batches(
+    session: Session,
+    id_statement,
+    action: Callable[[List[int]], int],
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+    pause: float = 0.0,
+) -> int:
+    """
+    Apply an action to the ids selected by a statement, one committed batch at a time.
+
+    Args:
+        session: The database session
+        id_statement: Select of the ids to process; it is re-run for every batch
+        action: Called with a batch of ids, returns the number of rows affected
+        batch_size: Ids per batch (and per transaction)
+        max_batches: Stop after this many batches, None to run until done
+        pause: Seconds to sleep between batches so other writers get the lock
+
+    Returns:
+        Total number of rows affected
+    """
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(session.exec(id_statement.limit(batch_size)))
+        if not ids:
+            break
+        total += action(ids)
+        session.commit()
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def _application_ids(filters: Optional[ApplicationFilter]):
+    return filter_statement(select(JobApplication.id), filters).order_by(JobApplication.id)
+
+
+def _delete_applications(session: Session, ids: List[int]) -> int:
+    return session.execute(delete(JobApplication).where(JobApplication.id.in_(ids))).rowcount
+
+
+def _application_rows(ids: List[int], *extra_columns):
+    """Select job applications with their text columns (LEFT JOIN jobapplicationtext)."""
+    source = JobApplication.__table__
+    texts = JobApplicationText.__table__
+    return (
+        select(
+            *[source.c[name] for name in ARCHIVED_COLUMNS],
+            *[texts.c[name] for name in ARCHIVED_TEXT_COLUMNS],
+            *extra_columns,
+        )
+        .select_from(source.outerjoin(texts, texts.c.job_application_id == source.c.id))
+        .where(source.c.id.in_(ids))
+        .order_by(source.c.id)
+    )
+
+
+def _move_to_archive(session: Session, ids: List[int], archived_at: datetime) -> int:
+    rows = _application_rows(ids, literal(archived_at))
+    # The archive numbers its own rows; SQLite reuses the ids of deleted applications
+    columns = [
+        *["source_id" if name == "id" else name for name in ARCHIVED_COLUMNS],
+        *ARCHIVED_TEXT_COLUMNS,
+        "archived_at",
+    ]
+    session.execute(insert(JobApplicationArchive.__table__).from_select(columns, rows))
+    return _delete_applications(session, ids)
+
+
+def delete_job_applications(
+    session: Session,
+    filters: Optional[ApplicationFilter] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Delete the job applications matching filters, in batches.
+
+    Args:
+        session: The database session
+        filters: Rows to delete, None for all rows
+        batch_size: Rows deleted per transaction
+        max_batches: Stop after this many batches, None to delete everything
+
+    Returns:
+        Number of rows deleted
+    """
+    return run_in_batches(
+        session, _application_ids(filters), lambda ids: _delete_applications(session, ids), batch_size, max_batches
+    )
+
+
+def archive_job_applications(
+    session: Session,
+    filters: Optional[ApplicationFilter] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Move the job applications matching filters to the jobapplicationarchive table.
+
+    Each batch is copied with INSERT ... SELECT and deleted in the same
+    transaction, so a row is never lost or present in both tables.
+
+    Args:
+        session: The database session
+        filters: Rows to archive, None for all rows
+        batch_size: Rows moved per transaction
+        max_batches: Stop after this many batches, None to archive everything
+
+    Returns:
+        Number of rows archived
+    """
+    return run_in_batches(
+        session,
+        _application_ids(filters),
+        lambda ids: _move_to_archive(session, ids, datetime.utcnow()),
+        batch_size,
+        max_batches,
+    )
+
+
+def open_archive_file(path: str) -> IO[str]:
+    """Open a JSON Lines archive file for appending; gzip-compressed if it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "at", encoding="utf-8")
+    return open(path, "a", encoding="utf-8")
+
+
+def archive_job_applications_to_file(
+    session: Session,
+    path: str,
+    filters: Optional[ApplicationFilter] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Append the job applications matching filters to a JSON Lines file and delete them.
+
+    A batch is written and flushed to the file before its rows are deleted,
+    so an interrupted run can at worst leave a row in both places.
+
+    Args:
+        session: The database session
+        path: Target file (.jsonl, or .jsonl.gz for gzip)
+        filters: Rows to archive, None for all rows
+        batch_size: Rows moved per transaction
+        max_batches: Stop after this many batches, None to archive everything
+
+    Returns:
+        Number of rows archived
+    """
+    with open_archive_file(path) as archive_file:
+        def move(ids: List[int]) -> int:
+            rows = session.execute(_application_rows(ids)).mappings()
+            for row in rows:
+                archive_file.write(json.dumps(dict(row), default=str, ensure_ascii=False) + "\n")
+            archive_file.flush()
+            return _delete_applications(session, ids)
+
+        return run_in_batches(session, _application_ids(filters), move, batch_size, max_batches)
+
+
+def apply_retention(
+    session: Session,
+    archive_after_days: Optional[int] = None,
+    purge_archive_after_days: Optional[int] = None,
+    statuses: Optional[Sequence[ApplicationStatus]] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+    pause: float = 0.0,
+) -> Dict[str, int]:
+    """
+    Run the retention policy incrementally.
+
+    Job applications older than archive_after_days (optionally only those
+    with one of statuses) are moved to the archive table, and archive rows
+    older than purge_archive_after_days are deleted. With max_batches set a
+    run does a bounded amount of work, so it can be scheduled often.
+
+    Args:
+        session: The database session
+        archive_after_days: Archive applications created longer ago than this, None to skip
+        purge_archive_after_days: Delete archive rows archived longer ago than this, None to skip
+        statuses: Only archive applications with these statuses, None for all
+        batch_size: Rows per transaction
+        max_batches: Maximum batches per step, None to run until done
+        pause: Seconds to sleep between batches
+
+    Returns:
+        Rows affected per step: {"archived": ..., "purged": ...}
+    """
+    now = datetime.utcnow()
+    result = {"archived": 0, "purged": 0}
+
+    if archive_after_days is not None:
+        filters = ApplicationFilter(
+            status=list(statuses) if statuses else None,
+            created_before=now - timedelta(days=archive_after_days),
+        )
+        result["archived"] = run_in_batches(
+            session,
+            _application_ids(filters),
+            lambda ids: _move_to_archive(session, ids, now),
+            batch_size,
+            max_batches,
+            pause,
+        )
+
+    if purge_archive_after_days is not None:
+        cutoff = now - timedelta(days=purge_archive_after_days)
+        archive_ids = (
+            select(JobApplicationArchive.id)
+            .where(JobApplicationArchive.archived_at < cutoff)
+            .order_by(JobApplicationArchive.id)
+        )
+        result["purged"] = run_in_batches(
+            session,
+            archive_ids,
+            lambda ids: session.execute(delete(JobApplicationArchive).where(JobApplicationArchive.id.in_(ids))).rowcount,
+            batch_size,
+            max_batches,
+            pause,
+        )
+    return result
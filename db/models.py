@@ -1,8 +1,11 @@
-from typing import Optional, Literal
+from typing import Any, List, Optional, Literal
 from datetime import datetime
-from sqlmodel import Field, SQLModel
+from sqlalchemy import Index
+from sqlmodel import Field, Relationship, SQLModel
 from enum import Enum
 
+from .compression import CompressedText
+
 
 class ApplicationStatus(str, Enum):
     APPLY = "Apply"
@@ -12,14 +15,154 @@ class ApplicationStatus(str, Enum):
 
 
 class JobApplication(SQLModel, table=True):
+    """A job applied to.
+
+    description and cv_summary live compressed in JobApplicationText and are
+    loaded lazily on first access, so listing queries never read them. An
+    AsyncSession cannot lazy-load, so the async CRUD functions that return a
+    single job load them with the row (selectinload); the async listings only
+    do with with_text=True. They can still be passed to the constructor.
+    """
     id: Optional[int] = Field(default=None, primary_key=True)
     link: str = Field(unique=True)
-    status: ApplicationStatus = Field(default=ApplicationStatus.APPLY)
-    company_name: str
+    # Canonical form of link (see db.job_keys); every dedup check uses this
+    job_key: Optional[str] = Field(default=None, unique=True, index=True, nullable=False)
+    status: ApplicationStatus = Field(default=ApplicationStatus.APPLY, index=True)
+    company_name: str = Field(index=True)
     role : str
     location: str
     salary_min: Optional[int] = None
-    description: str
-    cv_summary: str
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    text: Optional["JobApplicationText"] = Relationship(
+        sa_relationship_kwargs={"uselist": False, "lazy": "select", "cascade": "all, delete-orphan"}
+    )
+
+    def __init__(self, **data: Any):
+        description = data.pop("description", None)
+        cv_summary = data.pop("cv_summary", None)
+        super().__init__(**data)
+        if description is not None or cv_summary is not None:
+            self.text = JobApplicationText(description=description or "", cv_summary=cv_summary or "")
+
+    @property
+    def description(self) -> Optional[str]:
+        return self.text.description if self.text is not None else None
+
+    @property
+    def cv_summary(self) -> Optional[str]:
+        return self.text.cv_summary if self.text is not None else None
+
+
+class JobApplicationText(SQLModel, table=True):
+    """Large text of a job application, stored compressed (see db.compression)."""
+    job_application_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="jobapplication.id", ondelete="CASCADE"
+    )
+    description: str = Field(sa_type=CompressedText)
+    cv_summary: str = Field(sa_type=CompressedText)
+
+
+class JobApplicationArchive(SQLModel, table=True):
+    """Job applications moved out of the main table by maintenance/retention.
+
+    Rows get their own id; source_id is the id the job application had, which
+    SQLite may give to a later application once this one is deleted. Neither
+    source_id nor job_key is unique.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source_id: Optional[int] = Field(default=None, index=True)
+    link: str
+    job_key: str = Field(index=True)
+    status: ApplicationStatus
+    company_name: str
+    role: str
+    location: str
+    salary_min: Optional[int] = None
+    description: Optional[str] = Field(default=None, sa_type=CompressedText)
+    cv_summary: Optional[str] = Field(default=None, sa_type=CompressedText)
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class JobRecordStage(str, Enum):
+    """How far a staged job got, in pipeline order; REJECTED ends it at classification."""
+    SCRAPED = "Scraped"
+    CLASSIFIED = "Classified"
+    RENDERED = "Rendered"
+    REJECTED = "Rejected"
+
+
+class JobRecord(SQLModel, table=True):
+    """A job collected by a scrape, classify or render run (see provider.glints.RunMode).
+
+    Every stage fills in more columns. A later run reuses them instead of
+    extracting, classifying or rendering again, so a full run only has to
+    open the job page and submit.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Canonical form of link (see db.job_keys)
+    job_key: str = Field(unique=True, index=True)
+    link: str
+    stage: JobRecordStage = Field(default=JobRecordStage.SCRAPED, index=True)
+    company_name: str
+    role: str
+    location: str
+    salary_min: Optional[int] = None
+    description: str = Field(sa_type=CompressedText)
+    # JobCategoryAi value of the classification and the LLM's reason
+    job_category: Optional[str] = None
+    category_reason: Optional[str] = None
+    cv_summary: Optional[str] = Field(default=None, sa_type=CompressedText)
+    cv_path: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class QueueStatus(str, Enum):
+    PENDING = "Pending"
+    CLAIMED = "Claimed"
+    DONE = "Done"
+    FAILED = "Failed"
+
+
+class QueuedJob(SQLModel, table=True):
+    """A job link in the shared work queue (see db.queue).
+
+    Discovery enqueues links and workers claim them; a claimed job belongs
+    to its worker until lease_expires_at, which the worker keeps renewing.
+    Every run mode has its own queue, so a job scraped by a scrape worker is
+    still pending for apply workers.
+    """
+    __table_args__ = (Index("ix_queuedjob_job_key_mode", "job_key", "mode", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Canonical form of link (see db.job_keys); a job is enqueued once per mode
+    job_key: str
+    # provider.glints.RunMode value of the workers that may claim the job
+    mode: str = "apply"
+    link: str
+    status: QueueStatus = Field(default=QueueStatus.PENDING, index=True)
+    # "host:pid" of the worker holding or last holding the job
+    worker: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    # Number of claims, including ones whose worker died
+    attempts: int = 0
+    # Trace outcome of the finished job ("ok", "skipped", an exception name, ...)
+    outcome: Optional[str] = None
+    enqueued_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ApplicationFilter(SQLModel):
+    """Filters for listing, streaming and counting job applications.
+
+    Unset fields do not filter; date bounds are inclusive-exclusive.
+    """
+    status: Optional[List[ApplicationStatus]] = None
+    created_from: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    company_name: Optional[str] = None
+    salary_min_at_least: Optional[int] = None
+    salary_min_at_most: Optional[int] = None
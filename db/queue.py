@@ -0,0 +1,199 @@
+"""Job queue shared by one discovery process and any number of workers.
+
+Discovery enqueues job links for a run mode. Each worker claims one job of
+its mode at a time under a lease, renews the lease while it works and marks
+the job done or failed. The modes are separate queues: a job done by a
+scrape worker is still pending for the apply workers.
+
+A claim is a single statement:
+
+    UPDATE queuedjob SET status = 'Claimed', worker = ..., lease_expires_at = ...
+    WHERE id = (SELECT id FROM queuedjob WHERE mode = ... AND <claimable>
+                ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED)
+    RETURNING ...
+
+On Postgres, concurrent workers skip rows another transaction has locked
+instead of waiting for them, so each worker gets a different job. SQLite
+does not support FOR UPDATE and leaves it out. There, writers are
+serialized and the statement is atomic on its own.
+
+A claimed job whose lease expired, because its worker died, can be claimed
+again, at most QUEUE_MAX_ATTEMPTS times in total. Leases are compared with
+the clocks of the worker hosts, so those clocks must be in sync (NTP).
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+
+from .job_keys import canonical_job_key
+from .models import QueuedJob, QueueStatus
+
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+load_dotenv()
+
+# Seconds a claim is valid without renewal; workers renew every third of it
+QUEUE_LEASE_S = float(os.getenv("QUEUE_LEASE_S", "600"))
+# Claims per job before a job whose workers keep dying is given up
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+# Mode of the queue when none is given (provider.glints.RunMode.APPLY)
+DEFAULT_QUEUE_MODE = "apply"
+
+
+def claimable(now: datetime, mode: str = DEFAULT_QUEUE_MODE):
+    """Condition of a job of the given mode that may be claimed at time now."""
+    return and_(
+        QueuedJob.mode == mode,
+        QueuedJob.attempts < QUEUE_MAX_ATTEMPTS,
+        or_(
+            QueuedJob.status == QueueStatus.PENDING,
+            and_(QueuedJob.status == QueueStatus.CLAIMED, QueuedJob.lease_expires_at < now),
+        ),
+    )
+
+
+async def enqueue_links_async(session: "AsyncSession", links: Iterable[str], mode: str = DEFAULT_QUEUE_MODE) -> int:
+    """
+    Add job links to a mode's queue; a job that was ever enqueued for it (under any of its URLs) is left as it is.
+
+    Args:
+        session: The async database session
+        links: Job links to enqueue
+        mode: Run mode of the workers that should process them
+
+    Returns:
+        Number of jobs added
+    """
+    now = datetime.utcnow()
+    rows: Dict[str, dict] = {}
+    for link in links:
+        job_key = canonical_job_key(link)
+        rows.setdefault(job_key, {
+            "job_key": job_key,
+            "mode": mode,
+            "link": link,
+            "status": QueueStatus.PENDING,
+            "attempts": 0,
+            "enqueued_at": now,
+            "updated_at": now,
+        })
+    if not rows:
+        return 0
+    insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(QueuedJob).values(list(rows.values())).on_conflict_do_nothing(index_elements=[QueuedJob.job_key, QueuedJob.mode])
+    added = (await session.execute(statement)).rowcount
+    await session.commit()
+    return added
+
+
+async def claim_job_async(
+    session: "AsyncSession", worker: str, lease_s: float = QUEUE_LEASE_S, mode: str = DEFAULT_QUEUE_MODE
+) -> Optional[QueuedJob]:
+    """
+    Claim the oldest claimable job of a mode for a worker.
+
+    Args:
+        session: The async database session
+        worker: Worker id stored with the claim
+        lease_s: Seconds until the claim expires unless renewed
+        mode: Run mode of the worker
+
+    Returns:
+        The claimed job, None if there is nothing to claim
+    """
+    now = datetime.utcnow()
+    next_job = (
+        select(QueuedJob.id)
+        .where(claimable(now, mode))
+        .order_by(QueuedJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    statement = (
+        update(QueuedJob)
+        # Repeating the condition keeps the claim correct without row locks (SQLite)
+        .where(QueuedJob.id == next_job, claimable(now, mode))
+        .values(
+            status=QueueStatus.CLAIMED,
+            worker=worker,
+            lease_expires_at=now + timedelta(seconds=lease_s),
+            attempts=QueuedJob.attempts + 1,
+            updated_at=now,
+        )
+        .returning(QueuedJob)
+        .execution_options(synchronize_session=False)
+    )
+    job = (await session.execute(statement)).scalars().first()
+    await session.commit()
+    return job
+
+
+async def renew_lease_async(session: "AsyncSession", job_id: int, worker: str, lease_s: float = QUEUE_LEASE_S) -> bool:
+    """Extend a worker's claim; False if the job is no longer claimed by that worker."""
+    now = datetime.utcnow()
+    statement = (
+        update(QueuedJob)
+        .where(QueuedJob.id == job_id, QueuedJob.worker == worker, QueuedJob.status == QueueStatus.CLAIMED)
+        .values(lease_expires_at=now + timedelta(seconds=lease_s), updated_at=now)
+    )
+    renewed = (await session.execute(statement)).rowcount == 1
+    await session.commit()
+    return renewed
+
+
+async def finish_job_async(session: "AsyncSession", job_id: int, worker: str, status: QueueStatus, outcome: Optional[str]) -> bool:
+    """
+    Mark a claimed job done or failed.
+
+    Args:
+        session: The async database session
+        job_id: The claimed job
+        worker: The worker that claimed it
+        status: DONE or FAILED
+        outcome: Trace outcome of the job
+
+    Returns:
+        False if the claim had been lost to another worker, in which case nothing is changed
+    """
+    statement = (
+        update(QueuedJob)
+        .where(QueuedJob.id == job_id, QueuedJob.worker == worker, QueuedJob.status == QueueStatus.CLAIMED)
+        .values(status=status, outcome=outcome, lease_expires_at=None, updated_at=datetime.utcnow())
+    )
+    finished = (await session.execute(statement)).rowcount == 1
+    await session.commit()
+    return finished
+
+
+async def fail_abandoned_jobs_async(session: "AsyncSession") -> int:
+    """Mark jobs failed whose last allowed claim expired; returns their number."""
+    now = datetime.utcnow()
+    statement = (
+        update(QueuedJob)
+        .where(
+            QueuedJob.status == QueueStatus.CLAIMED,
+            QueuedJob.lease_expires_at < now,
+            QueuedJob.attempts >= QUEUE_MAX_ATTEMPTS,
+        )
+        .values(status=QueueStatus.FAILED, outcome="lease_expired", lease_expires_at=None, updated_at=now)
+    )
+    failed = (await session.execute(statement)).rowcount
+    await session.commit()
+    return failed
+
+
+def count_queued_jobs_by_status(session: Session) -> Dict[str, Dict[QueueStatus, int]]:
+    """Number of queued jobs per mode and status."""
+    statement = select(QueuedJob.mode, QueuedJob.status, func.count()).group_by(QueuedJob.mode, QueuedJob.status)
+    counts: Dict[str, Dict[QueueStatus, int]] = {}
+    for mode, status, count in session.exec(statement):
+        counts.setdefault(mode, {})[status] = count
+    return counts
@@ -0,0 +1,284 @@
+"""Full-text search over job applications.
+
+The index covers role and company_name from jobapplication plus description
+and cv_summary from jobapplicationtext.
+
+SQLite uses an FTS5 table (jobapplication_fts) that keeps its own plain copy
+of the four columns, with the job application id as rowid. The text is
+stored compressed, so SQL alone cannot read it: the application adds a job
+to the index when it writes the text row (search_index_statements() and an
+listener for ORM flushes). Triggers without any application
+function remove and update index rows, so any SQLite client can still
+delete and edit job applications.
+
+Postgres keeps a weighted tsvector (search_vector) on jobapplicationtext with
+a GIN index, maintained by a trigger.
+
+Both are created by the Alembic migrations, or by create_search_index() for
+databases made with create_db_and_tables().
+
+Note: Alembic batch migrations recreate SQLite tables and drop their
+triggers; call create_search_index() again after one.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import Executable
+from sqlmodel import Session, SQLModel, select
+
+from .models import ApplicationStatus, JobApplication, JobApplicationText
+
+# Columns in the index, in FTS column order and Postgres weight order (A-D)
+SEARCH_FIELDS = ("role", "company_name", "description", "cv_summary")
+
+# Index row of one job application; takes the text_rows() values (plain text)
+SQLITE_FTS_INSERT = """
+    INSERT INTO jobapplication_fts(rowid, role, company_name, description, cv_summary)
+    SELECT id, role, company_name, :description, :cv_summary FROM jobapplication WHERE id = :job_application_id
+"""
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobapplication_fts USING fts5(
+        role, company_name, description, cv_summary,
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobapplication_fts_delete AFTER DELETE ON jobapplication BEGIN
+        DELETE FROM jobapplication_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobapplication_fts_text_delete AFTER DELETE ON jobapplicationtext BEGIN
+        DELETE FROM jobapplication_fts WHERE rowid = old.job_application_id;
+    END
+    """,
+    # Status updates do not touch the index
+    """
+    CREATE TRIGGER IF NOT EXISTS jobapplication_fts_update AFTER UPDATE OF role, company_name ON jobapplication BEGIN
+        UPDATE jobapplication_fts SET role = new.role, company_name = new.company_name WHERE rowid = new.id;
+    END
+    """,
+    # SQLite does not enforce ON DELETE CASCADE unless PRAGMA foreign_keys is on
+    """
+    CREATE TRIGGER IF NOT EXISTS jobapplication_text_cleanup AFTER DELETE ON jobapplication BEGIN
+        DELETE FROM jobapplicationtext WHERE job_application_id = old.id;
+    END
+    """,
+]
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE jobapplicationtext ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_jobapplicationtext_search_vector ON jobapplicationtext USING gin (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION jobapplicationtext_search_vector() RETURNS trigger AS $$
+    DECLARE
+        application jobapplication%ROWTYPE;
+    BEGIN
+        SELECT * INTO application FROM jobapplication WHERE id = NEW.job_application_id;
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(application.role, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(application.company_name, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(NEW.cv_summary, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobapplicationtext_search_vector ON jobapplicationtext",
+    """
+    CREATE TRIGGER jobapplicationtext_search_vector BEFORE INSERT OR UPDATE ON jobapplicationtext
+    FOR EACH ROW EXECUTE FUNCTION jobapplicationtext_search_vector()
+    """,
+    # Re-index the text row when the role or company changes
+    """
+    CREATE OR REPLACE FUNCTION jobapplication_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE jobapplicationtext SET search_vector = NULL WHERE job_application_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobapplication_search_vector ON jobapplication",
+    """
+    CREATE TRIGGER jobapplication_search_vector AFTER UPDATE OF role, company_name ON jobapplication
+    FOR EACH ROW EXECUTE FUNCTION jobapplication_search_vector()
+    """,
+]
+
+# tsvector weight of each field on Postgres
+POSTGRES_FIELD_WEIGHTS = dict(zip(SEARCH_FIELDS, "abcd"))
+
+
+class SearchHit(SQLModel):
+    """One ranked full-text search result."""
+    id: int
+    link: str
+    company_name: str
+    role: str
+    status: ApplicationStatus
+    created_at: datetime
+    rank: float
+    snippet: str
+
+
+def search_index_statements(dialect_name: str, rows: List[Dict[str, Any]]) -> List[Tuple[Executable, List[Dict[str, Any]]]]:
+    """
+    Statements that add job applications to the full-text index, for callers inserting text rows with Core.
+
+    Args:
+        dialect_name: Name of the database dialect; Postgres indexes by trigger and needs none
+        rows: The inserted text rows as built by crud.text_rows() (plain text)
+
+    Returns:
+        (statement, rows) pairs to execute after the text rows
+    """
+    if dialect_name == "postgresql" or not rows:
+        return []
+    return [(text(SQLITE_FTS_INSERT), rows)]
+
+
+@event.listens_for(JobApplicationText, "after_insert")
+@event.listens_for(JobApplicationText, "after_update")
+def _index_flushed_text(mapper, connection: Connection, target: JobApplicationText) -> None:
+    # Text rows written by an ORM flush (session.add of a JobApplication, or edited texts)
+    if connection.dialect.name != "postgresql":
+        connection.execute(text("DELETE FROM jobapplication_fts WHERE rowid = :id"), {"id": target.job_application_id})
+        connection.execute(text(SQLITE_FTS_INSERT), {
+            "job_application_id": target.job_application_id,
+            "description": target.description,
+            "cv_summary": target.cv_summary,
+        })
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the full-text index (and its triggers on SQLite) if it does not exist.
+
+    Args:
+        connection: Connection to the database holding the jobapplication table
+    """
+    ddl = POSTGRES_SEARCH_DDL if connection.dialect.name == "postgresql" else SQLITE_SEARCH_DDL
+    for statement in ddl:
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(session: Session, batch_size: int = 1000) -> None:
+    """Rebuild the SQLite FTS index from the stored job applications; Postgres keeps its column up to date by itself."""
+    if session.get_bind().dialect.name == "postgresql":
+        return
+    session.execute(text("DELETE FROM jobapplication_fts"))
+    # CompressedText decompresses the text while it is read
+    statement = (
+        select(JobApplicationText.job_application_id, JobApplicationText.description, JobApplicationText.cv_summary)
+        .execution_options(yield_per=batch_size)
+    )
+    batch = []
+    for job_application_id, description, cv_summary in session.exec(statement):
+        batch.append({"job_application_id": job_application_id, "description": description, "cv_summary": cv_summary})
+        if len(batch) == batch_size:
+            session.execute(text(SQLITE_FTS_INSERT), batch)
+            batch = []
+    if batch:
+        session.execute(text(SQLITE_FTS_INSERT), batch)
+    session.commit()
+
+
+def fts5_query(query: str) -> str:
+    """Quote every term so user input (c++, node.js, ...) is never parsed as FTS5 syntax."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search_job_applications(
+    session: Session,
+    query: str,
+    field: Optional[str] = None,
+    company_name: Optional[str] = None,
+    limit: int = 20,
+) -> List[SearchHit]:
+    """
+    Ranked full-text search over job applications.
+
+    Args:
+        session: The database session
+        query: Words to search for; all of them must match
+        field: Restrict the match to one of SEARCH_FIELDS, None for all
+        company_name: Only applications of this company
+        limit: Maximum number of hits
+
+    Returns:
+        Hits ordered from most to least relevant
+
+    Raises:
+        ValueError: If the field is not valid
+    """
+    if field is not None and field not in SEARCH_FIELDS:
+        valid_fields = ', '.join(SEARCH_FIELDS)
+        raise ValueError(f"Invalid search field: {field}. Valid fields are: {valid_fields}")
+    if not query.strip():
+        return []
+
+    if session.get_bind().dialect.name == "postgresql":
+        return _search_postgres(session, query, field, company_name, limit)
+    return _search_sqlite(session, query, field, company_name, limit)
+
+
+def _hits(session: Session, statement: str, parameters: Dict[str, Any]) -> List[SearchHit]:
+    # Typed result columns so status and created_at are converted like ORM values
+    table = JobApplication.__table__
+    typed = text(statement).columns(status=table.c.status.type, created_at=table.c.created_at.type)
+    rows = session.execute(typed, parameters).mappings()
+    return [SearchHit.model_validate(dict(row)) for row in rows]
+
+
+def _search_postgres(session: Session, query: str, field: Optional[str], company_name: Optional[str], limit: int) -> List[SearchHit]:
+    match = "t.search_vector @@ websearch_to_tsquery('simple', :query)"
+    if field is not None:
+        match += f" AND ts_filter(t.search_vector, '{{{POSTGRES_FIELD_WEIGHTS[field]}}}') @@ websearch_to_tsquery('simple', :query)"
+    # Rank in a subquery so ts_headline only runs for the returned rows
+    statement = f"""
+        SELECT hits.id, hits.link, hits.company_name, hits.role, hits.status, hits.created_at, hits.rank,
+               ts_headline('simple', hits.{field or 'description'}, websearch_to_tsquery('simple', :query),
+                           'StartSel=[, StopSel=], MaxFragments=1, MaxWords=16') AS snippet
+        FROM (
+            SELECT j.id, j.link, j.company_name, j.role, j.status, j.created_at, t.description, t.cv_summary,
+                   ts_rank(t.search_vector, websearch_to_tsquery('simple', :query)) AS rank
+            FROM jobapplicationtext t
+            JOIN jobapplication j ON j.id = t.job_application_id
+            WHERE {match} AND (CAST(:company_name AS text) IS NULL OR j.company_name = :company_name)
+            ORDER BY rank DESC
+            LIMIT :limit
+        ) hits
+        ORDER BY hits.rank DESC
+    """
+    return _hits(session, statement, {"query": query, "company_name": company_name, "limit": limit})
+
+
+def _search_sqlite(session: Session, query: str, field: Optional[str], company_name: Optional[str], limit: int) -> List[SearchHit]:
+    match_query = fts5_query(query) if field is None else f"{field} : ({fts5_query(query)})"
+    # bm25() is lower for better matches; role and company weigh more than the long texts
+    company_join = "JOIN jobapplication j ON j.id = jobapplication_fts.rowid AND j.company_name = :company_name" if company_name else ""
+    ranked = session.execute(text(f"""
+        SELECT jobapplication_fts.rowid, -bm25(jobapplication_fts, 4.0, 2.0, 1.0, 1.0) AS rank
+        FROM jobapplication_fts {company_join}
+        WHERE jobapplication_fts MATCH :query
+        ORDER BY rank DESC
+        LIMIT :limit
+    """), {"query": match_query, "company_name": company_name, "limit": limit}).all()
+
+    # Snippets only for the top hits, one rowid lookup each
+    snippet_column = SEARCH_FIELDS.index(field) if field is not None else -1
+    hits = []
+    for rowid, rank in ranked:
+        hits.extend(_hits(session, f"""
+            SELECT j.id, j.link, j.company_name, j.role, j.status, j.created_at, :rank AS rank,
+                   snippet(jobapplication_fts, {snippet_column}, '[', ']', '...', 16) AS snippet
+            FROM jobapplication_fts
+            JOIN jobapplication j ON j.id = jobapplication_fts.rowid
+            WHERE jobapplication_fts MATCH :query AND jobapplication_fts.rowid = :rowid
+        """, {"query": match_query, "rowid": rowid, "rank": rank}))
+    return hits
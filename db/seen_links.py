@@ -0,0 +1,135 @@
+"""In-memory index of job links that are already stored.
+
+The index is a scalable Bloom filter of canonical job keys (see db.job_keys),
+filled from the job_key of the main and archive tables with streaming
+queries at startup and updated on every insert; links are canonicalized on the way in. A negative answer is
+definitive, so SQL is only consulted when the filter reports a possible
+match. Memory stays around 1.2 bytes per link at a 1% false-positive rate.
+"""
+
+import hashlib
+import math
+import threading
+from typing import TYPE_CHECKING, Iterable, List
+
+from sqlmodel import Session, select
+
+from .job_keys import canonical_job_key
+from .models import JobApplication, JobApplicationArchive
+
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Double hashing: k positions from two 64-bit hashes
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SeenLinkIndex:
+    """Process-wide membership index of stored job links.
+
+    Grows by adding a new, larger Bloom filter whenever the current one is
+    full, so the false-positive rate stays bounded as history grows.
+    """
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.01):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self._filters: List[BloomFilter] = [BloomFilter(initial_capacity, error_rate)]
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self._filters)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self._filters)
+
+    def add(self, link: str) -> None:
+        """Record a stored link (or job key)."""
+        key = canonical_job_key(link)
+        with self._lock:
+            current = self._filters[-1]
+            if current.count >= current.capacity:
+                current = BloomFilter(current.capacity * 2, self.error_rate)
+                self._filters.append(current)
+            current.add(key)
+
+    def add_many(self, links: Iterable[str]) -> None:
+        for link in links:
+            self.add(link)
+
+    def might_contain(self, link: str) -> bool:
+        """False means the link is definitely not stored; True must be confirmed in SQL.
+
+        Before the index is loaded every link is reported as a possible match.
+        """
+        if not self.loaded:
+            return True
+        key = canonical_job_key(link)
+        return any(key in bloom for bloom in self._filters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._filters = [BloomFilter(self.initial_capacity, self.error_rate)]
+            self.loaded = False
+
+    def load(self, session: Session, batch_size: int = 10_000) -> int:
+        """Fill the index from the database with streaming queries.
+
+        Returns:
+            Number of links loaded
+        """
+        self.reset()
+        loaded = 0
+        for model in (JobApplication, JobApplicationArchive):
+            statement = select(model.job_key).execution_options(yield_per=batch_size)
+            for key in session.exec(statement):
+                self.add(key)
+                loaded += 1
+        self.loaded = True
+        return loaded
+
+    async def load_async(self, session: "AsyncSession", batch_size: int = 10_000) -> int:
+        """Async variant of load() using a server-side stream.
+
+        Returns:
+            Number of links loaded
+        """
+        self.reset()
+        loaded = 0
+        for model in (JobApplication, JobApplicationArchive):
+            statement = select(model.job_key).execution_options(yield_per=batch_size)
+            result = await session.stream_scalars(statement)
+            async for key in result:
+                self.add(key)
+                loaded += 1
+        self.loaded = True
+        return loaded
+
+
+# Shared by every coroutine and thread in the process
+seen_links = SeenLinkIndex()
@@ -0,0 +1,81 @@
+"""Job records staged by scrape, classify and render runs.
+
+A record is keyed by the canonical job key, so every URL of a posting
+updates the same row. Saving a record upserts it, so a later stage
+overwrites the columns of an earlier one in a single statement.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+from sqlmodel import Session, func, select
+
+from .job_keys import canonical_job_key
+from .models import JobApplication, JobRecord, JobRecordStage
+
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+# A record at one of these stages has everything the earlier stages produce
+STAGE_ORDER = {
+    JobRecordStage.SCRAPED: 0,
+    JobRecordStage.CLASSIFIED: 1,
+    JobRecordStage.REJECTED: 1,
+    JobRecordStage.RENDERED: 2,
+}
+
+
+def reached(record: Optional[JobRecord], stage: JobRecordStage) -> bool:
+    """Whether a record went at least as far as stage; a rejected record counts as done for every stage."""
+    if record is None:
+        return False
+    return record.stage == JobRecordStage.REJECTED or STAGE_ORDER[record.stage] >= STAGE_ORDER[stage]
+
+
+def upsert_statement(dialect_name: str, record: JobRecord) -> Insert:
+    """
+    Build one INSERT ... ON CONFLICT (job_key) DO UPDATE statement for a record.
+
+    Args:
+        dialect_name: Name of the database dialect ("sqlite" or "postgresql")
+        record: The record to store; job_key is filled in from link if missing
+
+    Returns:
+        The insert statement
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    record.job_key = record.job_key or canonical_job_key(record.link)
+    record.updated_at = datetime.utcnow()
+    values = record.model_dump(exclude={"id"})
+    statement = insert(JobRecord).values(**values)
+    updated = {name: statement.excluded[name] for name in values if name not in ("job_key", "created_at")}
+    return statement.on_conflict_do_update(index_elements=[JobRecord.job_key], set_=updated)
+
+
+async def save_job_record_async(session: "AsyncSession", record: JobRecord) -> None:
+    """Insert or update a staged job record."""
+    await session.execute(upsert_statement(session.get_bind().dialect.name, record))
+    await session.commit()
+
+
+async def get_job_record_async(session: "AsyncSession", link: str) -> Optional[JobRecord]:
+    """The staged record of the link's job (any URL of it), None if it was never staged."""
+    statement = select(JobRecord).where(JobRecord.job_key == canonical_job_key(link))
+    return (await session.execute(statement)).scalars().first()
+
+
+async def staged_cv_paths_async(session: "AsyncSession") -> Set[str]:
+    """Paths of the CVs rendered for staged jobs that were not applied to yet."""
+    statement = select(JobRecord.cv_path).where(
+        JobRecord.cv_path.is_not(None),
+        JobRecord.job_key.not_in(select(JobApplication.job_key)),
+    )
+    return set((await session.execute(statement)).scalars())
+
+
+def count_job_records_by_stage(session: Session) -> Dict[JobRecordStage, int]:
+    """Number of staged records per stage."""
+    statement = select(JobRecord.stage, func.count()).group_by(JobRecord.stage)
+    return {stage: count for stage, count in session.exec(statement)}
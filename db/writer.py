@@ -0,0 +1,504 @@
+"""Write-behind batching for job application records.
+
+Workers hand JobApplication inserts and status updates to an
+ApplicationWriter instead of committing them one by one. The writer buffers
+them and flushes in one transaction when the batch is full or the flush
+interval has passed, and performs a final durable flush on shutdown or
+SIGTERM.
+
+A failed flush keeps the records buffered and is retried with backoff. A
+batch that keeps failing is written record by record: a record the database
+rejects while the rest of the batch is written is dropped, so it cannot hold
+up the others. Records still buffered when the final flush fails are spooled
+to WRITER_SPOOL_DIR and written by the next writer that starts.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import signal
+import statistics
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from .crud import assign_job_key, text_statements
+from .database import async_session_factory
+from .job_keys import canonical_job_key
+from .models import ApplicationStatus, JobApplication
+from .seen_links import seen_links
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Failed flushes in a row before the batch is written record by record to find the records the database rejects
+WRITER_MAX_FLUSH_ATTEMPTS = int(os.getenv("WRITER_MAX_FLUSH_ATTEMPTS", "3"))
+# Longest wait between the retries of a failing flush
+WRITER_MAX_BACKOFF_S = float(os.getenv("WRITER_MAX_BACKOFF_S", "60"))
+# Records the final flush could not write, one file per writer; state/ is git-ignored
+WRITER_SPOOL_DIR = os.getenv("WRITER_SPOOL_DIR", os.path.join("state", "writer_spool"))
+
+# Errors of the database or the connection rather than of a record (locked database, full disk, restart)
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
+
+def spool_records(inserts: Dict[str, JobApplication], status_updates: Dict[str, ApplicationStatus], directory: str = WRITER_SPOOL_DIR) -> str:
+    """Save buffered records to a new JSON Lines file in directory.
+
+    Returns:
+        Path of the spool file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.jsonl")
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as spool_file:
+        for job_application in inserts.values():
+            record = job_application.model_dump(mode="json", exclude={"id"})
+            record.update(description=job_application.description, cv_summary=job_application.cv_summary)
+            spool_file.write(json.dumps({"insert": record}, ensure_ascii=False) + "\n")
+        for job_key, status in status_updates.items():
+            spool_file.write(json.dumps({"status": {"job_key": job_key, "status": status.value}}) + "\n")
+    os.replace(temporary_path, path)
+    return path
+
+
+def claim_spooled_records(directory: str = WRITER_SPOOL_DIR) -> Tuple[Dict[str, JobApplication], Dict[str, ApplicationStatus], List[str]]:
+    """Load the records spooled by earlier writers.
+
+    Every file is renamed before it is read, so a file is claimed by one
+    writer only. The claimed files are returned so they can be removed once
+    their records are written.
+
+    Returns:
+        Tuple of the inserts and status updates by job key, and the claimed files
+    """
+    inserts: Dict[str, JobApplication] = {}
+    status_updates: Dict[str, ApplicationStatus] = {}
+    claimed: List[str] = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+        claimed_path = f"{path}.{os.getpid()}"
+        try:
+            os.replace(path, claimed_path)
+        except FileNotFoundError:
+            # Claimed by another writer
+            continue
+        claimed.append(claimed_path)
+        with open(claimed_path, "r", encoding="utf-8") as spool_file:
+            for line in spool_file:
+                entry = json.loads(line)
+                if "insert" in entry:
+                    record = entry["insert"]
+                    record["status"] = ApplicationStatus(record["status"])
+                    record["created_at"] = datetime.fromisoformat(record["created_at"])
+                    record["updated_at"] = datetime.fromisoformat(record["updated_at"])
+                    inserts[record["job_key"]] = JobApplication(**record)
+                else:
+                    status_updates[entry["status"]["job_key"]] = ApplicationStatus(entry["status"]["status"])
+    return inserts, status_updates, claimed
+
+
+class WriterMetrics:
+    """Flush latency and batch-size metrics of an ApplicationWriter."""
+
+    def __init__(self, window: int = 1000):
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.rows_inserted = 0
+        self.duplicates = 0
+        self.status_updates = 0
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.flush_latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, batch_size: int, latency: float) -> None:
+        self.flushes += 1
+        self.batch_sizes.append(batch_size)
+        self.flush_latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the metrics as a plain dictionary."""
+        latencies = sorted(self.flush_latencies)
+        return {
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "dropped": self.dropped,
+            "rows_inserted": self.rows_inserted,
+            "duplicates": self.duplicates,
+            "status_updates": self.status_updates,
+            "batch_size_mean": round(statistics.fmean(self.batch_sizes), 2) if self.batch_sizes else 0,
+            "batch_size_max": max(self.batch_sizes, default=0),
+            "flush_latency_mean_s": round(statistics.fmean(latencies), 6) if latencies else 0,
+            "flush_latency_p95_s": round(latencies[int(0.95 * (len(latencies) - 1))], 6) if latencies else 0,
+            "flush_latency_max_s": round(latencies[-1], 6) if latencies else 0,
+        }
+
+
+class ApplicationWriter:
+    """Buffered writer for JobApplication inserts and status updates.
+
+    Use it as an async context manager so the background flusher is started
+    and the buffer is flushed durably on exit:
+
+        async with ApplicationWriter() as writer:
+            await writer.add(job_application)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = async_session_factory,
+        max_batch_size: int = 50,
+        flush_interval: float = 2.0,
+        max_flush_attempts: int = WRITER_MAX_FLUSH_ATTEMPTS,
+        max_backoff: float = WRITER_MAX_BACKOFF_S,
+        spool_dir: str = WRITER_SPOOL_DIR,
+    ):
+        """Initialize the writer.
+
+        Args:
+            session_factory: Factory returning async sessions
+            max_batch_size: Pending records that trigger an immediate flush
+            flush_interval: Maximum seconds a record waits in the buffer
+            max_flush_attempts: Failed flushes in a row before the batch is
+                written record by record to find the records the database rejects
+            max_backoff: Longest wait in seconds between retries of a failing flush
+            spool_dir: Directory for the records the final flush could not write
+        """
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_flush_attempts = max(1, max_flush_attempts)
+        self.max_backoff = max_backoff
+        self.spool_dir = spool_dir
+        self._failed_attempts = 0
+        self._durable_requested = False
+        # Spool files whose records are in the buffer; removed after the next successful flush
+        self._claimed_spools: List[str] = []
+        self.metrics = WriterMetrics()
+        # Keyed by canonical job key, so a job queued twice (under any URL) is written once
+        self._inserts: Dict[str, JobApplication] = {}
+        self._status_updates: Dict[str, ApplicationStatus] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._listeners: List[Callable[[List[str]], None]] = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._inserts) + len(self._status_updates)
+
+    def is_pending(self, link: str) -> bool:
+        """True if an insert for this link's job is waiting in the buffer."""
+        return canonical_job_key(link) in self._inserts
+
+    def add_insert_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Call listener with the links of newly inserted rows after every flush."""
+        self._listeners.append(listener)
+
+    async def add(self, job_application: JobApplication) -> bool:
+        """Queue a job application insert.
+
+        Returns:
+            False if an insert for the same job is already pending
+        """
+        if self._closed:
+            raise RuntimeError("ApplicationWriter is closed")
+        job_key = assign_job_key(job_application)
+        if job_key in self._inserts:
+            return False
+        self._inserts[job_key] = job_application
+        self._maybe_wake()
+        return True
+
+    async def update_status(self, link: str, status: ApplicationStatus) -> None:
+        """Queue a status update for the application with this link."""
+        if self._closed:
+            raise RuntimeError("ApplicationWriter is closed")
+        job_key = canonical_job_key(link)
+        pending_insert = self._inserts.get(job_key)
+        if pending_insert is not None:
+            # Not written yet: fold the update into the insert
+            pending_insert.status = status
+            return
+        self._status_updates[job_key] = status
+        self._maybe_wake()
+
+    def _maybe_wake(self) -> None:
+        # A failing flush is retried on its backoff, not on every new record
+        if self.pending >= self.max_batch_size and not self._failed_attempts:
+            self._wake.set()
+
+    def request_durable_flush(self) -> None:
+        """Make the background flusher run a durable flush now."""
+        self._durable_requested = True
+        self._wake.set()
+
+    def _flush_delay(self) -> float:
+        """Seconds until the next flush: the interval, doubled per failed flush up to max_backoff."""
+        if not self._failed_attempts:
+            return self.flush_interval
+        return min(self.flush_interval * 2 ** self._failed_attempts, self.max_backoff)
+
+    async def start(self) -> None:
+        """Load the records spooled by earlier writers and start the background flusher."""
+        if self._task is None:
+            inserts, status_updates, self._claimed_spools = claim_spooled_records(self.spool_dir)
+            if self._claimed_spools:
+                logger.info(
+                    "Memuat %d record dari spool %s yang belum tersimpan",
+                    len(inserts) + len(status_updates),
+                    self.spool_dir,
+                )
+                for job_key, job_application in inserts.items():
+                    self._inserts.setdefault(job_key, job_application)
+                for job_key, status in status_updates.items():
+                    self._status_updates.setdefault(job_key, status)
+                self._wake.set()
+            self._task = asyncio.create_task(self._run(), name="application-writer")
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._flush_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            durable, self._durable_requested = self._durable_requested, False
+            if self.pending or durable:
+                try:
+                    await self.flush(durable=durable)
+                except Exception as e:
+                    # Records stay buffered and are retried after the backoff
+                    logger.warning("Gagal flush batch ke database, dicoba lagi dalam %.1f detik: %s", self._flush_delay(), e)
+
+    async def flush(self, durable: bool = False) -> int:
+        """Write every buffered record in one transaction.
+
+        A failed batch is put back for the next flush. Once max_flush_attempts
+        flushes in a row have failed, the batch is written one record per
+        transaction instead. A record that fails on its own while others are
+        written is logged and dropped, unless its error is a database or
+        connection error; when nothing can be written, the whole batch stays
+        buffered.
+
+        Args:
+            durable: Also checkpoint the SQLite WAL so the data is on disk
+
+        Returns:
+            Number of records flushed
+
+        Raises:
+            Exception: The error of a failed batch, which stays buffered
+        """
+        async with self._flush_lock:
+            inserts, self._inserts = self._inserts, {}
+            status_updates, self._status_updates = self._status_updates, {}
+            batch_size = len(inserts) + len(status_updates)
+            if not batch_size and not durable:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                inserted_links = await self._write(inserts, status_updates, durable)
+            except Exception as e:
+                self.metrics.failed_flushes += 1
+                self._failed_attempts += 1
+                if self._failed_attempts < self.max_flush_attempts or batch_size < 2:
+                    self._requeue(inserts, status_updates)
+                    raise
+                logger.warning(
+                    "Flush gagal %d kali berturut-turut, menulis %d record satu per satu: %s",
+                    self._failed_attempts,
+                    batch_size,
+                    e,
+                )
+                inserted_links, insert_errors, update_errors = await self._write_each(inserts, status_updates, durable)
+                if len(insert_errors) + len(update_errors) == batch_size:
+                    # Nothing could be written: the database is the problem, not a record
+                    self._requeue(inserts, status_updates)
+                    raise
+                self._drop_rejected(inserts, status_updates, insert_errors, update_errors)
+                batch_size = len(inserts) + len(status_updates)
+            self._failed_attempts = 0
+            if batch_size:
+                self.metrics.record(batch_size, time.perf_counter() - started)
+            self.metrics.rows_inserted += len(inserted_links)
+            self.metrics.duplicates += len(inserts) - len(inserted_links)
+            self.metrics.status_updates += len(status_updates)
+            # Duplicates are stored too, so every flushed link is now "seen"
+            seen_links.add_many(inserts)
+            self._remove_claimed_spools()
+
+        for listener in self._listeners:
+            listener(inserted_links)
+        return batch_size
+
+    def _requeue(self, inserts: Dict[str, JobApplication], status_updates: Dict[str, ApplicationStatus]) -> None:
+        """Put records back into the buffer without overwriting newer ones."""
+        self._inserts = {**inserts, **self._inserts}
+        self._status_updates = {**status_updates, **self._status_updates}
+
+    def _drop_rejected(
+        self,
+        inserts: Dict[str, JobApplication],
+        status_updates: Dict[str, ApplicationStatus],
+        insert_errors: Dict[str, Exception],
+        update_errors: Dict[str, Exception],
+    ) -> None:
+        """Remove the records that were not written from the batch.
+
+        Records that failed with a database or connection error go back into
+        the buffer; the others were rejected by the database and are dropped.
+        """
+        retry_inserts: Dict[str, JobApplication] = {}
+        retry_updates: Dict[str, ApplicationStatus] = {}
+        for job_key, error in insert_errors.items():
+            job_application = inserts.pop(job_key)
+            if isinstance(error, TRANSIENT_ERRORS):
+                retry_inserts[job_key] = job_application
+                continue
+            logger.error("Record %s ditolak database dan dibuang: %s", job_application.link, error)
+            self.metrics.dropped += 1
+        for job_key, error in update_errors.items():
+            status = status_updates.pop(job_key)
+            if isinstance(error, TRANSIENT_ERRORS):
+                retry_updates[job_key] = status
+                continue
+            logger.error("Update status %s untuk %s ditolak database dan dibuang: %s", status.value, job_key, error)
+            self.metrics.dropped += 1
+        self._requeue(retry_inserts, retry_updates)
+
+    async def _write_each(
+        self,
+        inserts: Dict[str, JobApplication],
+        status_updates: Dict[str, ApplicationStatus],
+        durable: bool,
+    ) -> Tuple[List[str], Dict[str, Exception], Dict[str, Exception]]:
+        """Write each record in its own transaction.
+
+        Returns:
+            Tuple of the links of the inserted rows and the errors of the
+            failed inserts and status updates by job key
+        """
+        inserted_links: List[str] = []
+        insert_errors: Dict[str, Exception] = {}
+        update_errors: Dict[str, Exception] = {}
+        for job_key, job_application in inserts.items():
+            try:
+                inserted_links += await self._write({job_key: job_application}, {}, durable=False)
+            except Exception as e:
+                insert_errors[job_key] = e
+        for job_key, status in status_updates.items():
+            try:
+                await self._write({}, {job_key: status}, durable=False)
+            except Exception as e:
+                update_errors[job_key] = e
+        if durable and len(insert_errors) + len(update_errors) < len(inserts) + len(status_updates):
+            try:
+                await self._write({}, {}, durable=True)
+            except Exception as e:
+                logger.warning("Checkpoint WAL gagal setelah flush satu per satu: %s", e)
+        return inserted_links, insert_errors, update_errors
+
+    def _remove_claimed_spools(self) -> None:
+        for path in self._claimed_spools:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._claimed_spools = []
+
+    async def _write(self, inserts: Dict[str, JobApplication], status_updates: Dict[str, ApplicationStatus], durable: bool) -> List[str]:
+        async with self.session_factory() as session:
+            dialect_name = session.sync_session.get_bind().dialect.name
+            inserted_links: List[str] = []
+            if inserts:
+                dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+                statement = (
+                    dialect_insert(JobApplication)
+                    .values([job_application.model_dump(exclude={"id"}) for job_application in inserts.values()])
+                    .on_conflict_do_nothing()
+                    .returning(JobApplication.id, JobApplication.job_key)
+                )
+                inserted = []
+                for job_id, job_key in await session.execute(statement):
+                    inserts[job_key].id = job_id
+                    inserted.append(inserts[job_key])
+                inserted_links = [job_application.link for job_application in inserted]
+                for text_statement, rows in text_statements(dialect_name, inserted):
+                    await session.execute(text_statement, rows)
+            if status_updates:
+                table = JobApplication.__table__
+                statement = (
+                    update(table)
+                    .where(table.c.job_key == bindparam("b_job_key"))
+                    .values(status=bindparam("b_status"), updated_at=bindparam("b_updated_at"))
+                )
+                now = datetime.utcnow()
+                await session.execute(statement, [
+                    {"b_job_key": job_key, "b_status": status, "b_updated_at": now}
+                    for job_key, status in status_updates.items()
+                ])
+            await session.commit()
+            if durable and dialect_name == "sqlite":
+                await session.execute(text("PRAGMA wal_checkpoint(FULL)"))
+            return inserted_links
+
+    async def close(self) -> None:
+        """Stop the flusher and flush everything durably.
+
+        Records the final flush cannot write are spooled to spool_dir
+        instead of being lost; the next writer to start writes them.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+            self._task = None
+        try:
+            await self.flush(durable=True)
+        except Exception as e:
+            if not self.pending:
+                raise
+            inserts, self._inserts = self._inserts, {}
+            status_updates, self._status_updates = self._status_updates, {}
+            path = spool_records(inserts, status_updates, self.spool_dir)
+            # The new spool file holds the claimed records that are still buffered
+            self._remove_claimed_spools()
+            logger.error(
+                "Flush terakhir gagal, %d record disimpan ke %s dan ditulis oleh run berikutnya: %s",
+                len(inserts) + len(status_updates),
+                path,
+                e,
+            )
+
+    def install_signal_handlers(self) -> None:
+        """Flush on SIGUSR1; on SIGTERM cancel the running task so shutdown (and close) runs."""
+        loop = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+        try:
+            # The background flusher runs it, with the same retries as any flush
+            loop.add_signal_handler(signal.SIGUSR1, self.request_durable_flush)
+            if main_task is not None:
+                loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+        except (NotImplementedError, AttributeError):
+            # Signal handlers are not available on this platform (e.g. Windows)
+            pass
+
+    async def __aenter__(self) -> "ApplicationWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+        logger.info("ApplicationWriter metrics: %s", self.metrics.snapshot())
@@ -0,0 +1,290 @@
+"""Batch CV rendering driven by a JSONL file of vacancies.
+
+Each input line is a JSON object with ``role``, ``vacancy`` and ``salary``;
+the salary may be a number or text such as "6.000.000" or "Rp 5jt".
+Vacancies are classified and summarized with bounded concurrency, the PDFs
+are rendered in parallel worker processes and one result line per vacancy
+is written to the output JSONL (paths, timings and errors).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple, Union
+
+from .generate_summary import generate_summary
+from .pdf_generator import JobCategory, generate_cv_pdf_from_yaml, load_cv_data
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = os.path.join("generate_cv", "documents", "pdf", "batch")
+
+# First number of a salary text and its optional unit, e.g. "Rp 5,5 jt" or "IDR 6.000.000"
+SALARY_PATTERN = re.compile(r"(\d[\d.,]*)\s*(juta|jt|ribu|rb|k)?\b")
+SALARY_UNITS = {"juta": 1_000_000, "jt": 1_000_000, "ribu": 1_000, "rb": 1_000, "k": 1_000}
+
+
+def parse_salary(value: Union[int, float, str, None]) -> int:
+    """Parse a minimum salary written as a number or as text.
+
+    Args:
+        value: Salary such as 6000000, "6.000.000", "Rp 5jt" or "4,5 juta"
+
+    Returns:
+        Salary in rupiah, 0 when no salary is given
+
+    Raises:
+        ValueError: If the text contains no salary
+    """
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = SALARY_PATTERN.search(str(value).lower())
+    if not match:
+        raise ValueError(f"no salary in {value!r}")
+    number, unit = match.groups()
+    number = number.rstrip(".,")
+    if unit:
+        # "5,5 jt" and "5.5 jt" are decimals
+        return int(float(number.replace(",", ".")) * SALARY_UNITS[unit])
+    # Dots and commas are thousands separators ("6.000.000")
+    return int(number.replace(".", "").replace(",", ""))
+
+
+def read_vacancies(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Read vacancy records from a JSONL file.
+
+    Args:
+        file_path: Path to the JSONL file
+
+    A salary that cannot be parsed is logged with its line number and
+    replaced by 0, which means no salary filter.
+
+    Yields:
+        Dict with ``role``, ``vacancy`` and ``salary`` for every non-empty line
+
+    Raises:
+        ValueError: If a line is not valid JSON or misses a required key
+    """
+    with open(file_path, "r", encoding="utf-8") as jsonl_file:
+        for line_number, line in enumerate(jsonl_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+            missing = [key for key in ("role", "vacancy") if key not in record]
+            if missing:
+                raise ValueError(f"Missing keys {missing} on line {line_number}")
+            try:
+                salary = parse_salary(record.get("salary"))
+            except ValueError as e:
+                logger.warning("Gaji tidak valid di baris %d, memakai 0: %s", line_number, e)
+                salary = 0
+            yield {
+                "role": str(record["role"]),
+                "vacancy": str(record["vacancy"]),
+                "salary": salary,
+            }
+
+
+def render_cv(job_category: str, summary: str, output_path: str, style: str, page_size: str, profile: str) -> Tuple[str, int, float]:
+    """Render one CV in a worker process.
+
+    Args:
+        job_category: Value of the JobCategory to render
+        summary: Summary to place in the CV
+        output_path: Path where the PDF will be saved
+        style: Style name for the CV
+        page_size: Size of the page ('A4' or 'letter')
+        profile: Output profile ('default', 'compact' or 'compact-times')
+
+    Returns:
+        Tuple of the PDF path, its size in bytes and the render time in seconds
+    """
+    started = time.perf_counter()
+    output = generate_cv_pdf_from_yaml(
+        job_category=JobCategory(job_category),
+        style=style,
+        page_size=page_size,
+        output_path=output_path,
+        summary=summary,
+        profile=profile,
+    )
+    return output.pdf_path, output.size_bytes, time.perf_counter() - started
+
+
+async def classify_vacancy(role: str, vacancy: str, salary: int) -> Tuple[Optional[JobCategory], str]:
+    """Classify a vacancy into the CV category to render.
+
+    Returns:
+        Tuple of the JobCategory (None when the vacancy should be skipped) and the reason
+    """
+    # Imported lazily so reading/rendering does not require the LLM stack
+    from pydantic_ai_role import JobCategoryAi, generate_role
+
+    result_role = await generate_role(role=role, vacancy=vacancy, min_salary=salary)
+    if result_role.job_category == JobCategoryAi.NONE:
+        return None, result_role.reason
+    return JobCategory(result_role.job_category.value), result_role.reason
+
+
+async def process_vacancy(
+    index: int,
+    record: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    executor: Executor,
+    output_dir: str,
+    style: str,
+    page_size: str,
+    profile: str,
+) -> Dict[str, Any]:
+    """Classify, summarize and render a single vacancy.
+
+    Errors are captured in the returned result instead of being raised, so one
+    bad vacancy does not stop the batch.
+    """
+    result: Dict[str, Any] = {
+        "index": index,
+        "role": record["role"],
+        "salary": record["salary"],
+        "category": None,
+        "reason": None,
+        "summary": None,
+        "pdf_path": None,
+        "size_bytes": None,
+        "timings": {},
+        "error": None,
+    }
+    timings = result["timings"]
+    started = time.perf_counter()
+    try:
+        # Only the LLM calls are bounded; rendering is bounded by the executor
+        async with semaphore:
+            step = time.perf_counter()
+            category, reason = await classify_vacancy(record["role"], record["vacancy"], record["salary"])
+            timings["classify_s"] = round(time.perf_counter() - step, 4)
+            result["reason"] = reason
+            if category is None:
+                result["error"] = f"skipped: {reason}"
+                return result
+            result["category"] = category.value
+
+            step = time.perf_counter()
+            cv_data = await asyncio.to_thread(load_cv_data, category)
+            summary = await asyncio.to_thread(generate_summary, cv_data, record["vacancy"])
+            timings["summarize_s"] = round(time.perf_counter() - step, 4)
+            result["summary"] = summary
+
+        output_path = os.path.join(output_dir, f"{index:05d}_{category.value}.pdf")
+        step = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pdf_path, size_bytes, render_s = await loop.run_in_executor(
+            executor, render_cv, category.value, summary, output_path, style, page_size, profile
+        )
+        timings["render_s"] = round(render_s, 4)
+        timings["render_wait_s"] = round(time.perf_counter() - step, 4)
+        result["pdf_path"] = pdf_path
+        result["size_bytes"] = size_bytes
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        timings["total_s"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+async def render_batch(
+    input_path: str,
+    results_file: TextIO,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    concurrency: int = 4,
+    workers: Optional[int] = None,
+    style: str = "classic",
+    page_size: str = "A4",
+    profile: str = "compact",
+) -> Dict[str, Any]:
+    """Render CVs for every vacancy in a JSONL file.
+
+    Args:
+        input_path: JSONL file with ``{role, vacancy, salary}`` records
+        results_file: Open text file the result lines are written to
+        output_dir: Directory for the generated PDFs
+        concurrency: Maximum number of vacancies in the LLM stages at once
+        workers: Number of render processes (default: CPU count)
+        style: Style name for the CVs
+        page_size: Size of the page ('A4' or 'letter')
+        profile: Output profile ('default', 'compact' or 'compact-times')
+
+    Returns:
+        Dict with totals for the batch
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    totals = {"total": 0, "rendered": 0, "skipped": 0, "failed": 0, "bytes": 0}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = [
+            asyncio.create_task(process_vacancy(index, record, semaphore, executor, output_dir, style, page_size, profile))
+            for index, record in enumerate(read_vacancies(input_path))
+        ]
+        # Results are streamed in completion order; "index" maps them back to the input
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            results_file.flush()
+            totals["total"] += 1
+            if result["pdf_path"]:
+                totals["rendered"] += 1
+                totals["bytes"] += result["size_bytes"]
+            elif result["category"] is None and result["reason"] is not None:
+                totals["skipped"] += 1
+            else:
+                totals["failed"] += 1
+
+    totals["elapsed_s"] = round(time.perf_counter() - started, 4)
+    return totals
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render tailored CVs for a JSONL file of vacancies.")
+    parser.add_argument("input", help="JSONL file with {role, vacancy, salary} records")
+    parser.add_argument("-o", "--results", default="cv_batch_results.jsonl", help="Results JSONL file")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Directory for the generated PDFs")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Vacancies classified/summarized at once")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--style", default="classic", help="CV style")
+    parser.add_argument("--page-size", default="A4", help="Page size ('A4' or 'letter')")
+    parser.add_argument("--profile", default="compact", help="PDF output profile: 'default', 'compact' or 'compact-times' (also folds the fonts onto Times)")
+    args = parser.parse_args(argv)
+
+    with open(args.results, "w", encoding="utf-8") as results_file:
+        totals = asyncio.run(render_batch(
+            input_path=args.input,
+            results_file=results_file,
+            output_dir=args.output_dir,
+            concurrency=args.concurrency,
+            workers=args.workers,
+            style=args.style,
+            page_size=args.page_size,
+            profile=args.profile,
+        ))
+
+    print(
+        f"Processed {totals['total']} vacancies in {totals['elapsed_s']}s: "
+        f"{totals['rendered']} rendered ({totals['bytes']} bytes), {totals['skipped']} skipped, {totals['failed']} failed. "
+        f"Results written to {args.results}"
+    )
+
+
+if __name__ == "__main__":
+    main()
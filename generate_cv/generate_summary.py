@@ -2,8 +2,31 @@
 Generate a summary for a CV from a YAML file.
 """
 
+import logging
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from .models import CV
-from openai import OpenAI
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+# "openai" (default) or "stub" for a deterministic summary without network access (replay/benchmarks)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+
+
+@lru_cache(maxsize=None)
+def get_client() -> "OpenAI":
+    """OpenAI client, created on first use so rendering without a vacancy never imports openai."""
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url="http://localhost:4000",  # Your proxy URL
+        api_key="sk-1234"             # Your proxy API key
+    )
 
 def generate_summary(cv:CV,vacancy: str) -> str:
     """
@@ -16,10 +39,12 @@ def generate_summary(cv:CV,vacancy: str) -> str:
     Returns:
         A string summary of the CV
     """
-    openai = OpenAI(
-        base_url="http://localhost:4000",  # Your proxy URL
-        api_key="sk-1234"             # Your proxy API key
-    )
+    if LLM_BACKEND == "stub":
+        from replay.llm_stub import stub_summary
+
+        return stub_summary(cv, vacancy)
+
+    openai = get_client()
     prompt = f"""
     Generate a summary for the following CV tailored to the job vacancy: 
     {vacancy}
@@ -46,5 +71,5 @@ def generate_summary(cv:CV,vacancy: str) -> str:
     )
     content = response.choices[0].message.content
 
-    print(content)
+    logger.debug("LLM summary: %s", content)
     return content if content is not None else ""
@@ -118,4 +118,6 @@ class CV(BaseModel):
 class Output(BaseModel):
     """CV path and summary model."""
     pdf_path: str
-    summary: str
\ No newline at end of file
+    summary: str
+    size_bytes: int = 0
+    sha256: str = ""
\ No newline at end of file
@@ -5,22 +5,55 @@ This module handles the generation of PDF files from CV data.
 
 from .models import CV, PersonalInfo, Education, CompanyExperience, Project, Skill, Output # Updated import
 from pathlib import Path
-from .styles import get_style
+import hashlib
+import logging
+import re
+import tempfile
+from .styles import TIMES_FONT_MAP, get_style
 import os
 from enum import Enum
 
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, ListFlowable, ListItem, Flowable
-from typing import Callable, Iterable, Any, List, cast # Added cast
+from typing import Callable, Collection, Iterable, Any, List, Optional, Tuple, cast # Added cast
 from .paser.yaml import parse_yaml_file,validate_cv_data
 from .generate_summary import generate_summary
-
+from telemetry.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed CVs kept per file name (e.g. Muhamad_Wijayanto_backend); older renders are deleted
+CV_KEEP_RENDERS = int(os.getenv("CV_KEEP_RENDERS", "20"))
+# "_" and the first 12 hex digits of the SHA-256 appended by content_addressed_path()
+CONTENT_HASH_SUFFIX = re.compile(r"_[0-9a-f]{12}$")
+
+
+# Output profiles are passed straight to SimpleDocTemplate.
+# "compact" produces the smallest file that still looks like the style:
+# compressed page streams, a deterministic (invariant) body without
+# timestamps and empty metadata. "compact-times" additionally folds every
+# font onto the Times family so fewer font resources are written; it changes
+# the look of the CV, so it is opt-in.
+COMPACT_PROFILE = {
+    "pageCompression": 1,
+    "invariant": 1,
+    "creator": "",
+    "producer": "",
+    "subject": "",
+}
+OUTPUT_PROFILES = {
+    "default": {},
+    "compact": COMPACT_PROFILE,
+    "compact-times": {**COMPACT_PROFILE, "initialFontName": "Times-Roman"},
+}
+# Profiles that render with the Times-only stylesheet (see TIMES_FONT_MAP)
+TIMES_ONLY_PROFILES = frozenset({"compact-times"})
 
 
 class PDFGenerator:
     """Class to generate PDF files from CV data."""
 
-    def __init__(self, output_path : str, cv_data: CV, style: str = "classic",page_size: str = "A4"):
+    def __init__(self, output_path : str, cv_data: CV, style: str = "classic",page_size: str = "A4", profile: str = "default"):
         """Initialize the PDF generator with CV data.
         
         Args:
@@ -28,16 +61,27 @@ class PDFGenerator:
             cv_data (CV): CV data object containing all the information.
             style (str): Style of the CV (default is "classic").
             page_size (str): Size of the PDF page (default is "A4").
+            profile (str): Output profile, "default", "compact" or "compact-times" (default is "default").
         """
         self.output_path = Path(output_path)
         self.cv_data = cv_data
-        #applying the style
+        if profile not in OUTPUT_PROFILES:
+            valid_profiles = ', '.join(OUTPUT_PROFILES.keys())
+            raise ValueError(f"Invalid output profile: {profile}. Valid profiles are: {valid_profiles}")
+        self.profile = profile
+        times_only = profile in TIMES_ONLY_PROFILES
+
+        #applying the style (compiled once per process and shared read-only)
         try:
             self.cv_style = get_style(style)
-            self.styles = self.cv_style.get_styles()
         except ValueError as e:
-            print(f"Error applying style: {e}")
-            self.cv_style = get_style("classic").get_styles()
+            logger.warning("Error applying style: %s", e)
+            self.cv_style = get_style("classic")
+        self.styles = self.cv_style.get_styles(times_only=times_only)
+
+        self.bullet_font_name = 'Helvetica-Bold'
+        if times_only:
+            self.bullet_font_name = TIMES_FONT_MAP[self.bullet_font_name]
 
         # Set page size
         if page_size.lower() == "a4":
@@ -55,12 +99,16 @@ class PDFGenerator:
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
-            bottomMargin=18
+            bottomMargin=18,
+            **OUTPUT_PROFILES[profile]
         )
 
         # Elements to be added to the PDF
         self.elements: List[Flowable] = []
 
+        # Size of the generated file in bytes, set by generate()
+        self.size_bytes = 0
+
     def generate(self):
         """Generate the PDF document."""
         # Add all sections
@@ -68,7 +116,10 @@ class PDFGenerator:
         
         # Build the document
         self.doc.build(self.elements)
-        
+
+        self.size_bytes = self.output_path.stat().st_size
+        logger.debug("CV PDF written to %s (%s bytes, %s profile)", self.output_path, self.size_bytes, self.profile)
+
         return self.output_path
     
     def _add_content(self):
@@ -170,7 +221,7 @@ class PDFGenerator:
                 items: List[Flowable] = []
                 for achievement in role.achievements:
                     items.append(cast(Flowable, ListItem(Paragraph(achievement, self.styles['Normal'])))) # Cast ListItem to Flowable
-                self.elements.append(ListFlowable(items, bulletType='bullet', leftIndent=12, bulletFontName='Helvetica-Bold', bulletFontSize=self.styles['Normal'].fontSize))
+                self.elements.append(ListFlowable(items, bulletType='bullet', leftIndent=12, bulletFontName=self.bullet_font_name, bulletFontSize=self.styles['Normal'].fontSize))
     
     def _format_education(self, edu: Education):
         """Format an education entry."""
@@ -194,13 +245,11 @@ class PDFGenerator:
         """Add skills section to the PDF."""
         self.elements.append(Paragraph('Skills', self.styles['SectionHeading']))
         
-        print("Skills:")
         for skill_item in skills:
             # Skill category (e.g., Programming Languages)
             self.elements.append(Paragraph(skill_item.category, self.styles.get('ExperienceTitle', self.styles['Normal']))) # Reusing ExperienceTitle or similar
             
-            print("Category:", skill_item)
-            print(skill_item.category)
+            logger.debug("Skill category: %s", skill_item.category)
             # List of skills in that category
             self.elements.append(Paragraph((skill_item.name), self.styles['Normal']))
     
@@ -231,14 +280,75 @@ class PDFGenerator:
             items: List[Flowable] = []
             for achievement in project.achievements:
                 items.append(cast(Flowable, ListItem(Paragraph(achievement, self.styles['Normal'])))) # Cast ListItem to Flowable
-            self.elements.append(ListFlowable(items, bulletType='bullet', leftIndent=12, bulletFontName='Helvetica-Bold', bulletFontSize=self.styles['Normal'].fontSize))
+            self.elements.append(ListFlowable(items, bulletType='bullet', leftIndent=12, bulletFontName=self.bullet_font_name, bulletFontSize=self.styles['Normal'].fontSize))
+
+def content_addressed_path(pdf_path: str, target_path: str) -> Tuple[str, str]:
+    """Rename a PDF to target_path with a hash of its content added to the file name.
+
+    Identical CVs get identical names, so a re-render of the same CV (a retried
+    job) replaces its file instead of adding one. Requires a deterministic
+    (invariant) output profile to be useful. Upload the file under
+    display_file_name(), which leaves the hash out.
+
+    Args:
+        pdf_path: Path of the rendered PDF, in the directory of target_path
+        target_path: Path the hash is added to, e.g. .../Muhamad_Wijayanto_backend.pdf
+
+    Returns:
+        Tuple of the new path and the full SHA-256 hex digest
+    """
+    with open(pdf_path, "rb") as pdf_file:
+        digest = hashlib.sha256(pdf_file.read()).hexdigest()
+    path = Path(target_path)
+    hashed_path = path.with_name(f"{path.stem}_{digest[:12]}{path.suffix}")
+    os.replace(pdf_path, hashed_path)
+    return str(hashed_path), digest
+
+def display_file_name(pdf_path: str) -> str:
+    """File name of a CV without the content hash, e.g. Muhamad_Wijayanto_backend.pdf."""
+    path = Path(pdf_path)
+    return f"{CONTENT_HASH_SUFFIX.sub('', path.stem)}{path.suffix}"
+
+def prune_rendered_cvs(pdf_path: str, keep: int = CV_KEEP_RENDERS, protected: Collection[str] = ()) -> int:
+    """Delete all but the newest `keep` content-addressed renders of the same CV as pdf_path.
+
+    Args:
+        pdf_path: A content-addressed CV; it is always kept
+        keep: Renders to keep, including pdf_path; 0 keeps all
+        protected: Paths that are never deleted and not counted, e.g. the
+            CVs of staged jobs that were not applied to yet
+
+    Returns:
+        Number of files deleted
+    """
+    if keep <= 0:
+        return 0
+    path = Path(pdf_path)
+    base = CONTENT_HASH_SUFFIX.sub("", path.stem)
+    protected_paths = {os.path.abspath(protected_path) for protected_path in protected}
+    renders = [
+        sibling for sibling in path.parent.glob(f"{base}_*{path.suffix}")
+        if CONTENT_HASH_SUFFIX.sub("", sibling.stem) == base and sibling != path
+        and os.path.abspath(sibling) not in protected_paths
+    ]
+    renders.sort(key=lambda sibling: sibling.stat().st_mtime, reverse=True)
+    deleted = 0
+    for sibling in renders[keep - 1:]:
+        try:
+            sibling.unlink()
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    if deleted:
+        logger.debug("%s CV lama dihapus dari %s", deleted, path.parent)
+    return deleted
 
 class JobCategory(Enum):
     BACKEND = "backend"
     FRONTEND = "frontend"
     FULLSTACK = "fullstack"
 
-def generate_pdf(cv_data: CV, output_path: str, style: str = "classic", page_size: str = "A4") -> str:
+def generate_pdf(cv_data: CV, output_path: str, style: str = "classic", page_size: str = "A4", profile: str = "default") -> str:
     """Generate a PDF CV from the provided data.
     
     Args:
@@ -246,57 +356,109 @@ def generate_pdf(cv_data: CV, output_path: str, style: str = "classic", page_siz
         output_path: Path where the PDF will be saved
         style: Style name for the CV (e.g., 'classic', 'modern', 'minimal')
         page_size: Size of the page ('A4' or 'letter')
+        profile: Output profile ('default', 'compact' or 'compact-times')
         
     Returns:
         Path to the generated PDF file
     """
-    generator = PDFGenerator(output_path, cv_data, style, page_size)
+    generator = PDFGenerator(output_path, cv_data, style, page_size, profile)
     return str(generator.generate())
 
-def generate_cv_pdf_from_yaml(job_category: JobCategory, style: str = "classic", page_size: str = "A4", vacancy: str = "") -> Output:
+def load_cv_data(job_category: JobCategory) -> CV:
+    """Load and validate the base CV for a job category.
+
+    Args:
+        job_category: The category of the job (e.g., backend, frontend, fullstack).
+
+    Returns:
+        CV object parsed from the category's YAML file
+    """
+    yaml_file_name = f"{job_category.value}.yaml"
+    yaml_path = os.path.join("generate_cv", "documents", "yaml", yaml_file_name)
+
+    yaml_data = parse_yaml_file(yaml_path)
+    return validate_cv_data(yaml_data)
+
+def generate_cv_pdf_from_yaml(
+    job_category: JobCategory,
+    style: str = "classic",
+    page_size: str = "A4",
+    vacancy: str = "",
+    output_path: Optional[str] = None,
+    summary: Optional[str] = None,
+    profile: str = "default",
+    keep_paths: Collection[str] = (),
+) -> Output:
     """Generate a PDF CV from a YAML file based on job category.
 
     Args:
         job_category: The category of the job (e.g., backend, frontend, fullstack).
-        output_path: Path where the PDF will be saved. If None, a default path is generated.
         style: Style name for the CV (e.g., 'classic', 'modern', 'minimal')
         page_size: Size of the page ('A4' or 'letter')
         vacancy: The job vacancy for which the CV is being tailored
+        output_path: Path where the PDF will be saved. If None, a default path is generated
+            whose file name ends with a hash of the PDF content, and only the newest
+            CV_KEEP_RENDERS such files per category are kept.
+        summary: Precomputed summary to use instead of generating one from the vacancy.
+        profile: Output profile ('default', 'compact' or 'compact-times')
+        keep_paths: Earlier renders that must not be pruned (see prune_rendered_cvs)
 
     Returns:
         Path to the generated PDF file
     """
-    yaml_file_name = f"{job_category.value}.yaml"
-    yaml_path = os.path.join("generate_cv", "documents", "yaml", yaml_file_name)
-    
-    yaml_data = parse_yaml_file(yaml_path)
-    cv_data = validate_cv_data(yaml_data)
-    
-    
-    output_file_name = f"Muhamad_Wijayanto_{job_category.value}.pdf"
-    output_path = os.path.join("generate_cv", "documents", "pdf", output_file_name)
+    cv_data = load_cv_data(job_category)
+
+    content_addressed = output_path is None
+    if output_path is None:
+        output_file_name = f"Muhamad_Wijayanto_{job_category.value}.pdf"
+        output_path = os.path.join("generate_cv", "documents", "pdf", output_file_name)
 
-    if vacancy:
-        summary = generate_summary(cv_data, vacancy)
-        # Optionally, you can attach the summary to the cv_data object if your PDFGenerator supports it
+    if summary is None and vacancy:
+        with tracer.stage("summarize"):
+            summary = generate_summary(cv_data, vacancy)
+        logger.debug("Generated summary: %s", summary)
+
+    if summary:
         cv_data.personal_info.summary = summary
-        print(f"Generated summary: {summary}")
-        print(f"Summary added to CV data: {cv_data.personal_info.summary}")
-        # Add AI summary generation logic here
 
     # Generate the PDF
-    pdf_path = generate_pdf(cv_data, output_path, style, page_size)
-    output = Output(pdf_path=pdf_path, summary=cv_data.personal_info.summary or "")
+    with tracer.stage("render"):
+        digest = ""
+        if content_addressed:
+            # Render to a file of our own: workers on one host render the same category at once
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            file_descriptor, rendered_path = tempfile.mkstemp(
+                prefix=f".{Path(output_path).stem}.", suffix=".pdf.tmp", dir=os.path.dirname(output_path)
+            )
+            os.close(file_descriptor)
+            try:
+                generate_pdf(cv_data, rendered_path, style, page_size, profile)
+                pdf_path, digest = content_addressed_path(rendered_path, output_path)
+            finally:
+                if os.path.exists(rendered_path):
+                    os.remove(rendered_path)
+            prune_rendered_cvs(pdf_path, protected=keep_paths)
+        else:
+            pdf_path = generate_pdf(cv_data, output_path, style, page_size, profile)
+    output = Output(
+        pdf_path=pdf_path,
+        summary=cv_data.personal_info.summary or "",
+        size_bytes=os.path.getsize(pdf_path),
+        sha256=digest,
+    )
     return output
 
-def generate_cv_pdf(vacancy: str, roles: JobCategory) -> Output:
+def generate_cv_pdf(vacancy: str, roles: JobCategory, summary: Optional[str] = None, keep_paths: Collection[str] = ()) -> Output:
     """
     Generates a CV PDF based on vacancy and job role.
-    Uses default style, page size, and output path generation.
+    Uses default style, page size, and output path generation, and the compact
+    output profile since this CV is uploaded to the job portal.
 
     Args:
         vacancy: The job vacancy for which the CV is being tailored.
         roles: The job category (e.g., backend, frontend, fullstack).
+        summary: Summary from an earlier render; skips the summary LLM call.
+        keep_paths: Earlier renders that must not be pruned.
 
     Returns:
         Path to the generated PDF file.
@@ -304,7 +466,10 @@ def generate_cv_pdf(vacancy: str, roles: JobCategory) -> Output:
     # Call the more detailed function with default values for other parameters
     output = generate_cv_pdf_from_yaml(
         job_category=roles,
-        vacancy=vacancy
+        vacancy=vacancy,
+        summary=summary,
+        profile="compact",
+        keep_paths=keep_paths,
         # output_path, style, and page_size will use their defaults
         # from generate_cv_pdf_from_yaml
     )
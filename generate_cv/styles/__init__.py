@@ -1,26 +1,58 @@
-"""Styles module for CV PDFs."""
+"""Styles module for CV PDFs.
 
-from .base_style import CVStyle
+Styles are compiled once per process and shared: get_style() returns the same
+read-only CVStyle instance to every caller, so building a document no longer
+re-runs getSampleStyleSheet() and _setup_styles().
+"""
+
+import threading
+from typing import Dict, Type
+
+from .base_style import CVStyle, FrozenParagraphStyle, TIMES_FONT_MAP
 from .classic_style import ClassicStyle
 
+_STYLE_CLASSES: Dict[str, Type[CVStyle]] = {
+    'classic': ClassicStyle,
+}
+_compiled_styles: Dict[str, CVStyle] = {}
+_registry_lock = threading.Lock()
+
+
+def register_style(style_name: str, style_class: Type[CVStyle]) -> None:
+    """Register an additional CV style.
+
+    Args:
+        style_name: Name used to look the style up
+        style_class: CVStyle subclass implementing the style
+    """
+    with _registry_lock:
+        _STYLE_CLASSES[style_name.lower()] = style_class
+        # Drop a stale compilation if the name is re-registered
+        _compiled_styles.pop(style_name.lower(), None)
+
+
 def get_style(style_name: str) -> CVStyle:
-    """Get a CV style by name.
-    
+    """Get a compiled CV style by name.
+
     Args:
         style_name: Name of the style
-        
+
     Returns:
-        CVStyle object
-        
+        Shared CVStyle object, compiled on first use
+
     Raises:
         ValueError: If the style name is not valid
     """
-    styles = {
-        'classic': ClassicStyle,
-    }
-    
-    if style_name.lower() not in styles:
-        valid_styles = ', '.join(styles.keys())
-        raise ValueError(f"Invalid style name: {style_name}. Valid styles are: {valid_styles}")
-    
-    return styles[style_name.lower()]()
+    key = style_name.lower()
+    compiled = _compiled_styles.get(key)
+    if compiled is not None:
+        return compiled
+
+    with _registry_lock:
+        if key not in _STYLE_CLASSES:
+            valid_styles = ', '.join(_STYLE_CLASSES.keys())
+            raise ValueError(f"Invalid style name: {style_name}. Valid styles are: {valid_styles}")
+        # Another thread may have compiled it while we waited for the lock
+        if key not in _compiled_styles:
+            _compiled_styles[key] = _STYLE_CLASSES[key]()
+        return _compiled_styles[key]
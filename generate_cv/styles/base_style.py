@@ -2,21 +2,116 @@
 
 
 from abc import ABC, abstractmethod
-from reportlab.lib.styles import getSampleStyleSheet
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+
+
+# Standard-14 fonts folded onto the Times family by the Times-only stylesheet
+TIMES_FONT_MAP = {
+    "Helvetica": "Times-Roman",
+    "Helvetica-Bold": "Times-Bold",
+    "Helvetica-Oblique": "Times-Italic",
+    "Helvetica-BoldOblique": "Times-BoldItalic",
+    "Courier": "Times-Roman",
+    "Courier-Bold": "Times-Bold",
+    "Courier-Oblique": "Times-Italic",
+    "Courier-BoldOblique": "Times-BoldItalic",
+}
+
+
+class FrozenParagraphStyle(ParagraphStyle):
+    """Read-only ParagraphStyle that can be shared between documents and threads.
+
+    Attributes are flattened from the source style (no parent chain), and any
+    assignment raises. Copies made with copy/deepcopy or clone() are plain,
+    mutable ParagraphStyles, which is what reportlab uses when it needs to
+    tweak a style while splitting paragraphs.
+    """
+
+    def __init__(self, style: ParagraphStyle, **overrides):
+        super().__init__(style.name)
+        attributes = {key: value for key, value in style.__dict__.items() if key not in ('name', 'parent')}
+        attributes.update(overrides)
+        self.__dict__.update(attributes)
+        self.__dict__['_frozen'] = True
+
+    def __setattr__(self, key, value):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f"Style '{self.name}' is shared and read-only; clone it before changing '{key}'")
+        super().__setattr__(key, value)
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Style '{self.name}' is shared and read-only")
+
+    def _mutable_copy(self, name: Optional[str] = None) -> ParagraphStyle:
+        style = ParagraphStyle(name or self.name)
+        style.__dict__.update({key: value for key, value in self.__dict__.items() if key not in ('name', 'parent', '_frozen')})
+        return style
+
+    def __copy__(self) -> ParagraphStyle:
+        return self._mutable_copy()
+
+    def __deepcopy__(self, memo) -> ParagraphStyle:
+        return self._mutable_copy()
+
+    def __reduce__(self):
+        return (FrozenParagraphStyle, (self._mutable_copy(),))
+
+    def clone(self, name, parent=None, **kwds) -> ParagraphStyle:
+        style = self._mutable_copy(name)
+        style.__dict__.update(kwds)
+        return style
+
+
+def freeze_stylesheet(stylesheet: StyleSheet1, font_map: Optional[Dict[str, str]] = None) -> Mapping[str, FrozenParagraphStyle]:
+    """Compile a stylesheet into an immutable name -> style mapping.
+
+    Args:
+        stylesheet: The stylesheet to compile
+        font_map: Optional font substitutions applied to every style
+
+    Returns:
+        Read-only mapping of style names and aliases to frozen paragraph styles
+    """
+    frozen: Dict[str, FrozenParagraphStyle] = {}
+    for name, style in stylesheet.byName.items():
+        if not isinstance(style, ParagraphStyle):
+            continue
+        overrides = {}
+        if font_map and style.fontName in font_map:
+            overrides['fontName'] = font_map[style.fontName]
+        frozen[name] = FrozenParagraphStyle(style, **overrides)
+    for alias, style in stylesheet.byAlias.items():
+        if style.name in frozen:
+            frozen[alias] = frozen[style.name]
+    return MappingProxyType(frozen)
+
 
 class CVStyle(ABC):
-    """Base class for CV styling."""
+    """Base class for CV styling.
+
+    A style is compiled once: _setup_styles() runs on a private sample
+    stylesheet, which is then frozen into read-only mappings that every
+    document (and every render thread) can share.
+    """
 
     def __init__(self):
-        """Initialize the style."""
+        """Initialize and compile the style."""
         self.styles = getSampleStyleSheet()
         self._setup_styles()
+        self._compiled = freeze_stylesheet(self.styles)
+        self._compiled_times = freeze_stylesheet(self.styles, TIMES_FONT_MAP)
 
     @abstractmethod
     def _setup_styles(self):
         """Setup the styles. Should be implemented by subclasses."""
         pass
 
-    def get_styles(self):
-        """Get the styles dictionary."""
-        return self.styles
+    def get_styles(self, times_only: bool = False) -> Mapping[str, FrozenParagraphStyle]:
+        """Get the compiled, read-only styles mapping.
+
+        Args:
+            times_only: Return the variant with every font folded onto the Times family
+        """
+        return self._compiled_times if times_only else self._compiled
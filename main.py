@@ -1,80 +1,224 @@
 from patchright.async_api import async_playwright
+import argparse
 import asyncio
+import logging
 import os
-from provider.glints import glints_provider
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Optional
+from browser.memory import BrowserMemoryMonitor
+from browser.session import BrowserSession, CHROME_USER_DATA_DIR
+from provider.glints import RunMode, glints_provider
+from provider.glints_queue import glints_discover, glints_worker
+from db.database import async_session_factory, dispose_async_engine
+from db.seen_links import seen_links
+from db.writer import ApplicationWriter
+from telemetry.log import setup_logging
+from telemetry.profiling import PROFILE_DIR, PROFILE_SNAPSHOT_JOBS, RunProfiler
+from provider.budget import RunBudget
+from provider.checkpoint import RunCheckpoint
+from cli import add_run_arguments
+from telemetry.tracing import tracer
 
+logger = logging.getLogger(__name__)
 
-async def main():
-    context = None
-    page = None
-    # Tentukan path user_data_dir dengan lebih hati-hati
-    user_data_dir_path = "/home/wijayanto1320/.config/google-chrome/Default" # Sesuaikan jika perlu
 
-    # Cek apakah direktori user_data_dir ada
-    if not os.path.exists(user_data_dir_path):
-        print(f"Peringatan: Direktori user_data_dir tidak ditemukan di {user_data_dir_path}. Pastikan path-nya benar atau buat direktorinya.")
-        # Jika direktori tidak ada, Playwright akan membuatnya, tetapi profil yang ada tidak akan dimuat.
-        # Anda bisa memilih untuk menghentikan skrip di sini jika profil persisten adalah krusial.
-        # return
+async def save_error_screenshot(session: BrowserSession, page) -> None:
+    """Save a screenshot of the working page, or of the first open page of the context."""
+    try:
+        if page and not page.is_closed():
+            error_screenshot_path = "error_screenshot_main_page.png"
+            await page.screenshot(path=error_screenshot_path)
+            logger.info("Tangkapan layar error dari halaman utama disimpan sebagai %s", error_screenshot_path)
+        elif session.context and session.context.pages:
+            for idx, p_err in enumerate(session.context.pages):
+                if not p_err.is_closed():
+                    error_screenshot_path_ctx = f"error_screenshot_context_page_{idx}.png"
+                    await p_err.screenshot(path=error_screenshot_path_ctx)
+                    logger.info("Tangkapan layar error dari halaman konteks ke-%s disimpan sebagai %s", idx, error_screenshot_path_ctx)
+                    break # Ambil satu saja
+    except Exception as e_screenshot:
+        logger.warning("Gagal mengambil tangkapan layar saat error utama: %s", e_screenshot)
+
+
+@asynccontextmanager
+async def open_browser() -> AsyncIterator[BrowserSession]:
+    """Open the browser session for a run; an error inside is logged with a screenshot, and the session is always closed."""
+    # Profil Chrome hanya dipakai jika browser daemon (scripts/keep_browser_open.py) tidak berjalan
+    if not os.path.exists(CHROME_USER_DATA_DIR):
+        logger.warning("Direktori user_data_dir tidak ditemukan di %s. Pastikan path-nya benar atau atur CHROME_USER_DATA_DIR.", CHROME_USER_DATA_DIR)
+
+    async with async_playwright() as p:
+        # Pakai browser daemon lewat CDP jika ada, jika tidak luncurkan browser sendiri
+        session = BrowserSession(p)
+        try:
+            await session.open()
+            yield session
+
+        except Exception as e:
+            logger.exception("Terjadi kesalahan utama selama operasi Playwright: %s", e)
+            # Halaman kerja bisa sudah diganti oleh daur ulang
+            await save_error_screenshot(session, session.page)
+
+        finally:
+            # Tutup selagi Playwright masih terhubung, agar tab kita tidak tertinggal di browser daemon
+            if session.context:
+                logger.info("Selesai. Menutup konteks browser...")
+                attached = session.attached
+                await session.close()
+                logger.info("Terputus dari browser daemon." if attached else "Konteks browser ditutup.")
+            else:
+                logger.info("Konteks browser tidak diinisialisasi atau sudah ditutup.")
+
 
+@asynccontextmanager
+async def run_context() -> AsyncIterator[None]:
+    """Metrics endpoint for the run, and the stage summary and database cleanup when it ends."""
+    # Endpoint /metrics lokal jika METRICS_PORT diatur
+    tracer.start_metrics_server()
     try:
-        async with async_playwright() as p:
-            print("Meluncurkan browser dengan konteks persisten...")
-            context = await p.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir_path,
-                channel="chrome",
-                headless=False,
-                no_viewport=True,
-            )
-            print("Browser diluncurkan dengan konteks persisten.")
+        yield
+    except Exception as e:
+        logger.exception("Terjadi kesalahan utama: %s", e)
+    finally:
+        if tracer.stats:
+            logger.info("Waktu per tahap:\n%s", tracer.summary())
+            tracer.write_prometheus()
+        # Tutup koneksi database async agar proses dapat keluar dengan bersih
+        await dispose_async_engine()
+
+
+async def main(resume: bool = False, mode: RunMode = RunMode.APPLY, budget: Optional[RunBudget] = None):
+    """Apply to the jobs of the listing.
+
+    Args:
+        resume: Start from the job card saved in the run checkpoint by an interrupted run
+        mode: How far to take each job; scrape, classify and render only stage JobRecords
+        budget: Optional deadline and daily cap; when one is reached the run stops after the
+            job in flight and keeps its checkpoint for `resume`
+    """
+    checkpoint = RunCheckpoint()
+    start_index = checkpoint.next_card() if resume else 0
+
+    async with run_context():
+        # Muat index link yang sudah tersimpan sekali di awal
+        async with async_session_factory() as db_session:
+            loaded_links = await seen_links.load_async(db_session)
+        logger.info("Index link dimuat: %s link (%s byte).", loaded_links, seen_links.memory_bytes)
+
+        if budget is not None and budget.limited:
+            await budget.load()
+            logger.info("Batas run: %s", budget.describe())
 
-            # Gunakan halaman pertama yang mungkin sudah ada (misalnya, 'new tab page')
-            # atau buat halaman baru jika tidak ada halaman.
-            if context.pages:
-                page = context.pages[0]
-                print("Menggunakan halaman yang sudah ada di konteks.")
+        async with open_browser() as session:
+            # Daur ulang halaman/konteks agar memori browser tetap dalam batas
+            memory_monitor = BrowserMemoryMonitor(session)
+
+            # Simpan lamaran secara batch; sisa buffer di-flush saat keluar
+            async with ApplicationWriter() as writer:
+                writer.install_signal_handlers()
+                if mode is not RunMode.APPLY:
+                    logger.info("Mode %s: job hanya di-stage, tidak ada lamaran yang dikirim.", mode.value)
+                stop_reason = await glints_provider(
+                    page=session.page,
+                    writer=writer,
+                    memory_monitor=memory_monitor,
+                    checkpoint=checkpoint,
+                    start_index=start_index,
+                    mode=mode,
+                    budget=budget)
+            if stop_reason:
+                logger.info("Run dihentikan karena %s; lanjutkan dengan `cli.py resume`.", stop_reason)
             else:
-                print("Membuat halaman baru...")
-                page = await context.new_page()
-                print("Halaman baru dibuat.")
-            
-            # Pastikan viewport diatur jika tidak menggunakan start-maximized
-            # await page.set_viewport_size({"width": 1920, "height": 1080})
+                # Seluruh daftar sudah diproses, tidak ada yang perlu dilanjutkan
+                checkpoint.clear()
+            logger.info("Ringkasan memori browser: %s", memory_monitor.snapshot())
 
 
-            await glints_provider(
-                page=page)
+async def discover_main(budget: Optional[RunBudget] = None, mode: RunMode = RunMode.APPLY):
+    """Enqueue the not yet applied jobs of the listing for the queue workers of mode."""
+    async with run_context():
+        async with async_session_factory() as db_session:
+            await seen_links.load_async(db_session)
+        async with open_browser() as session:
+            await glints_discover(session.page, budget=budget, mode=mode)
 
-    except Exception as e:
-        print(f"\nTerjadi kesalahan utama selama operasi Playwright: {e}")
-        try:
-            if page and not page.is_closed():
-                error_screenshot_path = "error_screenshot_main_page.png"
-                await page.screenshot(path=error_screenshot_path)
-                print(f"Tangkapan layar error dari halaman utama disimpan sebagai {error_screenshot_path}")
-            elif context and context.pages:
-                for idx, p_err in enumerate(context.pages):
-                    if not p_err.is_closed():
-                        error_screenshot_path_ctx = f"error_screenshot_context_page_{idx}.png"
-                        await p_err.screenshot(path=error_screenshot_path_ctx)
-                        print(f"Tangkapan layar error dari halaman konteks ke-{idx} disimpan sebagai {error_screenshot_path_ctx}")
-                        break # Ambil satu saja
-        except Exception as e_screenshot:
-            print(f"Gagal mengambil tangkapan layar saat error utama: {e_screenshot}")
 
-    finally:
-        if context:
-            print("\nSelesai. Menutup konteks browser...")
-            # await asyncio.sleep(10) # Tambahkan jeda jika ingin melihat browser sebelum ditutup
-            await context.close()
-            print("Konteks browser ditutup.")
-        else:
-            print("Konteks browser tidak diinisialisasi atau sudah ditutup.")
+async def worker_main(
+    mode: RunMode = RunMode.APPLY,
+    follow: bool = False,
+    max_jobs: Optional[int] = None,
+    budget: Optional[RunBudget] = None,
+):
+    """Process jobs from the queue; several workers may run at once, on this or other machines.
 
-if __name__ == "__main__":
+    The link index is not loaded: other workers add applications all the time, so
+    every link check asks the database.
+    """
+    async with run_context():
+        async with open_browser() as session:
+            memory_monitor = BrowserMemoryMonitor(session)
+            await glints_worker(
+                session.page,
+                memory_monitor=memory_monitor,
+                mode=mode,
+                follow=follow,
+                max_jobs=max_jobs,
+                budget=budget,
+            )
+            logger.info("Ringkasan memori browser: %s", memory_monitor.snapshot())
+
+
+async def profiled(coroutine: Awaitable[None], profile_dir: str, snapshot_jobs: int) -> None:
+    """Await a run under the run profiler (CPU profile, stack samples, loop lag, tracemalloc)."""
+    async with RunProfiler(profile_dir=profile_dir, snapshot_jobs=snapshot_jobs):
+        await coroutine
+
+
+def execute(coroutine: Awaitable[None], profile: bool = False, profile_dir: Optional[str] = None, snapshot_every: Optional[int] = None) -> None:
+    """Set up logging and run a coroutine in a new event loop, optionally profiled."""
+    # Log lewat antrean; penulisan ke terminal/file dilakukan thread latar
+    setup_logging()
+    if profile:
+        coroutine = profiled(
+            coroutine,
+            profile_dir or PROFILE_DIR,
+            PROFILE_SNAPSHOT_JOBS if snapshot_every is None else snapshot_every,
+        )
     try:
-        asyncio.run(main())
+        asyncio.run(coroutine)
     except KeyboardInterrupt:
-        print("\nEksekusi dihentikan oleh pengguna.")
+        logger.info("Eksekusi dihentikan oleh pengguna.")
     except Exception as e_run:
-        print(f"\nTerjadi kesalahan saat menjalankan asyncio loop: {e_run}")
\ No newline at end of file
+        logger.exception("Terjadi kesalahan saat menjalankan asyncio loop: %s", e_run)
+
+
+def run(
+    resume: bool = False,
+    profile: bool = False,
+    profile_dir: Optional[str] = None,
+    snapshot_every: Optional[int] = None,
+    mode: str = RunMode.APPLY.value,
+    deadline: Optional[str] = None,
+    max_per_day: Optional[int] = None,
+) -> None:
+    """Run main(); the `run` and `resume` commands of cli.py.
+
+    deadline and max_per_day default to RUN_DEADLINE and MAX_APPLICATIONS_PER_DAY
+    (see provider/budget.py).
+    """
+    budget = RunBudget.from_settings(deadline, max_per_day)
+    execute(main(resume=resume, mode=RunMode(mode), budget=budget), profile, profile_dir, snapshot_every)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lamar pekerjaan Glints secara otomatis.")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    run(
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        snapshot_every=args.snapshot_every,
+        mode=args.mode,
+        deadline=args.deadline,
+        max_per_day=args.max_per_day,
+    )
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+    Run limits: a wall-clock deadline and a cap on applications per day
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from db.crud import count_job_applications_async
+from db.database import async_session_factory
+from db.models import ApplicationFilter
+from telemetry.tracing import JOB_STAGE, Tracer, tracer
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Batas waktu run ("HH:MM" atau durasi seperti "90m"); kosong berarti tanpa batas
+RUN_DEADLINE = os.getenv("RUN_DEADLINE", "")
+# Lamaran maksimum per hari kalender (waktu lokal), 0 berarti tanpa batas
+MAX_APPLICATIONS_PER_DAY = int(os.getenv("MAX_APPLICATIONS_PER_DAY", "0"))
+# Perkiraan durasi satu job sebelum ada job yang selesai di run ini
+RUN_JOB_ESTIMATE_S = float(os.getenv("RUN_JOB_ESTIMATE_S", "120"))
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a deadline given as a local clock time or as a duration from now.
+
+    Args:
+        value: "HH:MM" (the next time the clock shows it) or a number with s, m or h, e.g. "90m"
+        now: Current local time, datetime.now() by default
+
+    Returns:
+        The deadline as a naive local datetime
+    """
+    now = now or datetime.now()
+    duration = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh])\s*", value)
+    if duration:
+        return now + timedelta(seconds=float(duration.group(1)) * DURATION_UNITS[duration.group(2)])
+    clock = re.fullmatch(r"\s*(\d{1,2}):(\d{2})\s*", value)
+    if clock and int(clock.group(1)) < 24 and int(clock.group(2)) < 60:
+        deadline = now.replace(hour=int(clock.group(1)), minute=int(clock.group(2)), second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    raise ValueError(f"Deadline tidak valid: {value!r} (pakai HH:MM atau durasi seperti 90m)")
+
+
+def day_start_utc(day: datetime) -> datetime:
+    """Local midnight of day as a naive UTC datetime, the form created_at is stored in."""
+    midnight = day.replace(hour=0, minute=0, second=0, microsecond=0).astimezone()
+    return midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class RunBudget:
+    """Decides, before each job, whether a run may start another one.
+
+    A job is only started if it is expected to finish before the deadline; the
+    expectation is the p95 duration of the jobs of this run so far that were not
+    skipped. The daily cap counts the applications stored since local midnight
+    plus those made by this run that are not stored yet.
+
+    The cap is approximate when several queue workers share it: each checks it
+    before claiming a job, and the jobs already in flight are not counted, so
+    the day can end up to (workers - 1) applications over the cap.
+    """
+
+    def __init__(
+        self,
+        deadline: Optional[datetime] = None,
+        max_per_day: int = MAX_APPLICATIONS_PER_DAY,
+        job_estimate_s: float = RUN_JOB_ESTIMATE_S,
+        run_tracer: Tracer = tracer,
+    ):
+        """Initialize the budget.
+
+        Args:
+            deadline: Naive local time by which the run must be done, None for no deadline
+            max_per_day: Applications per calendar day, 0 for no cap
+            job_estimate_s: Expected job duration until a job of this run has finished
+            run_tracer: Tracer whose job durations give the expected job duration
+        """
+        self.deadline = deadline
+        self.max_per_day = max_per_day
+        self.job_estimate_s = job_estimate_s
+        self.tracer = run_tracer
+        self.day: Optional[datetime] = None
+        self.applied_today = 0
+
+    @classmethod
+    def from_settings(cls, deadline: Optional[str] = None, max_per_day: Optional[int] = None) -> "RunBudget":
+        """Budget from command line values, falling back to RUN_DEADLINE and MAX_APPLICATIONS_PER_DAY."""
+        deadline = RUN_DEADLINE if deadline is None else deadline
+        return cls(
+            deadline=parse_deadline(deadline) if deadline else None,
+            max_per_day=MAX_APPLICATIONS_PER_DAY if max_per_day is None else max_per_day,
+        )
+
+    @property
+    def limited(self) -> bool:
+        return self.deadline is not None or self.max_per_day > 0
+
+    async def load(self) -> None:
+        """Count the applications stored today; call before the run and again to see other workers' applications."""
+        if not self.max_per_day:
+            return
+        self.day = datetime.now()
+        async with async_session_factory() as session:
+            self.applied_today = await count_job_applications_async(session, ApplicationFilter(created_from=day_start_utc(self.day)))
+
+    def record_application(self) -> None:
+        """Count an application made by this run."""
+        self.applied_today += 1
+
+    def expected_job_s(self) -> float:
+        # Skipped jobs (links applied to before) take no time and would pull the p95 towards 0
+        stats = self.tracer.stats.get(JOB_STAGE)
+        return stats.quantile(0.95, worked_only=True) if stats is not None and stats.worked_durations else self.job_estimate_s
+
+    async def stop_reason(self) -> Optional[str]:
+        """Why no further job may be started ("deadline" or "daily_cap"), None if one may."""
+        if self.deadline is not None:
+            if datetime.now() + timedelta(seconds=self.expected_job_s()) > self.deadline:
+                return "deadline"
+        if self.max_per_day:
+            if self.day is None or self.day.date() != datetime.now().date():
+                # Hari baru (atau belum dihitung): hitung ulang dari database
+                await self.load()
+            if self.applied_today >= self.max_per_day:
+                return "daily_cap"
+        return None
+
+    def describe(self) -> str:
+        deadline = self.deadline.strftime("%Y-%m-%d %H:%M") if self.deadline else "-"
+        cap = f"{self.applied_today}/{self.max_per_day}" if self.max_per_day else "-"
+        return f"deadline {deadline}, lamaran hari ini {cap}"
@@ -0,0 +1,48 @@
+"""
+    Progress of a run through the job listing, for resuming an interrupted run
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Written while a run is in progress and removed when it finishes; state/ is git-ignored
+RUN_CHECKPOINT = os.getenv("RUN_CHECKPOINT", os.path.join("state", "run_checkpoint.json"))
+
+
+class RunCheckpoint:
+    """The next job card to process, saved atomically before every card."""
+
+    def __init__(self, path: str = RUN_CHECKPOINT):
+        self.path = path
+
+    def load(self) -> Dict[str, Any]:
+        """The saved progress ({"next_card", "cards", "updated_at"}), or {} if there is none."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def next_card(self) -> int:
+        """Index of the card to resume from, 0 without a checkpoint."""
+        return int(self.load().get("next_card", 0))
+
+    def save(self, next_card: int, cards: int) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"next_card": next_card, "cards": cards, "updated_at": datetime.utcnow().isoformat()}, checkpoint_file)
+        os.replace(temporary_path, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint after a run went through the whole listing."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
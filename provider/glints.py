@@ -4,138 +4,286 @@
 
 from patchright.async_api import Page,Locator,expect
 import asyncio
+import hashlib
+import json
+import logging
 import os
 import re
+from enum import Enum
+from typing import Dict, Optional
+from urllib.parse import urljoin
 from pydantic_ai_role import generate_role,JobCategoryAi
-from generate_cv.pdf_generator import generate_cv_pdf,JobCategory
 from generate_cv.models import Output
-from db.models import JobApplication, ApplicationStatus
-from sqlmodel import Session
-from db.database import engine
-from db.crud import create_job_application,check_link_availability
+from db.models import JobApplication, ApplicationStatus, JobRecord, JobRecordStage
+from db.database import async_session_factory
+from db.crud import insert_job_application_if_absent_async,check_link_availability_async
+from db.writer import ApplicationWriter
+from db.seen_links import seen_links
+from db.staging import get_job_record_async, reached, save_job_record_async, staged_cv_paths_async
+from browser.memory import BrowserMemoryMonitor
+from provider.budget import RunBudget
+from provider.checkpoint import RunCheckpoint
+from telemetry.tracing import SKIPPED, Span, tracer
 
-async def glints_provider(page: Page):
-        
-    # Menggunakan halaman yang sudah ada atau halaman baru
-    try :
-        url = "https://glints.com/id/opportunities/jobs/explore?keyword=golang&country=ID&locationName=All+Cities%2FProvinces&yearsOfExperienceRanges=ONE_TO_THREE_YEARS%2CFRESH_GRAD%2CNO_EXPERIENCE%2CLESS_THAN_A_YEAR"
-        await page.goto(url,wait_until="domcontentloaded",timeout=60000)
-    except Exception as e:
-        print(f"Error saat mengakses URL: {e}")
-        raise e
-    
-    job_card_selector = ".JobCardsc__JobcardContainer-sc-hmqj50-0"
-    try:
-        # Tunggu elemen yang menunjukkan bahwa halaman telah dimuat sepenuhnya
-        await page.wait_for_selector(job_card_selector, timeout=60000)
-    except Exception as e:
-        print(f"Error saat menunggu elemen: {e}")
-        raise e
-    
-    count = await count_job_card(page, job_card_selector)
+GLINTS_EXPLORE_URL = "https://glints.com/id/opportunities/jobs/explore?keyword=golang&country=ID&locationName=All+Cities%2FProvinces&yearsOfExperienceRanges=ONE_TO_THREE_YEARS%2CFRESH_GRAD%2CNO_EXPERIENCE%2CLESS_THAN_A_YEAR"
+JOB_CARD_SELECTOR = ".JobCardsc__JobcardContainer-sc-hmqj50-0"
+
+# Jeda antar langkah agar interaksi tidak terlalu cepat; replay memakai 0
+STEP_DELAY_S = float(os.getenv("GLINTS_STEP_DELAY_S", "1"))
+# Waktu tunggu setelah klik "Kirim" agar pengiriman selesai
+SUBMIT_WAIT_S = float(os.getenv("GLINTS_SUBMIT_WAIT_S", "5"))
+
+# Nama dan SHA-256 CV yang terpasang di profil Glints; Glints memakainya lagi untuk job berikutnya (state/ di-ignore git)
+ATTACHED_CV_STATE = os.getenv("GLINTS_ATTACHED_CV", os.path.join("state", "glints_attached_cv.json"))
+
+logger = logging.getLogger(__name__)
+
+
+class RunMode(str, Enum):
+    """How far a run takes each job; every mode but APPLY stages its results in JobRecord."""
+    SCRAPE = "scrape"      # extract the job page
+    CLASSIFY = "classify"  # + LLM job category
+    RENDER = "render"      # + summary and CV PDF
+    APPLY = "apply"        # + upload, submit and save the application
 
-    print(f"Found {count} job cards to process")
-    for i in range(count):
-        print(f"Processing job card {i+1}/{count}")
+
+# Stage a staged run stops at
+MODE_STAGES = {
+    RunMode.SCRAPE: JobRecordStage.SCRAPED,
+    RunMode.CLASSIFY: JobRecordStage.CLASSIFIED,
+    RunMode.RENDER: JobRecordStage.RENDERED,
+}
+
+async def glints_provider(
+    page: Page,
+    writer: Optional[ApplicationWriter] = None,
+    memory_monitor: Optional[BrowserMemoryMonitor] = None,
+    checkpoint: Optional[RunCheckpoint] = None,
+    start_index: int = 0,
+    max_cards: Optional[int] = None,
+    submit: bool = True,
+    mode: RunMode = RunMode.APPLY,
+    budget: Optional[RunBudget] = None,
+) -> Optional[str]:
+    """Apply to Glints jobs listed on the explore page.
+
+    Args:
+        page: Browser page used for the job listing
+        writer: Optional write-behind writer; without it every application is saved immediately
+        memory_monitor: Optional monitor that may replace the page between jobs to cap memory
+        checkpoint: Optional checkpoint that records the next card before each card is processed
+        start_index: Index of the first card to process, e.g. from a checkpoint when resuming
+        max_cards: Stop after this many cards, None for the whole listing
+        submit: False opens the apply form and attaches the CV but neither clicks "Kirim" nor saves
+            the application (used to capture replay bundles)
+        mode: How far to take each job; scrape, classify and render only stage JobRecords and
+            skip jobs already staged that far
+        budget: Optional deadline and daily cap, checked before each card; the job in flight
+            always finishes and the checkpoint points at the first card not started
+
+    Returns:
+        None when the listing was processed, otherwise why the run stopped early
+            ("deadline" or "daily_cap")
+    """
+    target_stage = MODE_STAGES.get(mode)
+    job_card_selector = JOB_CARD_SELECTOR
+    count = await open_job_listing(page)
+
+    logger.info("Found %s job cards to process", count)
+    if start_index:
+        logger.info("Melanjutkan dari job card %s/%s", start_index + 1, count)
+    i = start_index - 1
+    last_card = None if max_cards is None else start_index + max_cards
+    while i + 1 < count and (last_card is None or i + 1 < last_card):
+        i += 1
+        if checkpoint is not None:
+            checkpoint.save(next_card=i, cards=count)
+        if budget is not None:
+            stop_reason = await budget.stop_reason()
+            if stop_reason:
+                logger.info("Batas run tercapai (%s: %s), berhenti sebelum job card %s/%s", stop_reason, budget.describe(), i+1, count)
+                return stop_reason
+        logger.info("Processing job card %s/%s", i+1, count)
         current_job_card = page.locator(job_card_selector).nth(i)
-        
-        print(f"Opening new tab for job card {i+1}")
-        job_page = await new_tab(page, current_job_card)
 
-        await asyncio.sleep(1)
-        try:
-            print("Waiting for job page to load")
+        card_link = await get_card_link(page, current_job_card)
+        with tracer.job(card_link or f"card-{i+1}") as job_span:
+            # Lewati kartu yang link-nya sudah pernah disimpan tanpa membuka tab baru
+            with tracer.stage("dedup_check") as span:
+                if card_link and not await is_link_available(card_link, writer):
+                    span.outcome = job_span.outcome = SKIPPED
+                elif card_link and target_stage and reached(await get_staged_record(card_link), target_stage):
+                    span.outcome = job_span.outcome = SKIPPED
+            if job_span.outcome == SKIPPED:
+                logger.info("Job card %s sudah pernah diproses: %s", i+1, card_link)
+                continue
+
+            applied = await apply_job_card(page, current_job_card, i, writer, job_span, submit=submit, mode=mode)
+            if applied and budget is not None and submit and mode is RunMode.APPLY:
+                budget.record_application()
+
+        if memory_monitor is not None:
+            recycled_page = await memory_monitor.after_job()
+            if recycled_page is not page:
+                # The listing is loaded again on the fresh page; cards already applied to are skipped
+                page = recycled_page
+                count = await open_job_listing(page)
+    return None
+
+
+async def apply_job_card(
+    page: Page,
+    current_job_card: Optional[Locator],
+    i: int,
+    writer: Optional[ApplicationWriter],
+    job_span: Span,
+    submit: bool = True,
+    mode: RunMode = RunMode.APPLY,
+    link: Optional[str] = None,
+) -> bool:
+    """Open one job card in a new tab, apply with a generated CV and save the application.
+
+    Every step runs in a tracer stage; errors are printed and recorded as the job outcome.
+    With submit=False the CV is attached but the form is not sent and nothing is saved.
+    Extraction, classification and the CV are taken from the job's JobRecord when an
+    earlier staged run got that far; modes other than APPLY save the record and stop
+    at their stage. Without a job card, link is opened in a new tab instead (queue workers).
+
+    Returns:
+        False if the job failed with an error, including a queued link that did not open; True otherwise
+
+    Raises:
+        Exception: If no tab could be opened for a job card, which stops the listing run
+    """
+    job_page = None
+    try:
+        with tracer.stage("navigate"):
+            logger.debug("Opening new tab for job card %s", i+1)
+            if current_job_card is not None:
+                job_page = await new_tab(page, current_job_card)
+            else:
+                job_page = await open_link(page, link)
+            await asyncio.sleep(STEP_DELAY_S)
+            logger.debug("Waiting for job page to load")
             await job_page.wait_for_load_state("domcontentloaded", timeout=60000)
-            await asyncio.sleep(1)
-            print(f"Checking if job URL already exists: {job_page.url}")
-            await check_availability(job_page.url)
-            await asyncio.sleep(1)
-            button_apply = "button:has-text('Lamar'):not([disabled])"
+        await asyncio.sleep(STEP_DELAY_S)
+
+        with tracer.stage("dedup_check"):
+            logger.debug("Checking if job URL already exists: %s", job_page.url)
+            await check_availability(job_page.url, writer)
+            record = await get_staged_record(job_page.url)
+        await asyncio.sleep(STEP_DELAY_S)
+        button_apply = "button:has-text('Lamar'):not([disabled])"
 
-            print("Checking if apply button is available")
+        with tracer.stage("extract"):
+            logger.debug("Checking if apply button is available")
             await apply_button_not_disabled(job_page, button_apply)
-            await asyncio.sleep(1)
-
-            job_selector = "h1[aria-label='Job Title'].TopFoldsc__JobOverViewTitle-sc-1fbktg5-3"
-            company_name_selector = "div.AboutCompanySectionsc__Title-sc-c7oevo-6"
-            location_selector = "p.TypographyStyles__StyledTypography-sc-ro16eu-0.bGShET"
-            salary_selector = "span.TopFoldsc__BasicSalary-sc-1fbktg5-13"
-            description_title_selector = "div.JobDescriptionsc__TitleContainer-sc-22zrgx-1.hiYwUK"
-            description_description_selector = "div.JobDescriptionsc__DescriptionContainer-sc-22zrgx-2.btZuDu"
-            
-            print("Getting job role")
-            role = await get_role(job_page, job_selector)
-            await asyncio.sleep(1)
-            print(f"Job role: {role}")
-            
-            print("Getting company name")
-            company_name = await get_company_name(job_page, company_name_selector)
-            await asyncio.sleep(1)
-            print(f"Company name: {company_name}")
-            
-            print("Getting job location")
-            location = await get_location(job_page, location_selector)
-            await asyncio.sleep(1)
-            print(f"Location: {location}")
-            
-            print("Getting minimum salary")
-            salary_min = await get_salary_min(job_page, salary_selector)
-            await asyncio.sleep(1)
-            print(f"Salary minimum: {salary_min}")
-            
-            print("Getting job description")
-            description = await get_description(job_page, description_title_selector, description_description_selector)
-            await asyncio.sleep(1)
-            print(f"Description : {description} ")
-            
-            print("Generating CV")
-            cv_output = await generate_cv(role, description, salary_min)
-            await asyncio.sleep(1)
-            print(f"CV generated at: {cv_output.pdf_path}")
+            await asyncio.sleep(STEP_DELAY_S)
+            if record is None:
+                record = await extract_job_record(job_page)
+            else:
+                logger.debug("Memakai data job yang sudah di-stage (%s)", record.stage.value)
+        await asyncio.sleep(STEP_DELAY_S)
+
+        if mode is not RunMode.SCRAPE:
+            await classify_job(record)
+            if record.stage == JobRecordStage.REJECTED:
+                if mode is not RunMode.APPLY:
+                    await save_staged_record(record)
+                raise ValueError(f"{record.category_reason}")
+
+        if mode in (RunMode.RENDER, RunMode.APPLY):
+            # summarize and render are traced inside generate_cv_pdf
+            logger.debug("Generating CV")
+            cv_output = await render_cv(record)
+            await asyncio.sleep(STEP_DELAY_S)
+            logger.debug("CV generated at: %s", cv_output.pdf_path)
 
-            print("Applying for job")
-            await apply_job(job_page, button_apply, path=cv_output.pdf_path)
-            await asyncio.sleep(1)
-            print("Job application submitted successfully")
+        if mode is not RunMode.APPLY:
+            await save_staged_record(record)
+            job_span.outcome = record.stage.value.lower()
+            logger.info("Job di-stage sebagai %s: %s", record.stage.value, job_page.url)
+            return True
 
-            print("Creating job application record")
+        if not submit:
+            with tracer.stage("upload"):
+                await upload_cv(job_page, button_apply, cv_output.pdf_path)
+            job_span.outcome = "not_submitted"
+            logger.info("CV terpasang tanpa dikirim: %s", job_page.url)
+            return True
+
+        # upload and submit are traced inside apply_job
+        logger.debug("Applying for job")
+        await apply_job(job_page, button_apply, path=cv_output.pdf_path)
+        await asyncio.sleep(STEP_DELAY_S)
+        logger.debug("Job application submitted successfully")
+
+        with tracer.stage("save"):
+            logger.debug("Creating job application record")
             job_application = JobApplication(
                 link=job_page.url,
-                company_name=company_name,
-                role=role,
-                location=location,
-                salary_min=salary_min,
-                description=description,
+                company_name=record.company_name,
+                role=record.role,
+                location=record.location,
+                salary_min=record.salary_min,
+                description=record.description,
                 status=ApplicationStatus.APPLY,
                 cv_summary=cv_output.summary,
             )
 
-            print("Saving job application to database")
-            await save_job_application(job_application)
-            await asyncio.sleep(1)
-            print(f"Berhasil melamar pekerjaan: {job_application.link} dengan role {role} dan gaji minimum {salary_min}")
-        except Exception as e:
-            print(f"Error halaman : {e}")
-            print(f"Error details: {type(e).__name__}")
-        finally:
-            print(f"Closing job page {i+1}")
-            if job_page and not job_page.is_closed():
-                await job_page.close()
-                await asyncio.sleep(1)
-            print(f"Job page {i+1} closed")
-             
-        
+            if writer is not None:
+                logger.debug("Queueing job application record")
+                await writer.add(job_application)
+            else:
+                logger.debug("Saving job application to database")
+                if await save_job_application(job_application):
+                    logger.debug("Job application record saved")
+        await asyncio.sleep(STEP_DELAY_S)
+        logger.info("Berhasil melamar pekerjaan: %s dengan role %s dan gaji minimum %s", job_application.link, record.role, record.salary_min)
+        return True
+    except Exception as e:
+        job_span.outcome = type(e).__name__
+        if job_page is None and current_job_card is not None:
+            # No tab could be opened from the listing: stop the run as before
+            raise
+        # A queued link that does not load fails its job, so the worker marks it and goes on
+        logger.warning("Error halaman (%s): %s", type(e).__name__, e)
+        return False
+    finally:
+        logger.debug("Closing job page %s", i+1)
+        if job_page and not job_page.is_closed():
+            await job_page.close()
+            await asyncio.sleep(STEP_DELAY_S)
+        logger.debug("Job page %s closed", i+1)
+
+async def open_job_listing(page: Page) -> int:
+    """Open the explore page and wait for the job cards; returns the number of cards."""
+    try :
+        await page.goto(GLINTS_EXPLORE_URL,wait_until="domcontentloaded",timeout=60000)
+    except Exception as e:
+        logger.warning("Error saat mengakses URL: %s", e)
+        raise e
+
+    try:
+        # Tunggu elemen yang menunjukkan bahwa halaman telah dimuat sepenuhnya
+        await page.wait_for_selector(JOB_CARD_SELECTOR, timeout=60000)
+    except Exception as e:
+        logger.warning("Error saat menunggu elemen: %s", e)
+        raise e
+
+    return await count_job_card(page, JOB_CARD_SELECTOR)
+
 async def count_job_card(page: Page, job_card_selector: str) -> int:
     try:
         all_job_cards = page.locator(job_card_selector)
         job_card_count = await all_job_cards.count()
         if job_card_count == 0:
-            print("Tidak ada job card ditemukan.")
+            logger.warning("Tidak ada job card ditemukan.")
             raise ValueError("tidak ada")
         else :
             return job_card_count
     except Exception as e:
-        print(f"Error saat menghitung job card: {e}")
+        logger.warning("Error saat menghitung job card: %s", e)
         raise e
 
 async def new_tab(page: Page, Locator: Locator) -> Page:
@@ -149,7 +297,22 @@ async def new_tab(page: Page, Locator: Locator) -> Page:
             new_tab = await new_page_info.value
             return new_tab
     except Exception as e:
-        print(f"Error saat mengakses halaman baru: {e}")
+        logger.warning("Error saat mengakses halaman baru: %s", e)
+        raise e
+
+async def open_link(page: Page, link: str) -> Page:
+    """Open a job link in a new tab of the page's context."""
+    try:
+        job_page = await page.context.new_page()
+    except Exception as e:
+        logger.warning("Error saat membuka tab baru: %s", e)
+        raise e
+    try:
+        await job_page.goto(link, wait_until="domcontentloaded", timeout=60000)
+        return job_page
+    except Exception as e:
+        logger.warning("Error saat membuka link %s: %s", link, e)
+        await job_page.close()
         raise e
 
 async def get_role(page : Page, selector: str) -> str:
@@ -159,7 +322,7 @@ async def get_role(page : Page, selector: str) -> str:
         role = await title_container.inner_text()
         return role.strip()
     except Exception as e:
-        print(f"Error saat mendapatkan role: {e}")
+        logger.warning("Error saat mendapatkan role: %s", e)
         raise e
 
 async def get_company_name(page: Page, selector: str) -> str:
@@ -169,7 +332,7 @@ async def get_company_name(page: Page, selector: str) -> str:
         company_name = await company_name_container.inner_text()
         return company_name.strip()
     except Exception as e:
-        print(f"Error saat mendapatkan nama perusahaan: {e}")
+        logger.warning("Error saat mendapatkan nama perusahaan: %s", e)
         raise e
 
 async def get_location(page: Page, selector: str) -> str:
@@ -179,7 +342,7 @@ async def get_location(page: Page, selector: str) -> str:
         location = await location_container.inner_text()
         return location.strip()
     except Exception as e:
-        print(f"Error saat mendapatkan lokasi: {e}")
+        logger.warning("Error saat mendapatkan lokasi: %s", e)
         raise e
     
 async def get_salary_min(page: Page, selector: str) -> int:
@@ -215,109 +378,272 @@ async def get_description(page: Page, title_selector: str, description_selector:
         
         return f"{title}\n{description}"
     except Exception as e:
-        print(f"Error saat mendapatkan deskripsi: {e}")
+        logger.warning("Error saat mendapatkan deskripsi: %s", e)
         raise e
 
-async def generate_cv(role:str,vacancy:str,min_salary:int) -> Output:
+async def extract_job_record(job_page: Page) -> JobRecord:
+    """Read role, company, location, salary and description from an open job page."""
+    job_selector = "h1[aria-label='Job Title'].TopFoldsc__JobOverViewTitle-sc-1fbktg5-3"
+    company_name_selector = "div.AboutCompanySectionsc__Title-sc-c7oevo-6"
+    location_selector = "p.TypographyStyles__StyledTypography-sc-ro16eu-0.bGShET"
+    salary_selector = "span.TopFoldsc__BasicSalary-sc-1fbktg5-13"
+    description_title_selector = "div.JobDescriptionsc__TitleContainer-sc-22zrgx-1.hiYwUK"
+    description_description_selector = "div.JobDescriptionsc__DescriptionContainer-sc-22zrgx-2.btZuDu"
+
+    logger.debug("Getting job role")
+    role = await get_role(job_page, job_selector)
+    await asyncio.sleep(STEP_DELAY_S)
+    logger.debug("Job role: %s", role)
+
+    logger.debug("Getting company name")
+    company_name = await get_company_name(job_page, company_name_selector)
+    await asyncio.sleep(STEP_DELAY_S)
+    logger.debug("Company name: %s", company_name)
+
+    logger.debug("Getting job location")
+    location = await get_location(job_page, location_selector)
+    await asyncio.sleep(STEP_DELAY_S)
+    logger.debug("Location: %s", location)
+
+    logger.debug("Getting minimum salary")
+    salary_min = await get_salary_min(job_page, salary_selector)
+    await asyncio.sleep(STEP_DELAY_S)
+    logger.debug("Salary minimum: %s", salary_min)
+
+    logger.debug("Getting job description")
+    description = await get_description(job_page, description_title_selector, description_description_selector)
+    logger.debug("Description : %s", description)
+
+    return JobRecord(
+        link=job_page.url,
+        role=role,
+        company_name=company_name,
+        location=location,
+        salary_min=salary_min,
+        description=description,
+    )
+
+async def classify_job(record: JobRecord) -> None:
+    """Classify the job with the LLM unless the record already has a category; sets the record's stage."""
+    if record.job_category is not None:
+        return
+    try:
+        with tracer.stage("classify") as span:
+            result_role = await generate_role(role=record.role,vacancy=record.description,min_salary=record.salary_min or 0)
+            if result_role.job_category == JobCategoryAi.NONE:
+                span.outcome = "rejected"
+    except Exception as e:
+        logger.warning("Error saat mengklasifikasi job: %s", e)
+        raise e
+    record.job_category = result_role.job_category.value
+    record.category_reason = result_role.reason
+    record.stage = JobRecordStage.REJECTED if result_role.job_category == JobCategoryAi.NONE else JobRecordStage.CLASSIFIED
+
+async def render_cv(record: JobRecord) -> Output:
+    """Render the CV for a classified record, or reuse the PDF of an earlier render that still exists.
+
+    A record rendered before whose PDF is gone is rendered again from its
+    stored summary, without calling the summary LLM again.
+    """
+    if record.cv_path and os.path.exists(record.cv_path):
+        logger.debug("Memakai CV yang sudah dibuat: %s", record.cv_path)
+        return Output(pdf_path=record.cv_path, summary=record.cv_summary or "")
+    if record.cv_summary:
+        logger.debug("CV %s tidak ada lagi, dibuat ulang dari ringkasan tersimpan", record.cv_path)
+
+    # CV job lain yang di-stage dan belum dilamar tidak boleh ikut terhapus
+    async with async_session_factory() as session:
+        staged_paths = await staged_cv_paths_async(session)
+
+    # reportlab dimuat saat CV pertama dibuat, bukan saat modul diimpor
+    from generate_cv.pdf_generator import generate_cv_pdf,JobCategory
+
     try:
-        result_role = await generate_role(role=role,vacancy=vacancy,min_salary=min_salary)
-        if result_role.job_category == JobCategoryAi.NONE:
-            raise ValueError(f"{result_role.reason}")
-        
         # Map JobCategoryAi to JobCategory using a dictionary
         category_mapping = {
             JobCategoryAi.BACKEND: JobCategory.BACKEND,
             JobCategoryAi.FRONTEND: JobCategory.FRONTEND,
         }
-                
+
         # Get appropriate JobCategory or default to FULLSTACK if category not found
-        role_cv = category_mapping.get(result_role.job_category,JobCategory.FULLSTACK)
+        role_cv = category_mapping.get(JobCategoryAi(record.job_category),JobCategory.FULLSTACK)
 
-        output = generate_cv_pdf(vacancy=vacancy,roles=role_cv)
-        
-        return output
+        output = generate_cv_pdf(
+            vacancy=record.description,
+            roles=role_cv,
+            summary=record.cv_summary or None,
+            keep_paths=staged_paths,
+        )
     except Exception as e:
-        print(f"Error saat menghasilkan CV: {e}")
+        logger.warning("Error saat menghasilkan CV: %s", e)
         raise e
+    record.cv_path = output.pdf_path
+    record.cv_summary = output.summary
+    record.stage = JobRecordStage.RENDERED
+    return output
 
 async def apply_button_not_disabled(page: Page, selector: str) -> None:
     try:
         apply_button = page.locator(selector)
         await apply_button.first.wait_for(state="visible", timeout=15000)
     except Exception as e:
-        print(f"Error saat memeriksa tombol apply: {e}")
+        logger.warning("Error saat memeriksa tombol apply: %s", e)
         raise e
     
 async def apply_job(page: Page, selector: str,path: str) -> None:
     try:
-        apply_button = page.locator(selector)
-        await apply_button.first.wait_for(state="visible", timeout=5000)
-        await apply_button.first.click(timeout=5000)
-        
-        file_input_locator = page.locator('input[type="file"].HiddenFileInputsc__FileInput-sc-hz4dcq-0')
-        # Tombol "Hapus file"
-        delete_button_locator = page.locator('button.ResumeFieldsc__DeleteButton-sc-yk9awg-6:has-text("Hapus file")')
-        # Tombol "Upload CV-mu"
-        upload_cv_button_locator = page.locator('button.ResumeFieldsc__UploadResumeButton-sc-yk9awg-2:has-text("Upload CV-mu")')
-        # Container detail file yang sudah diupload
-        resume_detail_container_locator = page.locator('div.ResumeFieldsc__EditResumeContainer-sc-yk9awg-3')
-        
-        # Kita beri sedikit waktu jika elemen butuh waktu untuk muncul
-        try:
-            await delete_button_locator.wait_for(state="visible", timeout=5000) # Tunggu hingga 5 detik
-            print("File terdeteksi (tombol 'Hapus file' terlihat).")
-            is_file_present = True
-        except Exception: # TimeoutException jika tidak ditemukan
-            print("Tidak ada file yang terdeteksi (tombol 'Hapus file' tidak terlihat).")
-            is_file_present = False
-        
+        with tracer.stage("upload"):
+            await upload_cv(page, selector, path)
+        with tracer.stage("submit"):
+            # Locate and click the "Kirim" (Send) button
+            kirim_button_locator = page.locator('button:has-text("Kirim")')
+            await expect(kirim_button_locator).to_be_visible(timeout=10000)
+            await kirim_button_locator.click(timeout=5000)
+            await asyncio.sleep(SUBMIT_WAIT_S)  # Tunggu beberapa detik untuk memastikan pengiriman selesai
+    except Exception as e:
+        logger.warning("Error saat mengklik tombol apply: %s", e)
+        raise e
+
+def load_attached_cv() -> Dict[str, str]:
+    """Name and SHA-256 of the CV last attached to the Glints profile ({"name", "sha256"}), {} if unknown."""
+    try:
+        with open(ATTACHED_CV_STATE, "r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_attached_cv(name: str, sha256: str) -> None:
+    """Remember the CV attached to the Glints profile; shared by every run and worker on this host."""
+    directory = os.path.dirname(ATTACHED_CV_STATE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{ATTACHED_CV_STATE}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as state_file:
+        json.dump({"name": name, "sha256": sha256}, state_file)
+    os.replace(temporary_path, ATTACHED_CV_STATE)
+
+async def upload_cv(page: Page, selector: str, path: str) -> None:
+    """Open the apply form and attach the CV at path, unless the same file is already attached.
+
+    The file is uploaded under its name without the content hash, which is the name
+    recruiters see. Glints only shows that name, so an attached CV counts as the same
+    file if it has the name and its hash matches the one saved in ATTACHED_CV_STATE
+    by the last upload. That state survives restarts, but CVs whose summary is
+    tailored to each vacancy differ per job and are uploaded every time.
+    """
+    # reportlab dimuat saat CV pertama dibuat, bukan saat modul diimpor
+    from generate_cv.pdf_generator import display_file_name
+
+    apply_button = page.locator(selector)
+    await apply_button.first.wait_for(state="visible", timeout=5000)
+    await apply_button.first.click(timeout=5000)
+    
+    file_input_locator = page.locator('input[type="file"].HiddenFileInputsc__FileInput-sc-hz4dcq-0')
+    # Tombol "Hapus file"
+    delete_button_locator = page.locator('button.ResumeFieldsc__DeleteButton-sc-yk9awg-6:has-text("Hapus file")')
+    # Tombol "Upload CV-mu"
+    upload_cv_button_locator = page.locator('button.ResumeFieldsc__UploadResumeButton-sc-yk9awg-2:has-text("Upload CV-mu")')
+    # Container detail file yang sudah diupload
+    resume_detail_container_locator = page.locator('div.ResumeFieldsc__EditResumeContainer-sc-yk9awg-3')
+    
+    # Nama file resume yang sedang terpasang
+    attached_file_name_locator = resume_detail_container_locator.locator('p.ResumeFieldsc__ResumeFileName-sc-yk9awg-8')
+
+    uploaded_file_name = display_file_name(path)
+    with open(path, "rb") as cv_file:
+        cv_bytes = cv_file.read()
+    cv_sha256 = hashlib.sha256(cv_bytes).hexdigest()
+
+    # Cek langsung state field resume: tunggu sampai salah satu state muncul
+    # (file terpasang atau tombol upload), bukan menunggu 5 detik untuk tombol hapus
+    try:
+        await upload_cv_button_locator.or_(resume_detail_container_locator).first.wait_for(state="visible", timeout=5000)
+    except Exception: # TimeoutException jika field resume belum muncul, lanjut upload seperti biasa
+        logger.debug("Field resume belum terlihat.")
+    is_file_present = await delete_button_locator.is_visible()
+
+    attached_file_name = ""
+    if is_file_present:
+        attached_file_name = (await attached_file_name_locator.first.inner_text()).strip()
+        logger.debug("File terdeteksi: '%s'.", attached_file_name)
+    else:
+        logger.debug("Tidak ada file yang terdeteksi (tombol 'Hapus file' tidak terlihat).")
+
+    # Nama yang sama belum tentu isi yang sama; bandingkan juga dengan hash CV terakhir yang diupload
+    attached_cv = load_attached_cv()
+    if (
+        is_file_present
+        and attached_file_name == uploaded_file_name
+        and attached_cv.get("name") == uploaded_file_name
+        and attached_cv.get("sha256") == cv_sha256
+    ):
+        logger.debug("CV yang sama sudah terpasang, lewati upload ulang.")
+    else:
         if is_file_present:
-            # Jika file sudah ada, kita hapus dulu
+            # Jika file lain sudah ada, kita hapus dulu
             await delete_button_locator.click(timeout=5000)
             # Tunggu hingga tombol "Upload CV-mu" terlihat
             await upload_cv_button_locator.wait_for(state="visible", timeout=5000)
 
-        await file_input_locator.set_input_files(path)
-
-        uploaded_file_name = os.path.basename(path)
-
+        await file_input_locator.set_input_files({"name": uploaded_file_name, "mimeType": "application/pdf", "buffer": cv_bytes})
 
         await expect(resume_detail_container_locator).to_be_visible(timeout=15000) # Waktu lebih lama untuk proses upload
 
         uploaded_file_name_locator = resume_detail_container_locator.locator(f'p.ResumeFieldsc__ResumeFileName-sc-yk9awg-8:has-text("{uploaded_file_name}")')
         # Tunggu hingga nama file yang diupload terlihat di dalam container
         await expect(uploaded_file_name_locator).to_be_visible(timeout=10000)
-        # Locate and click the "Kirim" (Send) button
-        kirim_button_locator = page.locator('button:has-text("Kirim")')
-        await expect(kirim_button_locator).to_be_visible(timeout=10000)
-        await kirim_button_locator.click(timeout=5000)
-        await asyncio.sleep(5)  # Tunggu beberapa detik untuk memastikan pengiriman selesai
-    except Exception as e:
-        print(f"Error saat mengklik tombol apply: {e}")
-        raise e
+        save_attached_cv(uploaded_file_name, cv_sha256)
 
-async def check_availability(link: str) -> None:
+async def get_card_link(page: Page, job_card: Locator) -> Optional[str]:
+    """Ambil URL lowongan dari kartu tanpa membuka tab; None jika tidak ditemukan."""
     try:
-        print(f"Memeriksa ketersediaan link: {link}")
-        with Session(engine) as session:
-            print(f"Memeriksa ketersediaan link di database: {link}")
-            if check_link_availability(session, link):
-                print(f"Link dapat digunakan")
-                return
-            else:
-                raise ValueError(f"Link '{link}' sudah ada di database. Tidak menyimpan.")
+        href = await job_card.locator("a[href*='/opportunities/jobs/']").first.get_attribute("href", timeout=1000)
+    except Exception:
+        return None
+    if not href:
+        return None
+    return urljoin(page.url, href)
+
+async def is_link_available(link: str, writer: Optional[ApplicationWriter] = None) -> bool:
+    if writer is not None and writer.is_pending(link):
+        return False
+    # Index di memori: hasil negatif pasti benar, SQL hanya untuk kemungkinan cocok
+    if not seen_links.might_contain(link):
+        return True
+    async with async_session_factory() as session:
+        logger.debug("Memeriksa ketersediaan link di database: %s", link)
+        return await check_link_availability_async(session, link)
+
+async def check_availability(link: str, writer: Optional[ApplicationWriter] = None) -> None:
+    try:
+        logger.debug("Memeriksa ketersediaan link: %s", link)
+        if await is_link_available(link, writer):
+            logger.debug("Link dapat digunakan")
+            return
+        else:
+            raise ValueError(f"Link '{link}' sudah ada di database. Tidak menyimpan.")
     except Exception as e:
-        print(f"Error saat memeriksa ketersediaan link: {e}")
+        logger.debug("Error saat memeriksa ketersediaan link: %s", e)
         raise e
 
-async def save_job_application(job_application: JobApplication) -> None:
+async def save_job_application(job_application: JobApplication) -> bool:
     try:
-        with Session(engine) as session:
-            # Cek ketersediaan link sebelum menyimpan
-            if check_link_availability(session, job_application.link):
-                create_job_application(session, job_application)
-            else:
-                raise ValueError(f"Link '{job_application.link}' sudah ada di database. Tidak menyimpan.")
+        async with async_session_factory() as session:
+            # Satu statement INSERT ... ON CONFLICT DO NOTHING; duplikat tidak menimbulkan error
+            inserted = await insert_job_application_if_absent_async(session, job_application)
+            if not inserted:
+                logger.info("Link '%s' sudah ada di database. Tidak menyimpan.", job_application.link)
+            return inserted
     except Exception as e:
-        print(f"Error menyimpan JobApplication ke database: {e}")
-        raise e
\ No newline at end of file
+        logger.error("Error menyimpan JobApplication ke database: %s", e)
+        raise e
+
+async def get_staged_record(link: str) -> Optional[JobRecord]:
+    """The JobRecord staged for the link's job, None if no staged run reached it."""
+    async with async_session_factory() as session:
+        return await get_job_record_async(session, link)
+
+async def save_staged_record(record: JobRecord) -> None:
+    with tracer.stage("stage"):
+        async with async_session_factory() as session:
+            await save_job_record_async(session, record)
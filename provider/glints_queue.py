@@ -0,0 +1,163 @@
+"""
+    Glints discovery and queue workers (see db/queue.py)
+"""
+
+from patchright.async_api import Page
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime
+from typing import Awaitable, Optional
+from db.database import async_session_factory
+from db.models import QueueStatus
+from db.queue import (
+    QUEUE_LEASE_S,
+    claim_job_async,
+    enqueue_links_async,
+    fail_abandoned_jobs_async,
+    finish_job_async,
+    renew_lease_async,
+)
+from browser.memory import BrowserMemoryMonitor
+from provider.budget import RunBudget
+from provider.glints import JOB_CARD_SELECTOR, RunMode, apply_job_card, get_card_link, is_link_available, open_job_listing
+from telemetry.tracing import tracer
+
+# Jeda sebelum worker --follow memeriksa antrean kosong lagi
+QUEUE_POLL_S = float(os.getenv("QUEUE_POLL_S", "30"))
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id() -> str:
+    """Id stored with a worker's claims: host name and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def glints_discover(page: Page, budget: Optional[RunBudget] = None, mode: RunMode = RunMode.APPLY) -> int:
+    """Enqueue the links of the explore page's job cards that were not applied to yet.
+
+    Reading the cards stops at the budget's deadline; the links read so far are enqueued.
+    The jobs go to the queue of mode, for workers started with the same mode.
+
+    Returns:
+        Number of jobs added to the queue
+    """
+    count = await open_job_listing(page)
+    logger.info("Found %s job cards to enqueue", count)
+    links = []
+    for i in range(count):
+        if budget is not None and budget.deadline is not None and datetime.now() >= budget.deadline:
+            logger.info("Deadline tercapai, berhenti membaca job card di %s/%s", i+1, count)
+            break
+        card_link = await get_card_link(page, page.locator(JOB_CARD_SELECTOR).nth(i))
+        if card_link is None:
+            logger.debug("Job card %s tidak punya link, dilewati", i+1)
+        elif await is_link_available(card_link):
+            links.append(card_link)
+    async with async_session_factory() as session:
+        added = await enqueue_links_async(session, links, mode.value)
+    logger.info("%s job baru dimasukkan ke antrean %s (%s link belum dilamar)", added, mode.value, len(links))
+    return added
+
+
+async def glints_worker(
+    page: Page,
+    worker: Optional[str] = None,
+    memory_monitor: Optional[BrowserMemoryMonitor] = None,
+    mode: RunMode = RunMode.APPLY,
+    follow: bool = False,
+    max_jobs: Optional[int] = None,
+    lease_s: float = QUEUE_LEASE_S,
+    budget: Optional[RunBudget] = None,
+) -> int:
+    """Claim jobs from the queue and process them until it is empty.
+
+    Applications are saved immediately (no write-behind), so the link check of every
+    other worker sees them.
+
+    Args:
+        page: Browser page; each job is opened in a new tab of its context
+        worker: Worker id stored with the claims, host:pid by default
+        memory_monitor: Optional monitor that may replace the page between jobs to cap memory
+        mode: How far to take each job, as for glints_provider; only jobs enqueued for it are claimed
+        follow: Wait for new jobs when the queue is empty instead of returning
+        max_jobs: Stop after this many jobs, None for no limit
+        lease_s: Lease of a claim; it is renewed every third of it while the job runs
+        budget: Optional deadline and daily cap, checked before each claim; the daily count
+            is read from the database each time, so it includes the other workers, but not
+            their jobs in flight: with N workers the cap can be exceeded by up to N - 1
+
+    Returns:
+        Number of jobs processed
+    """
+    worker = worker or worker_id()
+    processed = 0
+    logger.info("Worker %s mulai (mode %s)", worker, mode.value)
+    while max_jobs is None or processed < max_jobs:
+        if budget is not None:
+            await budget.load()
+            stop_reason = await budget.stop_reason()
+            if stop_reason:
+                logger.info("Batas run tercapai (%s: %s), worker berhenti", stop_reason, budget.describe())
+                break
+        async with async_session_factory() as session:
+            job = await claim_job_async(session, worker, lease_s, mode.value)
+            if job is None:
+                abandoned = await fail_abandoned_jobs_async(session)
+                if abandoned:
+                    logger.warning("%s job ditandai gagal karena lease-nya habis terlalu sering", abandoned)
+        if job is None:
+            if not follow:
+                break
+            await asyncio.sleep(QUEUE_POLL_S)
+            continue
+
+        processed += 1
+        logger.info("Worker %s memproses job %s (percobaan %s): %s", worker, job.id, job.attempts, job.link)
+        with tracer.job(job.link) as job_span:
+            succeeded = await run_with_lease(
+                apply_job_card(page, None, processed - 1, None, job_span, mode=mode, link=job.link),
+                job.id,
+                worker,
+                lease_s,
+            )
+            if succeeded is None:
+                job_span.outcome = "lease_lost"
+        if succeeded is not None:
+            async with async_session_factory() as session:
+                status = QueueStatus.DONE if succeeded else QueueStatus.FAILED
+                if not await finish_job_async(session, job.id, worker, status, job_span.outcome):
+                    logger.warning("Job %s sudah diambil worker lain", job.id)
+
+        if memory_monitor is not None:
+            page = await memory_monitor.after_job()
+    logger.info("Worker %s selesai: %s job diproses", worker, processed)
+    return processed
+
+
+async def run_with_lease(job: Awaitable[bool], job_id: int, worker: str, lease_s: float) -> Optional[bool]:
+    """Await job while renewing the claim on job_id.
+
+    Returns:
+        The job's result, or None if the claim was lost (the job is then cancelled)
+    """
+    task = asyncio.ensure_future(job)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=lease_s / 3)
+            if done:
+                return task.result()
+            async with async_session_factory() as session:
+                renewed = await renew_lease_async(session, job_id, worker, lease_s)
+            if not renewed:
+                logger.warning("Lease job %s hilang, job dibatalkan", job_id)
+                return None
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
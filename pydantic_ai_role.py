@@ -1,15 +1,17 @@
+import logging
+import os
 from enum import Enum
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from openai import AsyncOpenAI
-from pydantic_ai.providers.openai import OpenAIProvider
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from pydantic import BaseModel, Field
 
-# Inisialisasi klien OpenAI
-client = AsyncOpenAI(
-    base_url="http://localhost:4000",
-    api_key="sk-1234" # Ganti dengan API key yang valid jika diperlukan oleh server lokal Anda
-)
+if TYPE_CHECKING:
+    from pydantic_ai.models.openai import OpenAIModel
+
+logger = logging.getLogger(__name__)
+
+# "openai" (default) atau "stub" untuk klasifikasi deterministik tanpa jaringan (replay/benchmark)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
 
 class JobCategoryAi(Enum):
     BACKEND = "backend"
@@ -21,17 +23,30 @@ class RoleJob(BaseModel):
     job_category: JobCategoryAi = Field(..., alias="JobCategory")
     reason: str
 
-# Inisialisasi model OpenAI
-model = OpenAIModel(
-    'gpt-4o-mini', # Atau model lain yang tersedia di server lokal Anda
-    provider=OpenAIProvider(openai_client=client)
-)
+@lru_cache(maxsize=None)
+def get_model() -> "OpenAIModel":
+    """Model OpenAI, dibuat saat pertama kali dipakai agar import modul ini tetap ringan."""
+    from openai import AsyncOpenAI
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    # Inisialisasi klien OpenAI
+    client = AsyncOpenAI(
+        base_url="http://localhost:4000",
+        api_key="sk-1234" # Ganti dengan API key yang valid jika diperlukan oleh server lokal Anda
+    )
+    return OpenAIModel(
+        'gpt-4o-mini', # Atau model lain yang tersedia di server lokal Anda
+        provider=OpenAIProvider(openai_client=client)
+    )
 
 async def _generate_role_internal(role: str, vacancy: str, min_salary: int) -> RoleJob:
     """Fungsi async internal untuk generasi peran (sekarang tidak banyak berubah dari sebelumnya,
        karena ini sudah async)"""
+    from pydantic_ai import Agent
+
     agent = Agent(
-        model,
+        get_model(),
         output_type=RoleJob,
         instructions="""
         Anda adalah asisten kategorisasi pekerjaan. Berdasarkan peran, deskripsi lowongan, dan gaji minimum, klasifikasikan pekerjaan tersebut.
@@ -62,7 +77,7 @@ async def _generate_role_internal(role: str, vacancy: str, min_salary: int) -> R
         """
     )
     prompt_text = f"Tentukan kategori pekerjaan untuk peran: '{role}' dengan deskripsi lowongan: '{vacancy}'. Gaji minimum yang ditawarkan adalah {min_salary}."
-    # print(f"DEBUG: Mengirim prompt ke LLM: {prompt_text}")
+    logger.debug("Mengirim prompt ke LLM: %s", prompt_text)
     result = await agent.run(prompt_text)
     return result.output
 
@@ -80,10 +95,14 @@ async def generate_role(role: str, vacancy: str, min_salary: int) -> RoleJob:
         Objek RoleJob dengan kategori dan alasan.
     """
     try:
+        if LLM_BACKEND == "stub":
+            from replay.llm_stub import stub_role
+
+            return await stub_role(role, vacancy, min_salary)
         # Langsung menggunakan await untuk memanggil fungsi async internal
         result = await _generate_role_internal(role, vacancy, min_salary)
         return result
     except Exception as e:
-        print(f"Error saat generate role: {e}")
+        logger.error("Error saat generate role: %s", e)
         # Mengembalikan nilai default jika terjadi error
         raise ValueError("Gagal menghasilkan kategori pekerjaan") from e
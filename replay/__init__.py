@@ -0,0 +1,3 @@
+from .bundle import ReplayBundle
+from .capture import HarRecorder
+from .server import ReplayServer
@@ -0,0 +1,101 @@
+"""A recorded HAR bundle, indexed for replay.
+
+Requests are matched on method, URL and body. GraphQL POSTs are keyed by
+their operationName and variables rather than the raw body, so fields that
+change between runs (trace ids, timestamps) do not break a match, and a
+second tier matches on the operationName alone. When a request was recorded
+several times its responses are served in order, repeating the last one.
+"""
+
+import base64
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+RequestKey = Tuple[str, str, str]
+
+
+def _operation(post_data: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The GraphQL operation of a JSON POST body, None for anything else."""
+    if not post_data:
+        return None
+    try:
+        body = json.loads(post_data)
+    except ValueError:
+        return None
+    if isinstance(body, dict) and body.get("operationName"):
+        return body
+    return None
+
+
+def request_key(method: str, url: str, post_data: Optional[str] = None) -> RequestKey:
+    """Exact key of a request: method, URL without fragment, and a digest of the body."""
+    url = urldefrag(url)[0]
+    operation = _operation(post_data)
+    if operation is not None:
+        body = json.dumps({"operationName": operation["operationName"], "variables": operation.get("variables")}, sort_keys=True)
+    else:
+        body = post_data or ""
+    return method.upper(), url, hashlib.sha1(body.encode("utf-8")).hexdigest() if body else ""
+
+
+def loose_key(method: str, url: str, post_data: Optional[str] = None) -> Optional[RequestKey]:
+    """Fallback key for GraphQL POSTs: the operation name without its variables."""
+    operation = _operation(post_data)
+    if operation is None:
+        return None
+    return method.upper(), urldefrag(url)[0], f"op:{operation['operationName']}"
+
+
+class RecordedResponse:
+    """Status, headers and decoded body of one recorded response."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def from_har(cls, response: Dict[str, Any]) -> "RecordedResponse":
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {header["name"].lower(): header["value"] for header in response.get("headers", [])}
+        return cls(response.get("status", 200), headers, body)
+
+
+class ReplayBundle:
+    """Responses of a HAR file, looked up by request."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self._responses: Dict[RequestKey, List[RecordedResponse]] = defaultdict(list)
+        self._loose: Dict[RequestKey, List[RecordedResponse]] = defaultdict(list)
+        self._served: Dict[RequestKey, int] = defaultdict(int)
+        for entry in entries:
+            request = entry["request"]
+            post_data = request.get("postData", {}).get("text")
+            response = RecordedResponse.from_har(entry["response"])
+            self._responses[request_key(request["method"], request["url"], post_data)].append(response)
+            loose = loose_key(request["method"], request["url"], post_data)
+            if loose is not None:
+                self._loose[loose].append(response)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayBundle":
+        with open(path, "r", encoding="utf-8") as har_file:
+            return cls(json.load(har_file)["log"]["entries"])
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def lookup(self, method: str, url: str, post_data: Optional[str] = None) -> Optional[RecordedResponse]:
+        """The next recorded response for a request, None if it was never recorded."""
+        for key, index in ((request_key(method, url, post_data), self._responses), (loose_key(method, url, post_data), self._loose)):
+            responses = index.get(key) if key is not None else None
+            if responses:
+                served = self._served[key]
+                self._served[key] += 1
+                return responses[min(served, len(responses) - 1)]
+        return None
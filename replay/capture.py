@@ -0,0 +1,105 @@
+"""Records the traffic of a browser context into a HAR file.
+
+Playwright can record HAR itself, but only for contexts it creates and only
+when the context is closed. A run attached to the browser daemon never
+closes the context, so responses are collected from requestfinished events
+instead and written by save(). Bodies are embedded (base64 for binary
+content) so the bundle replays without network access.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Set
+
+if TYPE_CHECKING:
+    from patchright.async_api import BrowserContext, Request
+
+logger = logging.getLogger(__name__)
+
+# Text bodies are stored as-is, everything else base64 encoded
+TEXT_MIME_PREFIXES = ("text/", "application/json", "application/javascript", "application/graphql", "image/svg+xml")
+# The session must not end up in a bundle; replay never needs it
+SENSITIVE_HEADERS = {"cookie", "set-cookie", "authorization"}
+
+
+def _headers(headers: Dict[str, str]) -> List[Dict[str, str]]:
+    return [{"name": name, "value": value} for name, value in headers.items() if name.lower() not in SENSITIVE_HEADERS]
+
+
+class HarRecorder:
+    """Collects every finished HTTP(S) request of a context."""
+
+    def __init__(self, context: "BrowserContext"):
+        self.context = context
+        self.entries: List[Dict[str, Any]] = []
+        self._pending: Set[asyncio.Task] = set()
+
+    def start(self) -> "HarRecorder":
+        self.context.on("requestfinished", self._on_request_finished)
+        return self
+
+    def _on_request_finished(self, request: "Request") -> None:
+        if not request.url.startswith("http"):
+            return
+        task = asyncio.create_task(self._record(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record(self, request: "Request") -> None:
+        response = await request.response()
+        if response is None:
+            return
+        try:
+            body = await response.body()
+        except Exception:
+            # Redirects and evicted resources have no body
+            body = b""
+        mime_type = response.headers.get("content-type", "")
+        if mime_type.startswith(TEXT_MIME_PREFIXES):
+            content = {"size": len(body), "mimeType": mime_type, "text": body.decode("utf-8", errors="replace")}
+        else:
+            content = {"size": len(body), "mimeType": mime_type, "text": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+        entry: Dict[str, Any] = {
+            "startedDateTime": datetime.utcnow().isoformat() + "Z",
+            "time": 0,
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "httpVersion": "HTTP/1.1",
+                "headers": _headers(request.headers),
+                "queryString": [],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(request.post_data or ""),
+            },
+            "response": {
+                "status": response.status,
+                "statusText": response.status_text,
+                "httpVersion": "HTTP/1.1",
+                "headers": _headers(response.headers),
+                "cookies": [],
+                "content": content,
+                "redirectURL": response.headers.get("location", ""),
+                "headersSize": -1,
+                "bodySize": len(body),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": 0, "receive": 0},
+        }
+        if request.post_data is not None:
+            entry["request"]["postData"] = {"mimeType": request.headers.get("content-type", ""), "text": request.post_data}
+        self.entries.append(entry)
+
+    async def save(self, path: str) -> int:
+        """Wait for the bodies still being read and write the HAR file; returns the number of entries."""
+        self.context.remove_listener("requestfinished", self._on_request_finished)
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        har = {"log": {"version": "1.2", "creator": {"name": "replay.capture", "version": "1.0"}, "pages": [], "entries": self.entries}}
+        with open(path, "w", encoding="utf-8") as har_file:
+            json.dump(har, har_file)
+        logger.info("Bundle disimpan: %s (%s request)", path, len(self.entries))
+        return len(self.entries)
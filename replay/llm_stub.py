@@ -0,0 +1,49 @@
+"""Deterministic stand-ins for the LLM calls, used when LLM_BACKEND=stub.
+
+The classification follows the simplest rules of the real prompt (keywords
+and the salary floor), and the summary only depends on the vacancy title.
+The generated CVs are therefore byte-identical between the capture and the
+replay of a bundle, so the upload matches the recorded one.
+"""
+
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Simulated latency of each LLM call
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "0"))
+
+FRONTEND_KEYWORDS = ("frontend", "front end", "front-end", "react", "vue", "angular")
+FULLSTACK_KEYWORDS = ("fullstack", "full stack", "full-stack")
+# Same floor as the classification prompt; 0 means not stated
+MINIMUM_SALARY = 4_000_000
+
+
+async def stub_role(role: str, vacancy: str, min_salary: int):
+    """Classify a job without an LLM."""
+    from pydantic_ai_role import JobCategoryAi, RoleJob
+
+    if LLM_STUB_LATENCY_MS:
+        await asyncio.sleep(LLM_STUB_LATENCY_MS / 1000)
+    text = f"{role}\n{vacancy}".lower()
+    if 0 < min_salary < MINIMUM_SALARY:
+        category, reason = JobCategoryAi.NONE, "stub: salary below the minimum"
+    elif any(keyword in text for keyword in FULLSTACK_KEYWORDS):
+        category, reason = JobCategoryAi.FULLSTACK, "stub: fullstack keyword"
+    elif any(keyword in text for keyword in FRONTEND_KEYWORDS):
+        category, reason = JobCategoryAi.FRONTEND, "stub: frontend keyword"
+    else:
+        category, reason = JobCategoryAi.BACKEND, "stub: default"
+    return RoleJob(JobCategory=category, reason=reason)
+
+
+def stub_summary(cv, vacancy: str) -> str:
+    """A fixed summary that names the vacancy title (its first line)."""
+    if LLM_STUB_LATENCY_MS:
+        time.sleep(LLM_STUB_LATENCY_MS / 1000)
+    title = vacancy.strip().splitlines()[0] if vacancy.strip() else "this role"
+    return f"Junior software developer with hands-on project experience, applying for {title}."
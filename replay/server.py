@@ -0,0 +1,51 @@
+"""Serves a recorded bundle to the browser.
+
+ReplayServer answers every request of a browser context from a ReplayBundle
+through Playwright request routing, so the pages keep their real
+https://glints.com URLs and no proxy or certificate is needed. Requests that
+were not recorded are answered locally too, and nothing leaves the machine:
+GETs get a 404, and other methods (the "Kirim" submission) get an empty
+JSON 200.
+"""
+
+import logging
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from .bundle import ReplayBundle
+
+if TYPE_CHECKING:
+    from patchright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+# Recomputed by the browser for the decoded body
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class ReplayServer:
+    """Fulfills the requests of a context from a bundle and counts hits and misses."""
+
+    def __init__(self, bundle: ReplayBundle):
+        self.bundle = bundle
+        self.stats: Counter = Counter()
+
+    async def install(self, context: "BrowserContext") -> "ReplayServer":
+        await context.route("**/*", self._handle)
+        return self
+
+    async def _handle(self, route: "Route") -> None:
+        request = route.request
+        recorded = self.bundle.lookup(request.method, request.url, request.post_data)
+        if recorded is not None:
+            self.stats["hits"] += 1
+            headers = {name: value for name, value in recorded.headers.items() if name not in DROPPED_HEADERS}
+            await route.fulfill(status=recorded.status, headers=headers, body=recorded.body)
+            return
+        logger.debug("Tidak ada di bundle: %s %s", request.method, request.url)
+        if request.method == "GET":
+            self.stats["misses"] += 1
+            await route.fulfill(status=404, body="")
+        else:
+            self.stats["stubbed"] += 1
+            await route.fulfill(status=200, content_type="application/json", body="{}")
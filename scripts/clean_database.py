@@ -9,17 +9,15 @@ import sys
 # Add the project root directory to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from db.crud import delete_all_job_applications
-from db.models import JobApplication
-from db.database import engine
-from sqlmodel import Session, select
+from db.crud import count_job_applications, delete_all_job_applications
+from db.database import get_engine
+from sqlmodel import Session
 
 
 def main():
     # First show count of current records
-    with Session(engine) as session:
-        statement = select(JobApplication)
-        current_count = len(list(session.exec(statement)))
+    with Session(get_engine()) as session:
+        current_count = count_job_applications(session)
         print(f"Current job application count: {current_count}")
     
     # Ask for confirmation
@@ -33,8 +31,8 @@ def main():
         delete_all_job_applications(session=session)
         
         # Verify deletion
-        with Session(engine) as session:
-            final_count = len(list(session.exec(select(JobApplication))))
+        with Session(get_engine()) as session:
+            final_count = count_job_applications(session)
             print(f"Final job application count: {final_count}")
             
             if final_count == 0:
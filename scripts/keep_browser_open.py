@@ -1,41 +1,73 @@
-from patchright.async_api import async_playwright
+#!/usr/bin/env python
+"""
+Browser daemon: keeps Chrome warm on the user profile with a CDP endpoint.
+
+main.py (through browser.BrowserSession) attaches to this browser with
+connect_over_cdp instead of launching Chrome and loading the profile on
+every run. Runs until Ctrl+C or SIGTERM, then closes the browser.
+
+Usage:
+    python scripts/keep_browser_open.py
+    python scripts/keep_browser_open.py --port 9333 --user-data-dir ~/.config/chrome-automation
+    BROWSER_ARGS="--disable-gpu" python scripts/keep_browser_open.py --headless
+"""
+import argparse
 import asyncio
+import json
+import os
+import signal
+import sys
+import urllib.request
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from patchright.async_api import async_playwright
+
+from browser.session import BROWSER_CDP_URL, BROWSER_HEADLESS, CHROME_USER_DATA_DIR, cdp_port, launch_persistent_context
+
+
+def cdp_version(port: int) -> dict:
+    """Browser version info from the CDP HTTP endpoint."""
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=5) as response:
+        return json.load(response)
+
 
 async def main():
-    user_data_dir_path = "/home/wijayanto1320/.config/google-chrome/Default" # Sesuaikan jika perlu
+    parser = argparse.ArgumentParser(description="Keep a warm Chrome with a CDP endpoint for main.py to attach to.")
+    parser.add_argument("--port", type=int, default=cdp_port(BROWSER_CDP_URL), help="CDP port (must match BROWSER_CDP_URL)")
+    parser.add_argument("--user-data-dir", default=CHROME_USER_DATA_DIR, help="Chrome profile directory")
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction, default=BROWSER_HEADLESS, help="Run without a window (default: BROWSER_HEADLESS)")
+    args = parser.parse_args()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
 
     async with async_playwright() as p:
         print("Meluncurkan browser dengan konteks persisten...")
-        
-        # Opsi argumen browser
-        browser_args = [
-            # Cobalah untuk TIDAK menyertakan '--no-sandbox' jika Anda ingin sandbox aktif.
-            # Namun, perhatikan bahwa patchright mungkin tetap menambahkannya atau memerlukan ini.
-            # '--disable-setuid-sandbox', # Sering digunakan bersama --no-sandbox di lingkungan Linux
-            # '--disable-dev-shm-usage', # Sering membantu di lingkungan Docker/CI
-            # Anda bisa mencoba menambahkan argumen lain di sini jika diperlukan
-        ]
-
-        # Jika Anda ingin secara eksplisit mencoba MENGHINDARI --no-sandbox, 
-        # Anda bisa mencoba tidak memasukkannya ke 'browser_args'.
-        # Namun, jika 'patchright' menambahkannya secara internal, ini mungkin tidak berpengaruh.
-
-        context = await p.chromium.launch_persistent_context(
-            user_data_dir=user_data_dir_path,
-            channel="chrome",
-            headless=False,
-            no_viewport=True, # no_viewport biasanya berarti Anda ingin viewport default, bukan tidak ada viewport sama sekali
-            args=browser_args # Tambahkan parameter args di sini
+        context = await launch_persistent_context(
+            p,
+            os.path.expanduser(args.user_data_dir),
+            # Only reachable from this machine
+            args=[f"--remote-debugging-port={args.port}", "--remote-debugging-address=127.0.0.1"],
+            headless=args.headless,
         )
-        print("Browser diluncurkan dengan konteks persisten.")
-        
-        print("Anda dapat melakukan operasi dengan browser sekarang.")
-        print("Script akan menunggu beberapa detik sebagai contoh, lalu menutup browser.")
-        await asyncio.sleep(10000) # Diberi waktu lebih lama untuk observasi
+        # Chrome exits when its last tab closes; keep one open for clients that close theirs
+        if not context.pages:
+            await context.new_page()
+        context.on("close", lambda _: stop.set())
+
+        version = await asyncio.to_thread(cdp_version, args.port)
+        print(f"Browser siap: {version.get('Browser')} di http://127.0.0.1:{args.port}")
+        print("Tekan Ctrl+C untuk menutup browser.")
+        await stop.wait()
 
         print("Menutup browser...")
         await context.close()
         print("Browser berhasil ditutup.")
 
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
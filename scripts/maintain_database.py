@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Set-based maintenance of the job applications table.
+
+Deletes or archives job applications by age, status or company, and runs the
+retention policy, in bounded batches that each commit on their own.
+
+Usage:
+    python scripts/maintain_database.py delete --status Failed --older-than-days 90
+    python scripts/maintain_database.py archive --older-than-days 30 --to-file archive.jsonl.gz
+    python scripts/maintain_database.py retention --archive-after-days 60 --purge-archive-after-days 365 --max-batches 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlmodel import Session
+
+from db.crud import count_job_applications
+from db.database import get_engine
+from db.maintenance import (
+    apply_retention,
+    archive_job_applications,
+    archive_job_applications_to_file,
+    delete_job_applications,
+)
+from db.models import ApplicationFilter, ApplicationStatus
+
+
+def build_filter(args: argparse.Namespace) -> ApplicationFilter:
+    created_before = None
+    if args.older_than_days is not None:
+        created_before = datetime.utcnow() - timedelta(days=args.older_than_days)
+    return ApplicationFilter(
+        status=args.status or None,
+        created_before=created_before,
+        company_name=args.company,
+    )
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--status", type=ApplicationStatus, action="append", help="Only rows with this status (repeatable)")
+    parser.add_argument("--older-than-days", type=int, help="Only rows created more than this many days ago")
+    parser.add_argument("--company", help="Only rows of this company")
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches (default: until done)")
+
+
+def confirm(session: Session, filters: ApplicationFilter, action: str, assume_yes: bool) -> bool:
+    count = count_job_applications(session, filters)
+    print(f"Matching job applications: {count}")
+    if count == 0:
+        print("Nothing to do.")
+        return False
+    if assume_yes:
+        return True
+    confirmation = input(f"Are you sure you want to {action} {count} job applications? (yes/no): ")
+    if confirmation.lower() != "yes":
+        print("Operation cancelled.")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk maintenance of job applications.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    delete_parser = subparsers.add_parser("delete", help="Delete matching job applications")
+    add_filter_arguments(delete_parser)
+    add_batch_arguments(delete_parser)
+
+    archive_parser = subparsers.add_parser("archive", help="Move matching job applications to the archive table or a file")
+    add_filter_arguments(archive_parser)
+    add_batch_arguments(archive_parser)
+    archive_parser.add_argument("--to-file", help="Append to this JSON Lines file (.gz for gzip) instead of the archive table")
+
+    retention_parser = subparsers.add_parser("retention", help="Run the retention policy incrementally")
+    retention_parser.add_argument("--archive-after-days", type=int, help="Archive applications older than this")
+    retention_parser.add_argument("--purge-archive-after-days", type=int, help="Delete archive rows older than this")
+    retention_parser.add_argument("--status", type=ApplicationStatus, action="append", help="Only archive rows with this status (repeatable)")
+    retention_parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    add_batch_arguments(retention_parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        if args.command == "retention":
+            result = apply_retention(
+                session,
+                archive_after_days=args.archive_after_days,
+                purge_archive_after_days=args.purge_archive_after_days,
+                statuses=args.status,
+                batch_size=args.batch_size,
+                max_batches=args.max_batches,
+                pause=args.pause,
+            )
+            print(f"Archived: {result['archived']}, purged from archive: {result['purged']}")
+        else:
+            filters = build_filter(args)
+            if not confirm(session, filters, args.command, args.yes):
+                return
+            if args.command == "delete":
+                affected = delete_job_applications(session, filters, args.batch_size, args.max_batches)
+                print(f"Deleted: {affected}")
+            elif args.to_file:
+                affected = archive_job_applications_to_file(session, args.to_file, filters, args.batch_size, args.max_batches)
+                print(f"Archived to {args.to_file}: {affected}")
+            else:
+                affected = archive_job_applications(session, filters, args.batch_size, args.max_batches)
+                print(f"Archived: {affected}")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
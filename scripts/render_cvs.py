@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+"""
+Script to pre-generate tailored CVs for a JSONL file of vacancies.
+Useful for warming up before a run or benchmarking the CV subsystem without a browser.
+
+Usage:
+    python scripts/render_cvs.py vacancies.jsonl -o results.jsonl --concurrency 4 --workers 4
+"""
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from generate_cv.batch import main
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Offline replay harness for the Glints provider.
+
+capture records the explore page, the job pages and the apply form with the
+CV upload into a HAR bundle. It runs against live glints.com but never clicks
+"Kirim", and it saves nothing. replay serves the bundle to a fresh headless
+browser and runs the whole pipeline against it, including the submission,
+which is answered locally. It reports jobs per minute and the stage timings.
+
+Both commands use the stub LLM (LLM_BACKEND=stub) and a scratch SQLite
+database, so the uploaded CVs are the same in capture and replay, and no
+card is skipped as already applied.
+
+Usage:
+    python scripts/replay_glints.py capture --jobs 5
+    python scripts/replay_glints.py replay
+    python scripts/replay_glints.py replay --bundle replay/bundles/glints.har -o benchmarks/results/replay_glints.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_BUNDLE = os.path.join("replay", "bundles", "glints.har")
+
+
+def configure_environment(replay: bool) -> None:
+    """Settings read at import time by the provider, the LLM modules and the database; call before importing them."""
+    os.environ.setdefault("LLM_BACKEND", "stub")
+    os.environ.setdefault("TRACE_LOG", "")
+    scratch_directory = tempfile.mkdtemp(prefix="replay_glints_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch_directory, 'jobs.db')}"
+    # Upload every CV, as the recorded form did, whatever the last real run attached
+    os.environ["GLINTS_ATTACHED_CV"] = os.path.join(scratch_directory, "attached_cv.json")
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    if replay:
+        # Nothing to wait for when every response is local
+        os.environ.setdefault("GLINTS_STEP_DELAY_S", "0")
+        os.environ.setdefault("GLINTS_SUBMIT_WAIT_S", "0")
+
+
+def metadata_path(bundle_path: str) -> str:
+    return f"{bundle_path}.meta.json"
+
+
+async def capture(bundle_path: str, jobs: int) -> None:
+    from patchright.async_api import async_playwright
+
+    from browser.session import BrowserSession
+    from db.database import create_db_and_tables, dispose_async_engine
+    from provider.glints import GLINTS_EXPLORE_URL, glints_provider
+    from replay.capture import HarRecorder
+
+    create_db_and_tables()
+    os.makedirs(os.path.dirname(bundle_path) or ".", exist_ok=True)
+    async with async_playwright() as p:
+        session = await BrowserSession(p).open()
+        recorder = HarRecorder(session.context).start()
+        try:
+            await glints_provider(page=session.page, max_cards=jobs, submit=False)
+        finally:
+            entries = await recorder.save(bundle_path)
+            await session.close()
+    await dispose_async_engine()
+
+    with open(metadata_path(bundle_path), "w", encoding="utf-8") as metadata_file:
+        json.dump({"jobs": jobs, "entries": entries, "explore_url": GLINTS_EXPLORE_URL, "captured_at": datetime.utcnow().isoformat()}, metadata_file, indent=2)
+    print(f"Captured {entries} requests for {jobs} job cards into {bundle_path}")
+
+
+async def replay(bundle_path: str, jobs: int, headless: bool) -> dict:
+    from patchright.async_api import async_playwright
+
+    from browser.session import HEADLESS_VIEWPORT
+    from db.database import create_db_and_tables, dispose_async_engine
+    from db.writer import ApplicationWriter
+    from provider.glints import glints_provider
+    from replay.bundle import ReplayBundle
+    from replay.server import ReplayServer
+    from telemetry.tracing import JOB_STAGE, tracer
+
+    create_db_and_tables()
+    bundle = ReplayBundle.load(bundle_path)
+    server = ReplayServer(bundle)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        # Service workers would fetch outside of request routing
+        context = await browser.new_context(service_workers="block", viewport=HEADLESS_VIEWPORT)
+        await server.install(context)
+        page = await context.new_page()
+        started = time.perf_counter()
+        async with ApplicationWriter() as writer:
+            await glints_provider(page=page, writer=writer, max_cards=jobs)
+        elapsed = time.perf_counter() - started
+        await context.close()
+        await browser.close()
+    await dispose_async_engine()
+
+    snapshot = tracer.snapshot()
+    job_stats = snapshot.pop(JOB_STAGE, {"count": 0, "outcomes": {}})
+    return {
+        "bundle": bundle_path,
+        "bundle_entries": len(bundle),
+        "jobs": job_stats["count"],
+        "outcomes": job_stats["outcomes"],
+        "wall_s": round(elapsed, 3),
+        "jobs_per_minute": round(job_stats["count"] / elapsed * 60, 2) if elapsed else 0.0,
+        "stages_p50_s": {stage: stats["p50_s"] for stage, stats in snapshot.items()},
+        "requests": dict(server.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture and replay Glints pages for offline end-to-end runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = commands.add_parser("capture", help="Record a bundle from live glints.com (never submits)")
+    capture_parser.add_argument("--bundle", default=DEFAULT_BUNDLE, help=f"HAR file to write (default: {DEFAULT_BUNDLE})")
+    capture_parser.add_argument("--jobs", type=int, default=5, help="Job cards to record")
+
+    replay_parser = commands.add_parser("replay", help="Run the provider against a bundle and report jobs per minute")
+    replay_parser.add_argument("--bundle", default=DEFAULT_BUNDLE, help=f"HAR file to serve (default: {DEFAULT_BUNDLE})")
+    replay_parser.add_argument("--jobs", type=int, help="Job cards to process (default: as many as were captured)")
+    replay_parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    replay_parser.add_argument("-o", "--output", help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    configure_environment(replay=args.command == "replay")
+    from telemetry.log import setup_logging
+
+    setup_logging()
+    if args.command == "capture":
+        asyncio.run(capture(args.bundle, args.jobs))
+        return
+
+    jobs = args.jobs
+    if jobs is None and os.path.exists(metadata_path(args.bundle)):
+        with open(metadata_path(args.bundle), "r", encoding="utf-8") as metadata_file:
+            jobs = json.load(metadata_file)["jobs"]
+    result = asyncio.run(replay(args.bundle, jobs, headless=not args.headed))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(result, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
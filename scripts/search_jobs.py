@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Full-text search over stored job applications.
+
+Usage:
+    python scripts/search_jobs.py golang kubernetes
+    python scripts/search_jobs.py "microservices" --field cv_summary --company "PT Contoh"
+    python scripts/search_jobs.py --rebuild
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlmodel import Session
+
+from db.database import get_engine
+from db.search import SEARCH_FIELDS, rebuild_search_index, search_job_applications
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search job descriptions and CV summaries.")
+    parser.add_argument("query", nargs="*", help="Words that must all match")
+    parser.add_argument("--field", choices=SEARCH_FIELDS, help="Only match in this field")
+    parser.add_argument("--company", help="Only applications of this company")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of results")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the search index (SQLite) and exit")
+    args = parser.parse_args()
+
+    with Session(get_engine()) as session:
+        if args.rebuild:
+            started = time.perf_counter()
+            rebuild_search_index(session)
+            print(f"Search index rebuilt in {time.perf_counter() - started:.2f}s")
+            return
+        if not args.query:
+            parser.error("a query is required")
+
+        started = time.perf_counter()
+        hits = search_job_applications(session, " ".join(args.query), args.field, args.company, args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        print(f"[{hit.rank:8.3g}] #{hit.id} {hit.role} - {hit.company_name} ({hit.status.value}, {hit.created_at:%Y-%m-%d})")
+        print(f"          {hit.link}")
+        print(f"          {hit.snippet}")
+    print(f"{len(hits)} result(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
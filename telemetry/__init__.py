@@ -0,0 +1,2 @@
+from .log import setup_logging, stop_logging
+from .tracing import STAGES, Tracer, tracer
@@ -0,0 +1,126 @@
+"""Non-blocking logging for the job pipeline.
+
+Modules log through per-module loggers (logging.getLogger(__name__)).
+setup_logging() routes every record through a queue: the calling code only
+appends the record to the queue, and a QueueListener thread formats it and
+writes it to the terminal and, optionally, a log file. Terminal and disk
+I/O therefore never add to job latency.
+
+LOG_LEVEL=INFO (the default) gives one compact line per event. Full
+payloads (job descriptions, LLM completions, CV contents) are logged at
+DEBUG only. LOG_FORMAT=json writes one JSON object per line, including the
+current job from telemetry.tracing and any extra= fields.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from .tracing import current_job
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "text" (compact, for terminals) or "json" (one object per line)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Also write to this file (rotated at 10 MB, 5 backups); empty disables it
+LOG_FILE = os.getenv("LOG_FILE", "")
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "job"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JobContextFilter(logging.Filter):
+    """Adds the job being traced (its link) to every record as record.job."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.job = current_job()
+        return True
+
+
+class CompactFormatter(logging.Formatter):
+    """HH:MM:SS L logger: message"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname).1s %(name)s: %(message)s", datefmt="%H:%M:%S")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the job and any extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "job", None):
+            entry["job"] = record.job
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, log_file: Optional[str] = LOG_FILE) -> QueueListener:
+    """
+    Send all logging through a queue to a background writer thread.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Root log level name (DEBUG, INFO, WARNING, ...)
+        log_format: "text" for compact lines or "json"
+        log_file: Also write to this rotating file, None or empty for the terminal only
+
+    Returns:
+        The running listener; stop_logging() flushes and stops it
+    """
+    global _listener
+    stop_logging()
+
+    formatter = JsonFormatter() if log_format == "json" else CompactFormatter()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(JobContextFilter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    # Library chatter stays at WARNING unless we are debugging
+    for noisy in ("httpx", "httpcore", "openai", "asyncio"):
+        logging.getLogger(noisy).setLevel(logging.DEBUG if level == "DEBUG" else logging.WARNING)
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,275 @@
+"""Profiling of a whole automation run (main.py --profile).
+
+RunProfiler writes everything into one run directory:
+
+- cpu.pstats: cProfile of the process, for python -m pstats or snakeviz
+  (cpu_top.txt has the top functions by cumulative time). On Python 3.12+
+  the profiler also sees calls made on other threads.
+- samples.speedscope.json: wall-clock stack samples of every thread (the
+  event loop, the asyncio executor workers, the aiosqlite thread, ...), one
+  profile per thread, for https://www.speedscope.app. Time the event loop
+  spends idle in select() is time spent waiting on the browser or the LLM.
+- samples.folded: the same samples as collapsed stacks, for flamegraph.pl.
+- loop_lag.jsonl: how late the event loop woke up a periodic timer; long
+  lags are blocking calls on the loop thread.
+- tracemalloc.txt: the top allocation sites every N jobs, and their growth
+  since the previous snapshot.
+- summary.json: run totals.
+"""
+
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .tracing import Tracer, tracer
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Parent of the per-run directories
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# Interval of the all-threads stack sampler
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", "5"))
+# Interval of the event loop lag probe
+PROFILE_LOOP_LAG_MS = float(os.getenv("PROFILE_LOOP_LAG_MS", "50"))
+# tracemalloc snapshot every N finished jobs (0 disables tracemalloc)
+PROFILE_SNAPSHOT_JOBS = int(os.getenv("PROFILE_SNAPSHOT_JOBS", "10"))
+# Allocation sites listed per snapshot
+PROFILE_SNAPSHOT_TOP = int(os.getenv("PROFILE_SNAPSHOT_TOP", "25"))
+
+# A (function, file, first line) frame key
+FrameKey = Tuple[str, str, int]
+
+
+class StackSampler(threading.Thread):
+    """Samples the Python stack of every other thread at a fixed interval.
+
+    Consecutive identical stacks are merged into one weighted sample, so an
+    idle thread costs one entry however long it waits.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.frames: Dict[FrameKey, int] = {}
+        # Thread name -> [stack (frame indices, root first), weight in seconds]
+        self.samples: Dict[str, List[List[Any]]] = defaultdict(list)
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+
+    def _frame_index(self, key: FrameKey) -> int:
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frames)
+        return index
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(self._frame_index((code.co_qualname, code.co_filename, code.co_firstlineno)))
+                    frame = frame.f_back
+                stack.reverse()
+                thread_samples = self.samples[names.get(ident, f"thread-{ident}")]
+                if thread_samples and thread_samples[-1][0] == stack:
+                    thread_samples[-1][1] += elapsed
+                else:
+                    thread_samples.append([stack, elapsed])
+            self.sample_count += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def write_speedscope(self, path: str) -> None:
+        """Write the samples in the speedscope file format, one sampled profile per thread."""
+        profiles = []
+        for thread_name, samples in self.samples.items():
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weight for _, weight in samples),
+                "samples": [stack for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name, "file": file, "line": line} for name, file, line in self.frames]},
+            "profiles": profiles,
+            "name": "apply_jobs_automation run",
+            "exporter": "telemetry.profiling",
+        }
+        with open(path, "w", encoding="utf-8") as speedscope_file:
+            json.dump(document, speedscope_file)
+
+    def write_folded(self, path: str) -> None:
+        """Write the samples as collapsed stacks (thread;frame;frame weight_ms)."""
+        names = [f"{name} ({os.path.basename(file)}:{line})" for name, file, line in self.frames]
+        folded: Dict[str, float] = defaultdict(float)
+        for thread_name, samples in self.samples.items():
+            for stack, weight in samples:
+                folded[";".join([thread_name, *(names[index] for index in stack)])] += weight
+        with open(path, "w", encoding="utf-8") as folded_file:
+            for stack, weight in sorted(folded.items()):
+                folded_file.write(f"{stack} {max(1, round(weight * 1000))}\n")
+
+
+class RunProfiler:
+    """Profiles a run; use as an async context manager around the run.
+
+    Example:
+        async with RunProfiler() as profiler:
+            await main()
+    """
+
+    def __init__(
+        self,
+        profile_dir: str = PROFILE_DIR,
+        sample_ms: float = PROFILE_SAMPLE_MS,
+        loop_lag_ms: float = PROFILE_LOOP_LAG_MS,
+        snapshot_jobs: int = PROFILE_SNAPSHOT_JOBS,
+        snapshot_top: int = PROFILE_SNAPSHOT_TOP,
+        run_tracer: Tracer = tracer,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            profile_dir: Parent directory; each run gets a timestamped subdirectory
+            sample_ms: Stack sampling interval in milliseconds
+            loop_lag_ms: Event loop lag probe interval in milliseconds
+            snapshot_jobs: tracemalloc snapshot every N jobs, 0 to disable tracemalloc
+            snapshot_top: Allocation sites listed per snapshot
+            run_tracer: Tracer whose job count drives the snapshots
+        """
+        self.run_dir = os.path.join(profile_dir, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.loop_lag_interval = loop_lag_ms / 1000
+        self.snapshot_jobs = snapshot_jobs
+        self.snapshot_top = snapshot_top
+        self.tracer = run_tracer
+        self.cpu_profile = cProfile.Profile()
+        self.sampler = StackSampler(sample_ms / 1000)
+        self.loop_lags: List[float] = []
+        self.snapshots = 0
+        self._previous_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._next_snapshot_job = snapshot_jobs
+        self._lag_task: Optional[asyncio.Task] = None
+        self._started = 0.0
+
+    async def __aenter__(self) -> "RunProfiler":
+        os.makedirs(self.run_dir, exist_ok=True)
+        if self.snapshot_jobs:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        self._lag_log = open(os.path.join(self.run_dir, "loop_lag.jsonl"), "w", encoding="utf-8")
+        self._lag_task = asyncio.create_task(self._probe_loop_lag(), name="loop-lag-probe")
+        self.sampler.start()
+        self.cpu_profile.enable()
+        logger.info("Profiling aktif, hasil di %s", self.run_dir)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.cpu_profile.disable()
+        self.sampler.stop()
+        self._lag_task.cancel()
+        try:
+            await self._lag_task
+        except asyncio.CancelledError:
+            pass
+        self._lag_log.close()
+        if self.snapshot_jobs:
+            self._snapshot("end of run")
+        self.write()
+        if self.snapshot_jobs:
+            tracemalloc.stop()
+        logger.info("Profil disimpan di %s", self.run_dir)
+
+    async def _probe_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.loop_lag_interval
+            await asyncio.sleep(self.loop_lag_interval)
+            lag = max(0.0, loop.time() - expected)
+            self.loop_lags.append(lag)
+            self._lag_log.write(json.dumps({
+                "time": datetime.utcnow().isoformat(),
+                "jobs": self.tracer.jobs,
+                "lag_ms": round(lag * 1000, 3),
+            }) + "\n")
+            if self.snapshot_jobs and self.tracer.jobs >= self._next_snapshot_job:
+                self._next_snapshot_job = self.tracer.jobs + self.snapshot_jobs
+                self._snapshot(f"after {self.tracer.jobs} jobs")
+
+    def _snapshot(self, label: str) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"== {label}: {current / 1024 / 1024:.1f} MiB traced, peak {peak / 1024 / 1024:.1f} MiB"]
+        lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[:self.snapshot_top]]
+        if self._previous_snapshot is not None:
+            lines.append("  -- growth since the previous snapshot")
+            lines += [f"  {stat}" for stat in snapshot.compare_to(self._previous_snapshot, "lineno")[:self.snapshot_top]]
+        with open(os.path.join(self.run_dir, "tracemalloc.txt"), "a", encoding="utf-8") as snapshot_file:
+            snapshot_file.write("\n".join(lines) + "\n\n")
+        self._previous_snapshot = snapshot
+        self.snapshots += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals: wall time, jobs, loop lag quantiles, samples and snapshots."""
+        lags = sorted(self.loop_lags)
+        return {
+            "run_dir": self.run_dir,
+            "wall_s": round(time.perf_counter() - self._started, 3),
+            "jobs": self.tracer.jobs,
+            "loop_lag_ms": {
+                "samples": len(lags),
+                "p50": round(statistics.median(lags) * 1000, 3) if lags else 0.0,
+                "p95": round(lags[int(0.95 * (len(lags) - 1))] * 1000, 3) if lags else 0.0,
+                "max": round(lags[-1] * 1000, 3) if lags else 0.0,
+                "over_100ms": sum(1 for lag in lags if lag > 0.1),
+            },
+            "stack_samples": self.sampler.sample_count,
+            "threads_sampled": sorted(self.sampler.samples),
+            "tracemalloc_snapshots": self.snapshots,
+            "tracemalloc_peak_mb": round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2) if tracemalloc.is_tracing() else None,
+        }
+
+    def write(self) -> None:
+        """Write the CPU profile, the stack samples and the summary to the run directory."""
+        self.cpu_profile.dump_stats(os.path.join(self.run_dir, "cpu.pstats"))
+        top = io.StringIO()
+        pstats.Stats(self.cpu_profile, stream=top).sort_stats("cumulative").print_stats(50)
+        with open(os.path.join(self.run_dir, "cpu_top.txt"), "w", encoding="utf-8") as top_file:
+            top_file.write(top.getvalue())
+        self.sampler.write_speedscope(os.path.join(self.run_dir, "samples.speedscope.json"))
+        self.sampler.write_folded(os.path.join(self.run_dir, "samples.folded"))
+        summary = self.summary()
+        with open(os.path.join(self.run_dir, "summary.json"), "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+        logger.info("Ringkasan profil: %s", summary)
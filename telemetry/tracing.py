@@ -0,0 +1,275 @@
+"""Per-stage timing of the job pipeline.
+
+Every stage of a job (navigate, extract, dedup_check, classify, summarize,
+render, upload, submit, save) runs inside a span:
+
+    with tracer.job(link):
+        with tracer.stage("extract"):
+            ...
+
+A span records its duration and outcome ("ok", "skipped", or the exception
+class name). Spans are aggregated in memory for p50/p95 per stage, optionally
+appended to a JSON Lines file (TRACE_LOG), and exported in the Prometheus
+text format, either to a file for the node_exporter textfile collector
+(METRICS_FILE) or from a small local HTTP endpoint (METRICS_PORT).
+
+The current job is kept in a context variable, so code further down (the CV
+generator) can open spans without being passed the job.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in order; other names are accepted but listed after these
+STAGES = ("navigate", "extract", "dedup_check", "classify", "summarize", "render", "upload", "submit", "save")
+
+# JSON Lines span log, e.g. "stage_traces.jsonl"; empty (the default) disables it
+TRACE_LOG = os.getenv("TRACE_LOG", "")
+# Prometheus text file rewritten by write_prometheus(); empty disables it
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+# Port of the local /metrics endpoint; 0 disables it
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Span covering a whole job; the time not in any stage is reported as "(other)"
+JOB_STAGE = "job"
+# Outcome of a job or stage that found nothing to do (e.g. a link applied to before)
+SKIPPED = "skipped"
+
+_current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_job", default=None)
+
+
+def current_job() -> Optional[str]:
+    """The job (link) of the innermost tracer.job() block, None outside one."""
+    return _current_job.get()
+
+
+class Span:
+    """One timed stage; set outcome to override "ok" without raising."""
+
+    def __init__(self, stage: str, job: Optional[str]):
+        self.stage = stage
+        self.job = job
+        self.outcome = "ok"
+        self.started_at = datetime.utcnow()
+        self.duration = 0.0
+
+
+class StageStats:
+    """Running totals and a window of recent durations for one stage."""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.outcomes: Dict[str, int] = {}
+        self.durations: Deque[float] = deque(maxlen=window)
+        # Recent durations without the skipped spans, which take almost no time
+        self.worked_durations: Deque[float] = deque(maxlen=window)
+
+    def record(self, span: Span) -> None:
+        self.count += 1
+        self.total_seconds += span.duration
+        self.outcomes[span.outcome] = self.outcomes.get(span.outcome, 0) + 1
+        self.durations.append(span.duration)
+        if span.outcome != SKIPPED:
+            self.worked_durations.append(span.duration)
+
+    def quantile(self, q: float, worked_only: bool = False) -> float:
+        durations = sorted(self.worked_durations if worked_only else self.durations)
+        return durations[int(q * (len(durations) - 1))] if durations else 0.0
+
+
+class Tracer:
+    """Collects stage spans and exports them."""
+
+    def __init__(self, log_path: Optional[str] = TRACE_LOG, metrics_file: Optional[str] = METRICS_FILE, window: int = 1000):
+        """Initialize the tracer.
+
+        Args:
+            log_path: JSON Lines file every span is appended to, None or empty to disable
+            metrics_file: Prometheus text file rewritten after every job, None or empty to disable
+            window: Recent durations kept per stage for the quantiles
+        """
+        self.log_path = log_path
+        self.metrics_file = metrics_file
+        self.window = window
+        self.stats: Dict[str, StageStats] = {}
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def job(self, job: str) -> Iterator[Span]:
+        """Attribute the spans opened inside this block to a job (its link); the block itself is the "job" span."""
+        token = _current_job.set(job)
+        self.jobs += 1
+        try:
+            with self.stage(JOB_STAGE) as span:
+                yield span
+        finally:
+            _current_job.reset(token)
+            self.write_prometheus()
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[Span]:
+        """Time a stage of the current job; exceptions are recorded as the outcome and re-raised."""
+        span = Span(stage, _current_job.get())
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.outcome = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            self.record(span)
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            stats = self.stats.get(span.stage)
+            if stats is None:
+                stats = self.stats[span.stage] = StageStats(self.window)
+            stats.record(span)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write(json.dumps({
+                        "time": span.started_at.isoformat(),
+                        "job": span.job,
+                        "stage": span.stage,
+                        "duration_s": round(span.duration, 6),
+                        "outcome": span.outcome,
+                    }) + "\n")
+
+    def _stages(self) -> List[str]:
+        known = (*STAGES, JOB_STAGE)
+        return [stage for stage in known if stage in self.stats] + sorted(set(self.stats) - set(known))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage count, p50/p95/max, total seconds and outcomes."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": stats.count,
+                    "p50_s": round(stats.quantile(0.5), 6),
+                    "p95_s": round(stats.quantile(0.95), 6),
+                    "max_s": round(max(stats.durations, default=0.0), 6),
+                    "mean_s": round(statistics.fmean(stats.durations), 6) if stats.durations else 0.0,
+                    "total_s": round(stats.total_seconds, 6),
+                    "outcomes": dict(stats.outcomes),
+                }
+                for stage, stats in ((stage, self.stats[stage]) for stage in self._stages())
+            }
+
+    def summary(self) -> str:
+        """A table of the stages and their share of the total job time."""
+        snapshot = self.snapshot()
+        job = snapshot.pop(JOB_STAGE, None)
+        in_stages = sum(stage["total_s"] for stage in snapshot.values())
+        total = (job["total_s"] if job else in_stages) or 1.0
+        lines = [f"{'stage':<12} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'total s':>9} {'share':>6}  outcomes"]
+        for name, stage in snapshot.items():
+            outcomes = ", ".join(f"{outcome}={count}" for outcome, count in stage["outcomes"].items())
+            lines.append(
+                f"{name:<12} {stage['count']:>6} {stage['p50_s']:>8.3f} {stage['p95_s']:>8.3f} "
+                f"{stage['total_s']:>9.1f} {stage['total_s'] / total:>6.1%}  {outcomes}"
+            )
+        if job:
+            # Sleeps and waits between stages
+            other = job["total_s"] - in_stages
+            lines.append(f"{'(other)':<12} {'':>6} {'':>8} {'':>8} {other:>9.1f} {other / total:>6.1%}")
+            lines.append(
+                f"{JOB_STAGE:<12} {job['count']:>6} {job['p50_s']:>8.3f} {job['p95_s']:>8.3f} {job['total_s']:>9.1f} {1:>6.1%}"
+            )
+        return "\n".join(lines)
+
+    def render_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP job_stage_duration_seconds Duration of a job pipeline stage.",
+            "# TYPE job_stage_duration_seconds summary",
+        ]
+        for name, stage in snapshot.items():
+            lines.append(f'job_stage_duration_seconds{{stage="{name}",quantile="0.5"}} {stage["p50_s"]}')
+            lines.append(f'job_stage_duration_seconds{{stage="{name}",quantile="0.95"}} {stage["p95_s"]}')
+            lines.append(f'job_stage_duration_seconds_sum{{stage="{name}"}} {stage["total_s"]}')
+            lines.append(f'job_stage_duration_seconds_count{{stage="{name}"}} {stage["count"]}')
+        lines += [
+            "# HELP job_stage_outcomes_total Finished spans per stage and outcome.",
+            "# TYPE job_stage_outcomes_total counter",
+        ]
+        for name, stage in snapshot.items():
+            for outcome, count in stage["outcomes"].items():
+                lines.append(f'job_stage_outcomes_total{{stage="{name}",outcome="{outcome}"}} {count}')
+        lines += [
+            "# HELP jobs_traced_total Jobs started.",
+            "# TYPE jobs_traced_total counter",
+            f"jobs_traced_total {self.jobs}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> None:
+        """Atomically rewrite a Prometheus text file (textfile collector format), metrics_file by default."""
+        path = path or self.metrics_file
+        if not path:
+            return
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(self.render_prometheus())
+        os.replace(temporary_path, path)
+
+    def start_metrics_server(self, port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+        """
+        Serve GET /metrics (Prometheus text) and GET /stages (JSON) from a daemon thread.
+
+        Args:
+            port: Port to listen on, 0 to not start the server
+            host: Interface to bind; local only by default
+
+        Returns:
+            The running server, or None if port is 0
+        """
+        if not port:
+            return None
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = tracer.render_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/stages":
+                    body, content_type = json.dumps(tracer.snapshot(), indent=2), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info("Metrics tersedia di http://%s:%s/metrics", host, server.server_port)
+        return server
+
+
+tracer = Tracer()